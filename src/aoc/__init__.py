@@ -6,3 +6,5 @@ from .lines import Line, Ray
 from .colors import Colorizer
 #from .graph import *
 from .utils import AOCException
+# with STRIP_DEBUG=1, installs the import hook that strips debugging code
+from . import debug
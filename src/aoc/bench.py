@@ -0,0 +1,300 @@
+"""
+Benchmarking solutions.
+
+Parsing of the input and solving are timed separately. Each of them is run
+`warmup` times without measuring and then `repeat` times measuring the time
+of every run. The measurements are summarized as min, median, 95th
+percentile and standard deviation.
+
+Results can be saved to a JSON file (a baseline) and compared against
+a baseline saved earlier, for example, before an optimization.
+
+Memory is benchmarked separately: the peak of memory allocated by Python
+(tracemalloc) while parsing and while solving, and the size of states,
+that is, instances of classes defined in the solution module that are found
+in the parsed input (cards, tiles, bricks and so on).
+"""
+
+import json
+import math
+import statistics
+import sys
+import time
+import tracemalloc
+from copy import deepcopy
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from .grid import Grid2D
+from .matrix import Matrix
+from .metrics import format_bytes, format_ns
+from .runner import import_solution
+
+PHASES = ("parse", "solve")
+
+
+@dataclass
+class Stats:
+    """Summary of timing samples, all values are in nanoseconds"""
+    n: int
+    min: float
+    median: float
+    p95: float
+    stddev: float
+
+    @classmethod
+    def from_samples(cls, samples: List[int]) -> 'Stats':
+        samples = sorted(samples)
+        return cls(
+            n=len(samples),
+            min=samples[0],
+            median=statistics.median(samples),
+            p95=percentile(samples, 95),
+            stddev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        )
+
+
+def percentile(samples: List[int], pct: float) -> float:
+    """Percentile of sorted `samples` using the nearest-rank method"""
+    rank = math.ceil(pct / 100 * len(samples))
+    return samples[max(rank, 1) - 1]
+
+
+def measure(func: Callable, repeat: int, warmup: int = 0) -> Stats:
+    """Call `func` `warmup` times, then `repeat` times measuring each call.
+    `func` receives no arguments.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        func()
+        samples.append(time.perf_counter_ns() - start)
+    return Stats.from_samples(samples)
+
+
+def bench_day(
+    day: int, parts: List[int], repeat: int, warmup: int = 0
+) -> Dict[str, Dict[str, Stats]]:
+    """Benchmark given parts of a day on the real input(s).
+
+    Parsing is timed by calling `load_input()` of the solution, that loads
+    the default input. Solving is timed on a fresh copy of the input for
+    every call; making the copy is not timed.
+
+    Returns
+      a dictionary {"DD.P": {"parse": Stats, "solve": Stats}}.
+      If there are several real inputs, the key of other than the first
+      one is "DD.P.CASE"
+    """
+    solution = import_solution(day)
+    results = {}
+    for cid, (inp, *_) in enumerate(solution.reals):
+        for part in parts:
+            solve = getattr(solution, f"solve_p{part}")
+            key = f"{day:02}.{part}" + (f".{cid}" if cid else "")
+            results[key] = {
+                "parse": measure(solution.load_input, repeat, warmup),
+                "solve": _measure_solve(solve, inp, repeat, warmup),
+            }
+    return results
+
+
+def _measure_solve(solve: Callable, inp, repeat: int, warmup: int) -> Stats:
+    """Like measure() but `solve` gets a copy of `inp` that is made outside
+    of the timed region, because solutions can modify their input."""
+    for _ in range(warmup):
+        solve(deepcopy(inp))
+    samples = []
+    for _ in range(repeat):
+        arg = deepcopy(inp)
+        start = time.perf_counter_ns()
+        solve(arg)
+        samples.append(time.perf_counter_ns() - start)
+    return Stats.from_samples(samples)
+
+
+def save(path: str, results: Dict[str, Dict[str, Stats]]):
+    data = {
+        key: {phase: asdict(stats) for phase, stats in phases.items()}
+        for key, phases in results.items()
+    }
+    with open(path, "w") as fd:
+        json.dump(data, fd, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, Dict[str, Stats]]:
+    with open(path) as fd:
+        data = json.load(fd)
+    return {
+        key: {phase: Stats(**stats) for phase, stats in phases.items()}
+        for key, phases in data.items()
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Stats]],
+    baseline: Dict[str, Dict[str, Stats]],
+    threshold: float = 10.0
+) -> List[Tuple[str, str, float, bool]]:
+    """Compare median times of `results` with those of the `baseline`.
+    Entries missing in the baseline are not compared.
+
+    Returns
+      a list of tuples (key, phase, change in %, is_regression), where
+      is_regression is True if the change is above `threshold` percent
+    """
+    diffs = []
+    for key, phases in results.items():
+        for phase, stats in phases.items():
+            old = baseline.get(key, {}).get(phase)
+            if old is None or not old.median:
+                continue
+            change = 100 * (stats.median - old.median) / old.median
+            diffs.append((key, phase, change, change > threshold))
+    return diffs
+
+
+def format_table(
+    results: Dict[str, Dict[str, Stats]],
+    diffs: List[Tuple[str, str, float, bool]] = None
+) -> str:
+    """Format results (and optionally the comparison with a baseline)
+    as a table, one line per (day, part, phase)"""
+    changes = {(key, phase): (change, bad)
+               for key, phase, change, bad in diffs or []}
+    header = ["day", "phase", "min", "median", "p95", "stddev"]
+    if diffs is not None:
+        header.append("vs baseline")
+    rows = [header]
+    for key, phases in results.items():
+        for phase in PHASES:
+            stats = phases[phase]
+            row = [key, phase] + [
+                format_ns(v)
+                for v in (stats.min, stats.median, stats.p95, stats.stddev)
+            ]
+            if (key, phase) in changes:
+                change, bad = changes[key, phase]
+                row.append(f"{change:+.1f}%" + (" REGRESSION" if bad else ""))
+            rows.append(row)
+    widths = [max(len(row[i]) for row in rows if i < len(row))
+              for i in range(len(header))]
+    return "\n".join(
+        "  ".join(val.ljust(w) for val, w in zip(row, widths)).rstrip()
+        for row in rows
+    )
+
+
+@dataclass
+class MemoryStats:
+    """Memory used by a solution, in bytes"""
+    parse_peak: int
+    solve_peak: int
+    # name of the class -> (number of instances, bytes per instance)
+    states: Dict[str, Tuple[int, int]]
+
+
+def bench_memory(day: int, parts: List[int]) -> Dict[str, MemoryStats]:
+    """Measure memory used by given parts of a day on the real input(s).
+
+    Returns
+      a dictionary {"DD.P": MemoryStats}, keys are as in bench_day()
+    """
+    solution = import_solution(day)
+    results = {}
+    for cid, (inp, *_) in enumerate(solution.reals):
+        states = state_sizes(inp, solution.__name__)
+        parse_peak = peak_memory(solution.load_input)
+        for part in parts:
+            solve = getattr(solution, f"solve_p{part}")
+            key = f"{day:02}.{part}" + (f".{cid}" if cid else "")
+            arg = deepcopy(inp)
+            results[key] = MemoryStats(
+                parse_peak=parse_peak,
+                solve_peak=peak_memory(lambda: solve(arg)),
+                states=states)
+    return results
+
+
+def peak_memory(func: Callable) -> int:
+    """Peak of memory allocated by Python while calling `func`"""
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] - start
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+
+def state_sizes(inp: Any, module: str) -> Dict[str, Tuple[int, int]]:
+    """Find instances of classes defined in `module` in the input `inp`,
+    looking into lists, tuples, sets, dicts, matrices and the instances
+    themselves. Return the number of instances and the size of one instance
+    (the largest one, if they differ) by the name of the class.
+
+    The size of an instance is its own size plus the size of its __dict__,
+    not including the objects its attributes refer to.
+    """
+    sizes: Dict[str, Tuple[int, int]] = {}
+    seen = set()
+    stack = [inp]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, Matrix):
+            stack.append(obj.values)
+        elif isinstance(obj, Grid2D):
+            stack.append(obj.matrix)
+        elif type(obj).__module__ == module:
+            name = type(obj).__name__
+            count, size = sizes.get(name, (0, 0))
+            sizes[name] = (count + 1, max(size, instance_size(obj)))
+            stack.extend(_attributes(obj))
+    return sizes
+
+
+def instance_size(obj: Any) -> int:
+    """Size of the object and its __dict__, if it has one"""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def _attributes(obj: Any) -> List[Any]:
+    values = list(getattr(obj, "__dict__", {}).values())
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if hasattr(obj, name):
+                values.append(getattr(obj, name))
+    return values
+
+
+def format_memory_table(results: Dict[str, MemoryStats]) -> str:
+    """Format results of bench_memory() as a table, one line per
+    (day, part)"""
+    rows = [["day", "parse peak", "solve peak", "states"]]
+    for key, stats in results.items():
+        states = ", ".join(f"{name} {count} x {size}B"
+                           for name, (count, size) in sorted(stats.states.items()))
+        rows.append([key, format_bytes(stats.parse_peak),
+                     format_bytes(stats.solve_peak), states or "-"])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(val.ljust(w) for val, w in zip(row, widths)).rstrip()
+        for row in rows
+    )
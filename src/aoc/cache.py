@@ -0,0 +1,180 @@
+"""
+Cache of answers computed by solutions.
+
+An answer is stored under the key made of
+* day and part,
+* SHA-256 of the input: the file given on the command line or, for real
+  inputs, the file `input.txt` of the day along with the index of the case,
+* SHA-256 of the source code: all python files of the day and of the aoc
+  library itself (modules in the package `aoc`, but not the other days).
+
+Therefore, changing the input, the solution or the library invalidates
+the answer. Stale answers are never returned but remain in the cache until
+it is pruned.
+
+The cache is a JSON file in the directory given by the environment variable
+AOC_CACHE_DIR, by default ~/.cache/aoc2023/. Answers are collected in memory
+and written once per run by save(), which merges them into the file under
+a lock, so that runs in parallel (and the daemon) do not lose each other's
+answers.
+"""
+
+import contextlib
+import datetime
+import fcntl
+import functools
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional, Set
+
+PKG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Answers of these types survive saving to JSON unchanged
+CACHEABLE_TYPES = (int, float, str)
+
+
+def cache_dir() -> str:
+    path = os.environ.get(
+        "AOC_CACHE_DIR", os.path.join("~", ".cache", "aoc2023"))
+    return os.path.expanduser(path)
+
+
+def default_path() -> str:
+    return os.path.join(cache_dir(), "answers.json")
+
+
+@contextlib.contextmanager
+def locked(path: str):
+    """Hold an exclusive lock on the file `path` (by the file `path`.lock)
+    while reading and writing it"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.lock", "w") as fd:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+
+
+def sha_of_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fd:
+        for chunk in iter(lambda: fd.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def sha_of_code(day: int) -> str:
+    """SHA-256 of the python sources of the given day and of the library"""
+    day_dir = os.path.join(PKG_DIR, f"day_{int(day):02}")
+    digest = hashlib.sha256()
+    for dirname in (PKG_DIR, day_dir):
+        for fname in sorted(os.listdir(dirname)):
+            if fname.endswith(".py"):
+                digest.update(fname.encode())
+                with open(os.path.join(dirname, fname), "rb") as fd:
+                    digest.update(fd.read())
+    return digest.hexdigest()
+
+
+class AnswerCache:
+    """
+    Usage:
+    >>> cache = AnswerCache()
+    >>> answer = cache.get(task)
+    >>> cache.put(task, answer)
+    >>> cache.save()
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or default_path()
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+        # changes not saved yet
+        self._added: Dict[str, Dict[str, Any]] = {}
+        self._deleted: Set[str] = set()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path) as fd:
+                return json.load(fd)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Write the changes made since loading (or the last save) to disk.
+        The file is read again under the lock and the changes are applied
+        to it, which keeps entries saved meanwhile by other processes."""
+        if not (self._added or self._deleted):
+            return
+        with locked(self.path):
+            entries = self._load()
+            for key in self._deleted:
+                entries.pop(key, None)
+            entries.update(self._added)
+            tmp = f"{self.path}.{os.getpid()}"
+            with open(tmp, "w") as fd:
+                json.dump(entries, fd, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        self.entries = entries
+        self._added.clear()
+        self._deleted.clear()
+
+    @staticmethod
+    def input_of(task) -> Optional[str]:
+        """Describe the input of given task (aoc.runner.Task) by its SHA.
+        Return None if answers to the task are not cached.
+        """
+        if task.mode == "file":
+            return sha_of_file(task.path)
+        if task.mode == "real":
+            path = os.path.join(PKG_DIR, f"day_{task.day:02}", "input.txt")
+            return f"{sha_of_file(path)}.{task.case}"
+        return None
+
+    def key(self, task) -> Optional[str]:
+        inp = self.input_of(task)
+        if inp is None:
+            return None
+        return f"{task}:{inp}:{sha_of_code(task.day)}"
+
+    def get(self, task) -> Optional[Dict[str, Any]]:
+        """Return the cache entry for given task if available.
+        The answer is in entry["answer"]."""
+        try:
+            key = self.key(task)
+        except OSError:
+            return None
+        return self.entries.get(key) if key else None
+
+    def put(self, task, answer: Any):
+        """Store the answer to given task. It is written to disk by save()."""
+        if not isinstance(answer, CACHEABLE_TYPES):
+            return
+        key = self.key(task)
+        if key:
+            self.entries[key] = self._added[key] = {
+                "day": task.day,
+                "part": task.part,
+                "code": sha_of_code(task.day),
+                "answer": answer,
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            }
+
+    def prune(self, everything: bool = False) -> int:
+        """Delete stale entries, that is, those computed by a version of
+        the code that is different from the current one, or all entries.
+
+        Returns
+          the number of deleted entries
+        """
+        stale = [
+            key for key, entry in self.entries.items()
+            if everything
+            or not os.path.isdir(os.path.join(PKG_DIR, f"day_{entry['day']:02}"))
+            or entry["code"] != sha_of_code(entry["day"])
+        ]
+        for key in stale:
+            del self.entries[key]
+            self._added.pop(key, None)
+        self._deleted.update(stale)
+        self.save()
+        return len(stale)
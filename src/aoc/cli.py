@@ -1,6 +1,7 @@
 
 import os
 import re
+import signal
 import sys
 from dataclasses import dataclass
 from importlib import import_module
@@ -9,12 +10,21 @@ from typing import Optional, Tuple, Union, List, Iterable
 
 import click
 
-from . import utils
+from . import bench as benchmark
+from . import gen as generators
+from . import metrics, profiling, utils
+from .cache import AnswerCache
+from .runner import JsonlReporter, Reporter, Task, make_tasks, run_tasks
+from .schedule import TimingHistory
+from .server import SolverServer
 
 CLICK_CONTEXT_SETTINGS = {
     "help_option_names": ['-h', '--help'],
 }
 
+# formats of the output of solving
+FORMATS = ("text", "jsonl")
+
 class DayArgumentType(click.ParamType):
     def convert(self, value, param, ctx):
         return Day.from_string(value)
@@ -76,6 +86,54 @@ def opt_explain(func):
     return func
 
 
+def opt_jobs(func):
+    func = click.option(
+        '-j', '--jobs', type=click.IntRange(min=1), default=1,
+        show_default=True,
+        help=("Number of worker processes to run tasks in parallel. A task is"
+              " a single (day, part, input) combination. Results are"
+              " reported in day order regardless"))(func)
+    return func
+
+
+def opt_metrics(func):
+    func = click.option(
+        '-m', '--metrics', 'measure', type=click.Choice(metrics.MODES),
+        is_flag=False, flag_value=metrics.MODES[0],
+        help=("Measure time and peak memory of loading, parsing and solving"
+              " each input and print them as a table at the end. Peak"
+              " memory is peak RSS or, with `--metrics tracemalloc`, memory"
+              " allocated by python objects (much slower)"))(func)
+    return func
+
+
+def opt_profile(func):
+    func = click.option(
+        '--profile', type=click.Choice(profiling.METHODS),
+        is_flag=False, flag_value=profiling.METHODS[0],
+        help=("Profile solving with cProfile (default) or a sampling profiler"
+              " and print hot functions. The profile is saved to"
+              " `profile.DD.P.*` files in the current directory: statistics"
+              " of cProfile (.pstats) and collapsed stacks for flame graphs"
+              " (.collapsed)"))(func)
+    return func
+
+
+def opt_limits(func):
+    func = click.option(
+        '--timeout', type=click.FloatRange(min=0, min_open=True),
+        metavar="SECONDS",
+        help=("Kill a task that runs longer than SECONDS and report it as"
+              " TIMEOUT. Every task runs in a child process of its own"))(func)
+    func = click.option(
+        '--max-memory', 'max_memory', type=click.IntRange(min=1),
+        metavar="MB",
+        help=("Limit address space of a task to MB megabytes, a task that"
+              " runs out of it is reported as OOM. Every task runs in"
+              " a child process of its own"))(func)
+    return func
+
+
 class Day:
     SPEC = "DAY.PART"
 
@@ -199,8 +257,25 @@ def main():
 @click.argument('days', metavar=f"[{Day.SPEC}]... [FILES]", cls=DayArgument)
 @click.option('-p', '--part', 'parts', cls=PartsOption)
 @opt_explain
+@opt_jobs
+@opt_metrics
+@opt_profile
+@opt_limits
+@click.option('--no-cache', 'no_cache', is_flag=True,
+              help="Run solutions even if their answers are in the cache.")
+@click.option('--format', 'output_format', type=click.Choice(FORMATS),
+              default=FORMATS[0], show_default=True,
+              help=("Format of the output. With `jsonl`, a JSON record with"
+                    " the answer, status and timings is printed for every"
+                    " (file, day, part) as soon as it is solved"))
+@click.option('--shared-memory', 'share_inputs', is_flag=True,
+              help=("With --jobs and FILES, load every file once and hand"
+                    " it over to workers via shared memory"))
 def solve(
-    days: Tuple[Day], parts: Tuple[str], show_explanation: bool
+    days: Tuple[Day], parts: Tuple[str], show_explanation: bool, jobs: int,
+    measure: Optional[str], profile: Optional[str],
+    timeout: Optional[float], max_memory: Optional[int], no_cache: bool,
+    output_format: str, share_inputs: bool
 ):
     """Run solution(s) on the real inputs for given days.
 
@@ -214,6 +289,13 @@ def solve(
 
     If FILES is/are provided, they are used as inputs. If not provided,
     default inputs are used.
+
+    Answers are cached: as long as neither the input nor the code changes,
+    the answer is taken from the cache instead of running the solution.
+    The cache is not used with `--no-cache`, `--metrics` or `--profile`.
+
+    Durations of runs are remembered too: with `--jobs`, the slowest tasks
+    start first, and before starting, the expected time is printed.
     """
     # print(f"Solving real: days={days} parts={parts}")
 
@@ -228,34 +310,39 @@ def solve(
         show_explanations(days)
         return
 
-    for day in days:
-        solution = load_solution_for_day(day)
-        if not solution:
-            continue
+    if files:
+        # if files were given on the command line, use them as input
+        mode, files = "file", [add_cwd(f) for f in files]
+    else:
+        # otherwise, use default inputs
+        mode = "real"
 
-        if files:
-            # if files were given on the command line, use them as input
-            for f in files:
-                if 1 in day:
-                    solution.solve_part_1(add_cwd(f))
-                if 2 in day:
-                    solution.solve_part_2(add_cwd(f))
+    cache = None
+    if not (no_cache or measure or profile):
+        cache = AnswerCache()
 
-        else:
-            # otherwise, use default inputs
-            utils.run_real(
-                solution.DAY,
-                solution.reals,
-                solution.solve_p1 if 1 in day else None,
-                solution.solve_p2 if 2 in day else None,
-            )
+    if output_format == "jsonl" and not measure:
+        # records carry timings of phases
+        measure = metrics.MODES[0]
+
+    run(days, mode, jobs, files, output_format, cache=cache, measure=measure,
+        profile=profile, timeout=timeout, max_memory=max_memory,
+        share_inputs=share_inputs)
 
 
 @main.command()
 @click.argument('days', cls=DayArgument)
 @click.option('-p', '--part', 'parts', cls=PartsOption)
 @opt_explain
-def test(days: Tuple[Day], parts: Tuple[str], show_explanation: bool):
+@opt_jobs
+@opt_metrics
+@opt_profile
+@opt_limits
+def test(
+    days: Tuple[Day], parts: Tuple[str], show_explanation: bool, jobs: int,
+    measure: Optional[str], profile: Optional[str],
+    timeout: Optional[float], max_memory: Optional[int]
+):
     """Run solution(s) on the test inputs for given days.
 
     Test inputs are those that are given in the task description with
@@ -271,15 +358,202 @@ def test(days: Tuple[Day], parts: Tuple[str], show_explanation: bool):
         show_explanations(days)
         return
 
+    run(days, "test", jobs, measure=measure, profile=profile,
+        timeout=timeout, max_memory=max_memory)
+
+
+def run(
+    days: List[Day],
+    mode: str,
+    jobs: int,
+    files: List[str] = None,
+    output_format: str = FORMATS[0],
+    **options
+):
+    """Make tasks for given days and run them, reporting the results
+    in the order of days in the given format (see FORMATS).
+
+    `options` are passed to runner.run_tasks()
+    """
+    measure = options.get("measure")
+    if measure:
+        # before loading solutions, so that loading inputs is measured
+        metrics.enable(measure)
+
+    tasks = []
     for day in days:
         solution = load_solution_for_day(day)
         if solution:
-            utils.run_tests(
-                solution.DAY,
-                solution.tests,
-                solution.solve_p1 if 1 in day else None,
-                solution.solve_p2 if 2 in day else None,
-            )
+            parts = [part for part in (1, 2) if part in day]
+            tasks.extend(make_tasks(day.day, parts, mode, solution, files))
+
+    history = None
+    if not (options.get("profile") or measure == "tracemalloc"):
+        # these slow solutions down, such timings would mislead
+        history = TimingHistory()
+        if mode != "test":
+            # tests take milliseconds, there is nothing to wait for
+            predict_time(tasks, jobs, history, options.get("cache"))
+
+    report = JsonlReporter() if output_format == "jsonl" else Reporter()
+    for result in run_tasks(tasks, jobs, history=history, **options):
+        report(result)
+    report.summary()
+
+
+def predict_time(
+    tasks: List[Task],
+    jobs: int,
+    history: TimingHistory,
+    cache: Optional[AnswerCache] = None
+):
+    """Print to stderr how long running the tasks is expected to take"""
+    if cache is not None:
+        tasks = [task for task in tasks if cache.get(task) is None]
+    expected, unknown = history.predict(tasks, jobs)
+    if len(tasks) > 1 and unknown < len(tasks):
+        msg = f"Expected time: {metrics.format_ns(expected)}"
+        if unknown:
+            msg += f" + {unknown} task(s) that never ran"
+        print(msg, file=sys.stderr)
+
+
+@main.command()
+@click.argument('days', cls=DayArgument)
+@click.option('-p', '--part', 'parts', cls=PartsOption)
+@click.option('-r', '--repeat', type=click.IntRange(min=1), default=5,
+              show_default=True, help="Number of measured runs")
+@click.option('-w', '--warmup', type=click.IntRange(min=0), default=1,
+              show_default=True, help="Number of runs before measuring")
+@click.option('--save', 'save_to', type=click.Path(dir_okay=False),
+              help="Save results to given JSON file (a baseline)")
+@click.option('--compare', 'compare_to',
+              type=click.Path(exists=True, dir_okay=False),
+              help="Compare results with a baseline saved earlier")
+@click.option('--threshold', type=float, default=10.0, show_default=True,
+              help=("Slowdown of median time (in percent) over the baseline"
+                    " that is reported as a regression"))
+@click.option('--memory', is_flag=True,
+              help=("Measure memory instead of time: peaks while parsing and"
+                    " solving and the size of states found in the input"))
+def bench(
+    days: Tuple[Day], parts: Tuple[str], repeat: int, warmup: int,
+    save_to: str, compare_to: str, threshold: float, memory: bool
+):
+    """Benchmark solution(s) on the real inputs for given days.
+
+    Parsing of the input and solving are timed separately. The exit code
+    is 1 if any regression was found when comparing with a baseline.
+
+    With `--memory`, memory is measured instead of time, once per part.
+
+    For a description on how DAYs can be specified, please refer to the
+    description of the command `solve`.
+    """
+    combine_days_and_parts(days, parts)
+
+    if memory:
+        if save_to or compare_to:
+            raise click.UsageError(
+                "--save and --compare are not supported with --memory")
+        results = {}
+        for day in days:
+            if load_solution_for_day(day):
+                parts = [part for part in (1, 2) if part in day]
+                results.update(benchmark.bench_memory(day.day, parts))
+        print(benchmark.format_memory_table(results))
+        return
+
+    results = {}
+    for day in days:
+        if load_solution_for_day(day):
+            parts = [part for part in (1, 2) if part in day]
+            results.update(
+                benchmark.bench_day(day.day, parts, repeat, warmup))
+
+    diffs = None
+    if compare_to:
+        diffs = benchmark.compare(
+            results, benchmark.load(compare_to), threshold)
+
+    print(benchmark.format_table(results, diffs))
+
+    if save_to:
+        benchmark.save(save_to, results)
+
+    if diffs and any(bad for *_, bad in diffs):
+        sys.exit(1)
+
+
+@main.command()
+@click.argument('day', type=click.IntRange(min=1, max=25))
+@click.option('-s', '--scale', type=click.IntRange(min=1), default=1,
+              show_default=True,
+              help=("How many times bigger than a real input the generated"
+                    " input should be, e.g. 10, 100, 1000"))
+@click.option('--seed', type=int, default=0, show_default=True,
+              help="Seed of the random generator")
+@click.option('-o', '--output', type=click.File('w'), default='-',
+              help="File to write the input to, by default stdout")
+def gen(day: int, scale: int, seed: int, output):
+    """Generate a synthetic input for DAY.
+
+    The input is in the format of the real input and, where the puzzle
+    needs it, has a solution. The same DAY, scale and seed produce the same
+    input. Use it to see how the runtime of a solution grows with the size
+    of the input, for example:
+
+    aoc2023 gen 10 --scale 100 -o big.txt && aoc2023 solve 10 big.txt
+    """
+    if day not in generators.available_days():
+        print(f"ERROR: Generator for day {day} not found.", file=sys.stderr)
+        sys.exit(1)
+    output.write(generators.generate(day, scale, seed))
+
+
+@main.command()
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False),
+              required=True, help="Path of the Unix socket to listen on")
+@opt_jobs
+def serve(socket_path: str, jobs: int):
+    """Run a daemon that solves requests coming over a Unix socket.
+
+    Worker processes of the daemon import solutions once and keep them
+    imported, which saves the startup time on every request. A request is
+    a line of JSON, for example:
+
+    {"day": 12, "part": 1, "input_path": "/path/to/input.txt"}
+
+    with "input_text" instead of "input_path" for inline inputs. The
+    response is a line of JSON with the answer and timings. See aoc.server
+    for details.
+    """
+    # exit cleanly (removing the socket) when stopped by kill
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    with SolverServer(socket_path, jobs) as server:
+        print(f"Listening on {socket_path} with {jobs} worker(s)",
+              file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+@main.group()
+def cache():
+    """Manage the cache of answers."""
+    pass
+
+
+@cache.command()
+@click.option('--all', 'everything', is_flag=True,
+              help="Delete all answers, not only the stale ones.")
+def prune(everything: bool):
+    """Delete answers computed by older versions of the code."""
+    answers = AnswerCache()
+    count = answers.prune(everything)
+    print(f"Deleted {count} answer(s) from {answers.path}, "
+          f"{len(answers.entries)} left")
 
 
 @main.command(name="list")
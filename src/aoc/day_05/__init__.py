@@ -0,0 +1 @@
+from .solution import Map
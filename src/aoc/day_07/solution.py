@@ -5,16 +5,28 @@
 #
 
 import os
-from collections import Counter
 from dataclasses import dataclass
-from itertools import product
 from typing import List, Union
 
+import numpy as np
+
 from aoc import utils
 
 DAY = '07'
 DEBUG = int(os.environ.get('DEBUG', 0))
 
+# hand type strength by the sum, over the five cards, of the number of cards
+# equal to the card
+TYPES = {
+    25: 7,  # five of a kind
+    17: 6,  # four of a kind
+    13: 5,  # full house
+    11: 4,  # three of a kind
+    9: 3,   # two pair
+    7: 2,   # one pair
+    5: 1,   # high card
+}
+
 
 def solve_part_1(fname: str):
     res = solve_p1(load_input(fname))
@@ -35,6 +47,8 @@ def load_input(fname: str = None):
 
 
 class Card:
+    __slots__ = ("label",)
+
     RANKS = "_23456789TJQKA"  # low to high
 
     def __init__(self, src: Union[str, 'Card']):
@@ -59,6 +73,8 @@ class Card:
 
 
 class JokerCard(Card):
+    __slots__ = ()
+
     #RANKS = "J23456789TQKA"  # low to high
 
     @property
@@ -69,6 +85,26 @@ class JokerCard(Card):
         return 1
 
 
+def hand_type(label: str, joker: str = None) -> int:
+    """Strength of the type of the hand with given `label`, from 1 (high
+    card) to 7 (five of a kind). Cards labelled `joker` pretend to be
+    the card that makes the hand the strongest.
+
+    The sum of counts of equal cards taken over all cards, for example,
+    3+3+3+2+2 for a full house, is the sum of squares of sizes of groups
+    of equal cards and tells the type apart. The best use of jokers is
+    to join the largest group.
+    """
+    jokers = 0
+    if joker:
+        jokers = label.count(joker)
+        label = label.replace(joker, "")
+    counts = [label.count(card) for card in label]
+    largest = max(counts, default=0)
+    return TYPES[sum(counts) - largest**2 + (largest + jokers)**2]
+
+
+@utils.with_slots
 @dataclass
 class Hand:
     cards: List[Card]
@@ -76,6 +112,12 @@ class Hand:
     strength: int = None
     rank: int = 0
 
+    # label of the card that can pretend to be any card
+    JOKER = None
+    # card label -> card strength
+    STRENGTHS = {label: strength
+                 for strength, label in enumerate(Card.RANKS, 1)}
+
     def __iter__(self):
         return iter(self.cards)
 
@@ -83,14 +125,15 @@ class Hand:
         return self.rank * self.bid
 
     def __lt__(self, other: 'Hand') -> bool:
-        ts1, ts2 = self._set_strength(), other._set_strength()
-        if ts1 < ts2:
-            return True
-        elif ts1 == ts2:
-            for a, b in zip(self.cards, other.cards):
-                if a != b:
-                    return a < b
-        return False
+        return self.sort_key() < other.sort_key()
+
+    def sort_key(self) -> int:
+        """Integer that orders hands by strength: the strength of the hand
+        type followed by strengths of the five cards, in base 16"""
+        key = self._set_strength()
+        for label in self.label:
+            key = (key << 4) + self.STRENGTHS[label]
+        return key
 
     def _set_strength(self) -> int:
         """Compute and set hand type strength if not yet set.
@@ -108,28 +151,9 @@ class Hand:
         """Compute hand strength based on the available cards and
         return it (without setting).
         """
-        counts = Counter(self.label)
-        c_diff = len(counts)
-        c_most_common = counts.most_common(1)[0][1]
-        # print(c_diff, counts)
-
-        strength = 0
-        if c_diff == 1:
-            strength = 7  # five of a kind
-        elif c_most_common == 4:
-            strength = 6  # four of a kind
-        elif c_diff == 2 and c_most_common == 3:
-            strength = 5  # full house
-        elif c_most_common == 3:
-            strength = 4  # three of a kind
-        elif c_diff == 3:
-            strength = 3  # two pair
-        elif c_most_common == 2:
-            strength = 2  # one pair
-        elif c_diff == 5:
-            strength = 1  # high card
+        strength = hand_type(self.label, self.JOKER)
         if DEBUG:
-            print("Strength", strength, self.label(), self)
+            print("Strength", strength, self.label, self)
         return strength
 
     @property
@@ -140,6 +164,11 @@ class Hand:
 class JokerHand(Hand):
     """A hand of cards with special Joker logic"""
 
+    __slots__ = ()
+
+    JOKER = "J"
+    STRENGTHS = {**Hand.STRENGTHS, JOKER: 1}
+
     def __init__(self, src = None, **kwargs):
         if isinstance(self, type(src)):
             super().__init__(cards=src.cards, bid=src.bid)
@@ -149,80 +178,47 @@ class JokerHand(Hand):
             # not tested
             super().__init__(**kwargs)
 
-    def compute_strength(self) -> int:
-        """Compute hand strength based on the available cards and
-        return it (without setting). Joker card receives a special
-        treatment.
-        """
-        jokers, normal_cards = [], []
-        for card in self.cards:
-            if isinstance(card, JokerCard):
-                jokers.append(card)
-            else:
-                normal_cards.append(card)
-
-        counts = Counter(card.label for card in normal_cards)
-        c_diff = len(counts)
-        c_jks = len(jokers)
-        c_most_common = counts.most_common(1)[0][1] if c_diff else 0
-
-        if DEBUG:
-            print(c_diff, counts)
-
-        strength = 0
-        if c_diff == 1 or c_jks == 5:
-            strength = 7  # five of a kind
-        elif c_most_common == 4 - c_jks:
-            strength = 6  # four of a kind
-        elif c_diff == 2 and c_most_common == 3 - c_jks:
-            strength = 5  # full house
-        elif c_most_common == 3 - c_jks:
-            strength = 4  # three of a kind
-        elif c_diff == 3:
-            strength = 3  # two pair
-        elif c_most_common == 2 - c_jks:
-            strength = 2  # one pair
-        elif c_diff == 5 - c_jks :
-            strength = 1  # high card
-        if DEBUG:
-            print("Strength", strength, self.label(), self)
-        return strength
-
 
 def play_joker(hand: Hand):
     """
     In joker game, joker card can pretend it is a different card and thus
     increase type strength of a hand.
 
-    Here we try to find the best card the joker can be and set
-    Hand.strength to the best value.
-
-    This is a very stupid approach.
+    Set Hand.strength to the strongest type the hand can have, as computed
+    by hand_type() with "J" as the joker.
     """
-    max_strength = hand.compute_strength()
-
-    jokers = []
-    for idx, card in enumerate(hand):
-        if isinstance(card, JokerCard):
-            jokers.append(card)
-
-    #print(jokers)
-
-    if jokers:
-        for labels in set(product(*[Card.RANKS[1:]]*len(jokers))):
-            # print(len(labels), labels)
-            for card, new_label in zip(jokers, labels):
-                card.label = new_label
-            new_strength = hand.compute_strength()
-            if new_strength > max_strength:
-                max_strength = new_strength
-
-        # Restore the original label of JokerCard to ensure Hand strength
-        # is computed correctly when card strengths come into play.
-        for card in jokers:
-            card.label = "J"
-
-    hand.strength = max_strength
+    hand.strength = hand_type(hand.label, joker="J")
+
+
+def sort_keys(hands: List[Hand]) -> np.ndarray:
+    """Hand.sort_key() of all `hands`, which must be of the same class,
+    computed at once. As in Hand.sort_key(), a hand type strength that is
+    already set (for example, by play_joker()) is used as it is."""
+    cls = type(hands[0])
+    labels = "".join([card.label for hand in hands for card in hand.cards])
+    cards = np.frombuffer(labels.encode(), dtype=np.uint8).reshape(-1, 5)
+    strengths = np.zeros(256, dtype=np.int64)
+    for label, strength in cls.STRENGTHS.items():
+        strengths[ord(label)] = strength
+
+    # counts[i, j] is the number of cards in hand i equal to its card j
+    same = cards[:, :, None] == cards[:, None, :]
+    jokers = np.zeros(cards.shape[0], dtype=np.int64)
+    if cls.JOKER:
+        is_joker = cards == ord(cls.JOKER)
+        same &= ~is_joker[:, :, None]
+        jokers = is_joker.sum(axis=1)
+    counts = same.sum(axis=2)
+    largest = counts.max(axis=1)
+    types = np.zeros(26, dtype=np.int64)
+    types[list(TYPES)] = list(TYPES.values())
+    keys = types[counts.sum(axis=1) - largest**2 + (largest + jokers)**2]
+    known = np.array([hand.strength or 0 for hand in hands], dtype=np.int64)
+    keys = np.where(known > 0, known, keys)
+
+    for idx in range(5):
+        keys = (keys << 4) + strengths[cards[:, idx]]
+    return keys
 
 
 def parse(line: str) -> Hand:
@@ -235,7 +231,8 @@ def parse(line: str) -> Hand:
 
 def solve_p1(hands: List[Hand]) -> int:
     """Solution to the 1st part of the challenge"""
-    hands = sorted(hands)
+    order = np.argsort(sort_keys(hands), kind="stable").tolist()
+    hands = [hands[idx] for idx in order]
     for r, hand in enumerate(hands):
         hand.rank = 1+r
     if DEBUG:
@@ -272,6 +269,7 @@ def solve_p2_v1(hands: List[Hand]) -> int:
         ]
         # print_hand(hand)
         play_joker(hand)
+    hands = [JokerHand(hand) for hand in hands]
 
     return solve_p1(hands)
 
@@ -0,0 +1,2 @@
+from .solution import (LRI, JumpTable, Network, Walk, crt,
+                       first_common_end)
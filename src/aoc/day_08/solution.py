@@ -7,9 +7,12 @@
 import math
 import os
 import re
+from dataclasses import dataclass
 from functools import reduce
 from pprint import pprint
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from aoc import utils
 from aoc.utils import dprint
@@ -59,6 +62,166 @@ def parse(lines: List[str]) -> Tuple[LRI, Dict[str, Tuple[str, str]]]:
     return lri, steps
 
 
+class Network:
+    """
+    The maps with nodes and instructions interned into integer arrays:
+    node i goes to node nodes[i, 0] after L and to nodes[i, 1] after R,
+    tape[pos] is the instruction at the position pos, 0 for L and 1 for R.
+
+    A walker is in the state (node, pos) when it is at the node and is about
+    to follow the instruction at pos. The walk is deterministic, and since
+    there are finitely many states, a walk runs into a cycle sooner or later.
+    """
+
+    def __init__(self, lri: LRI, maps: Dict[str, Tuple[str, str]]):
+        self.names: List[str] = list(maps)
+        self.index: Dict[str, int] = {
+            name: idx for idx, name in enumerate(self.names)}
+        self.nodes = np.array([
+            [self.index[left], self.index[right]]
+            for left, right in maps.values()
+        ], dtype=np.int64).reshape(-1, 2)
+        self.tape = np.array([ch == 'R' for ch in lri.tape], dtype=np.int64)
+        self._jumps: 'JumpTable' = None
+
+    def find(self, predicate: Callable[[str], bool]) -> List[int]:
+        """Nodes whose names satisfy the predicate"""
+        return [idx for idx, name in enumerate(self.names) if predicate(name)]
+
+    def walk(self, start: int, ends: List[int]) -> 'Walk':
+        """Walk from the node `start` until a state repeats, noting the steps
+        at which the walker is at one of the nodes `ends`"""
+        nodes, tape = self.nodes.tolist(), self.tape.tolist()
+        is_end = [False] * len(nodes)
+        for node in ends:
+            is_end[node] = True
+        n_positions = len(tape)
+        # state (node, pos) -> step at which it was first seen
+        seen: Dict[int, int] = {}
+        node, step, end_steps = start, 0, []
+        while True:
+            state = node * n_positions + step % n_positions
+            if state in seen:
+                break
+            seen[state] = step
+            if is_end[node]:
+                end_steps.append(step)
+            node = nodes[node][tape[step % n_positions]]
+            step += 1
+        tail = seen[state]
+        return Walk(tail, step - tail, end_steps)
+
+    def after(self, starts: List[int], n_steps: int) -> np.ndarray:
+        """Nodes at which walkers that start at nodes `starts` are after
+        `n_steps` steps"""
+        if self._jumps is None:
+            self._jumps = JumpTable(self)
+        n_positions = len(self.tape)
+        states = np.asarray(starts, dtype=self._jumps.dtype) * n_positions
+        return self._jumps.advance(states, n_steps) // n_positions
+
+
+class JumpTable:
+    """
+    Binary lifting over the graph of states (node, pos), a state packed
+    into the int node * len(tape) + pos: jumps[k][state] is the state
+    2**k steps after `state`. Each table is made from the previous one as
+    jumps[k] = jumps[k-1][jumps[k-1]], and the state after N steps is found
+    by taking the jumps that correspond to bits of N. This takes O(log N)
+    array lookups for all walkers at once.
+
+    Tables are added as longer jumps are requested.
+    """
+
+    def __init__(self, network: Network):
+        n_positions = len(network.tape)
+        n_states = len(network.nodes) * n_positions
+        self.dtype = np.int32 if n_states < 2**31 else np.int64
+        node, pos = np.divmod(np.arange(n_states, dtype=self.dtype),
+                              n_positions)
+        nxt = network.nodes[node, network.tape[pos]] * n_positions \
+            + (pos + 1) % n_positions
+        self.jumps: List[np.ndarray] = [nxt.astype(self.dtype)]
+
+    def advance(self, states: np.ndarray, n_steps: int) -> np.ndarray:
+        """States after `n_steps` steps from each of `states`"""
+        k = 0
+        while n_steps:
+            if k == len(self.jumps):
+                self.jumps.append(self.jumps[-1][self.jumps[-1]])
+            if n_steps & 1:
+                states = self.jumps[k][states]
+            n_steps >>= 1
+            k += 1
+        return states
+
+
+@dataclass
+class Walk:
+    """
+    Walk of a walker that takes `tail` steps before it enters a cycle of
+    `cycle` steps. It is at an end node after each of the steps `ends`
+    before the cycle repeats (that is, steps < tail + cycle) and, for those
+    of them that are in the cycle, also after every cycle of steps later.
+    """
+    tail: int
+    cycle: int
+    ends: List[int]
+
+    def is_end(self, step: int) -> bool:
+        if step >= self.tail:
+            step = self.tail + (step - self.tail) % self.cycle
+        return step in self.ends
+
+    def congruences(self) -> List[Tuple[int, int]]:
+        """Steps at which the walker is at an end node after its tail, as
+        congruences (residue, modulus)"""
+        return [(step % self.cycle, self.cycle)
+                for step in self.ends if step >= self.tail]
+
+
+def crt(a: Tuple[int, int], b: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    """Generalized Chinese remainder theorem: combine the congruences
+    x = r1 (mod m1) and x = r2 (mod m2), where moduli do not have to be
+    coprime, into x = r (mod lcm(m1, m2)). None if they have no solution.
+    """
+    (r1, m1), (r2, m2) = a, b
+    g = math.gcd(m1, m2)
+    if (r2 - r1) % g:
+        return None
+    m = m1 // g * m2
+    k = (r2 - r1) // g * pow(m1 // g, -1, m2 // g) % (m2 // g)
+    return (r1 + m1 * k) % m, m
+
+
+def first_common_end(walks: List[Walk]) -> Optional[int]:
+    """Find the first step (after the start) at which all walkers are
+    at end nodes at the same time"""
+    # before all walkers are in their cycles, only steps at which the walker
+    # with the longest tail is at an end node come into question
+    longest = max(walks, key=lambda w: w.tail)
+    for step in longest.ends:
+        if 0 < step < longest.tail and all(w.is_end(step) for w in walks):
+            return step
+
+    # afterwards, each walker is at an end node at one of the congruences
+    solutions = [(0, 1)]
+    for walk in walks:
+        solutions = [
+            combined
+            for solution in solutions
+            for congruence in walk.congruences()
+            for combined in [crt(solution, congruence)]
+            if combined
+        ]
+        dprint(f"Combined congruences: {len(solutions)}")
+
+    # the smallest step >= the longest tail (and > 0) for every solution
+    lowest = max(longest.tail, 1)
+    steps = [r + (lowest - r + m - 1) // m * m for r, m in solutions]
+    return min(steps, default=None)
+
+
 def find_exit(
     location: str,
     maps: Dict[str, Tuple[str, str]],
@@ -88,26 +251,34 @@ def solve_p1(args) -> int:
 
 
 def solve_p2(args) -> int:
+    """Solution to the 2nd part of the challenge
+
+    Previously, the answer was the LCM of the numbers of steps it takes each
+    ghost to reach an end node for the first time. That assumes that a ghost
+    reaches the end nodes exactly once per cycle and that the cycle is as
+    long as the way to the first end node, which is the case for real inputs
+    but not in general. Instead, every walk is analysed for its tail, cycle
+    and end nodes in it, and the walks are combined by solving congruences.
+    """
     lri, maps = args
+    network = Network(lri, maps)
 
     # starting points: all nodes ending with A
-    locations = [src for src in maps.keys() if src[-1] == 'A']
+    starts = network.find(lambda name: name[-1] == 'A')
+    ends = network.find(lambda name: name[-1] == 'Z')
 
     if DEBUG:
         pprint(maps)
-        print(locations)
+        print([network.names[node] for node in starts])
+
+    walks = [network.walk(start, ends) for start in starts]
+    dprint(walks)
 
-    # how long does it take to reach the end location from every
-    # starting point?
-    distances = [
-        find_exit(loc, maps, lri.reset(), lambda loc: loc[-1] == 'Z')
-        for loc in locations
-    ]
-
-    # looking at paths as periodic functions with frequencies equal to
-    # corresponding value from distances, how long does it take before
-    # all functions converge at a single point? (Least common multiple)
-    return lcm(distances)
+    n_steps = first_common_end(walks)
+    if DEBUG and n_steps is not None:
+        nodes = network.after(starts, n_steps)
+        print(f"After {n_steps} steps:", [network.names[n] for n in nodes])
+    return n_steps
 
 
 def lcm(numbers: List[int]):
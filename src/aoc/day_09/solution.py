@@ -7,9 +7,13 @@
 import re
 import os
 import sys
+from collections import defaultdict
+from math import comb
 from typing import List, Dict, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 from aoc import utils
 from aoc.utils import dprint, to_numbers
 
@@ -59,14 +63,64 @@ def extrapolate(numbers: List[int], level=0) -> Tuple[int]:
     return (numbers[0]-extras[0], numbers[-1] + extras[1])
 
 
+def weights(n: int) -> Tuple[List[int], List[int]]:
+    """Weights with which numbers of a sequence of length `n` add up to its
+    extrapolation to the left and to the right.
+
+    Extrapolating by differences until they are all zeros is the same as
+    extending the polynomial of degree < n that goes through the numbers,
+    for which the n-th differences are zero:
+
+        a[n]  = sum over i of (-1)**(n-1-i) * C(n, i) * a[i]
+        a[-1] = sum over i of (-1)**i * C(n, i+1) * a[i]
+    """
+    left = [(-1)**i * comb(n, i+1) for i in range(n)]
+    right = [(-1)**(n-1-i) * comb(n, i) for i in range(n)]
+    return left, right
+
+
+def extrapolate_all(reports: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extrapolate all `reports` to the left and to the right at once.
+
+    Reports of the same length are stacked into a matrix and multiplied by
+    the weights (see weights()). The matrix is of int64 unless the result
+    may overflow it, otherwise it is of Python ints (dtype=object).
+
+    Returns two arrays, extrapolations to the left and to the right,
+    in the order of reports.
+    """
+    lefts = np.zeros(len(reports), dtype=object)
+    rights = np.zeros(len(reports), dtype=object)
+    by_length = defaultdict(list)
+    for idx, report in enumerate(reports):
+        by_length[len(report)].append(idx)
+
+    for n, idxs in by_length.items():
+        ws = np.array(weights(n), dtype=object).T
+        rows = [reports[idx] for idx in idxs]
+        try:
+            rows = np.array(rows, dtype=np.int64)
+            largest = int(np.abs(rows).max())
+        except OverflowError:
+            largest = None
+        if largest is None or largest * int(np.abs(ws).sum()) >= 2**63:
+            # Python ints do not overflow
+            rows = np.array(rows, dtype=object)
+        extras = rows @ ws.astype(rows.dtype)
+        lefts[idxs], rights[idxs] = extras[:, 0], extras[:, 1]
+
+    return lefts, rights
+
+
 def solve_p1(reports: List[int]) -> int:
     """Solution to the 1st part of the challenge"""
-    return sum(extrapolate(report)[1] for report in reports)
+    return int(extrapolate_all(reports)[1].sum())
 
 
 def solve_p2(reports: List[int]) -> int:
     """Solution to the 2nd part of the challenge"""
-    return sum(extrapolate(report)[0] for report in reports)
+    return int(extrapolate_all(reports)[0].sum())
 
 
 def load_input(fname: str = None):
@@ -1,12 +1,16 @@
 #!/usr/bin/env python
 
 # # #
-# TODO:
-# 1) study others' solutions. My solution is definitely more complex than
-#    necessary.
-# 2) is there a way to DRY out visit_all_pipe_tiles() and
-#    visit_all_ground_tiles()?
-# 3) Use networkx library for graphs?
+# Part 1: the farthest tile of the loop is halfway along it.
+#
+# Part 2: the loop is a polygon whose vertices are the centers of the loop
+# tiles. Its area is found with the shoelace formula, and Pick's theorem
+# A = I + B/2 - 1 relates the area A, the number of tiles inside I and
+# the number of loop tiles B (all at integer coordinates).
+#
+# Previously, part 2 stretched the map 2x by putting StretchTiles between
+# all tiles, so that the gaps between pipes became walkable, and flood
+# filled the ground tiles reachable from outside.
 
 import os
 from typing import List
@@ -28,6 +32,8 @@ class Tile:
     y axis goes from left to right
     """
 
+    __slots__ = ("shape", "_pos", "distance")
+
     ENDS = {
         "-": [(0, -1), (0, 1)],
         "|": [(-1, 0), (1, 0)],
@@ -88,10 +94,6 @@ class Tile:
             self.__class__.__name__, self.shape, self.pos, self.distance)
 
 
-class StretchTile(Tile):
-    pass
-
-
 def solve_part_1(fname: str):
     res = solve_p1(load_input(fname))
     print(res)
@@ -116,147 +118,56 @@ def parse(lines: List[str]) -> Matrix:
 
 
 def solve_p1(mtx: Matrix) -> int:
-    _, start = mtx.find(lambda t: t.is_start())
-    visited_tiles = visit_all_pipe_tiles(mtx, start)
-    return max(t.distance for t in visited_tiles)
+    """Solution to the 1st part of the challenge"""
+    loop = trace_loop(mtx)
+    return len(loop) // 2
 
 
 def solve_p2(mtx: Matrix) -> int:
     """Solution to the 2nd part of the challenge"""
     dprint(f"--- Initial ---\n{mtx.shape()}\n{mtx}")
-    erase_tiles_outside_of_loop(mtx)
-    stretched_mtx = stretch(mtx)
-    # counting before visit_all_ground_tiles() that in debug mode can change
-    # visited tiles to appear as * thus making them not ground (.) tiles
-    c_ground_tiles = len(stretched_mtx.findall(
-        lambda t: type(t) is Tile and t.is_ground()
+    loop = trace_loop(mtx)
+    # twice the area of the polygon (shoelace formula)
+    area2 = abs(sum(
+        x1 * y2 - x2 * y1
+        for (x1, y1), (x2, y2) in zip(loop, loop[1:] + loop[:1])
     ))
-    dprint("Total ground tiles", c_ground_tiles)
-    visited_tiles = visit_all_ground_tiles(stretched_mtx)
-    c_visited_tiles = len([t for t in visited_tiles if type(t) is Tile])
-    dprint("Total visited ground tiles", c_visited_tiles)
-
-    return c_ground_tiles - c_visited_tiles
+    dprint("Area", area2 / 2, "Loop length", len(loop))
+    # Pick's theorem: A = I + B/2 - 1
+    return (area2 - len(loop)) // 2 + 1
 
 
-def visit_all_pipe_tiles(mtx: Matrix, start: Tile) -> List[Tile]:
-    """Traverse the graph starting at vertex `start`, ignoring Ground tiles.
-    Collect tiles that have been visited and set Tile.distance to the value
-    of distance between start tile and the current tile.
+def trace_loop(mtx: Matrix) -> List[Point]:
+    """Follow the loop from the start tile and back to it.
+    Set Tile.distance of loop tiles to their distance from the start tile.
 
     Return
-    a list of visited tiles
+    the positions of loop tiles in the order of the loop, starting with
+    the start tile
     """
-    start.distance = 0
+    _, start = mtx.find(lambda t: t.is_start())
     dprint("Start", repr(start))
-    heads = [start]
-    visited_tiles = []
-    while heads:
-        tile = heads.pop(0)
-        dprint("Visiting", repr(tile))
-        visited_tiles.append(tile)
-        for neighbour_pos in tile.ends():
-            neighbour_tile = mtx.get(neighbour_pos)
+    loop = [start.pos]
+    tile, previous = start, None
+    while True:
+        # the end of the pipe that leads further
+        for pos in tile.ends():
+            neighbour_tile = mtx.get(pos)
             if (neighbour_tile
-                and neighbour_tile not in visited_tiles
-                and not neighbour_tile.is_ground()
+                and neighbour_tile is not previous
                 and neighbour_tile.is_connected_to(tile)
             ):
-                neighbour_tile.distance = tile.distance + 1
-                heads.append(neighbour_tile)
-
-    return visited_tiles
-
-
-def stretch(src_mtx: Matrix) -> Matrix:
-    """Stretch given matrix by inserting special StretchTile
-    around the matrix and between every two tiles in the matrix.
-    """
-
-    # create an empty stretched matrix (aka canvas).
-    n_rows, n_cols = src_mtx.shape()
-    mtx = Matrix(n_rows*2+1, n_cols*2+2)
-    for xy, _ in mtx:
-        mtx[xy] = StretchTile(".", xy)
-
-    # Insert source matrix into the stretched matrix, spacing the values
-    # as required.
-    for src_xy, tile in src_mtx:
-        xy = Point(src_xy) * 2 + (1,1)
-        mtx[xy] = tile  # tile.pos must remain at original value!
-
-    # Reconnect pipe segments that became interrupted by stretching
-    # the matrix. For this, convert some StretchTiles to | or -
-    offsets = [
-        [(0, -1), (0, 1), "-"],  # to reach tiles in horizontal direction
-        [(-1, 0), (1, 0), "|"],  # to reach tiles in vertical direction
-    ]
-    for xy, tile in mtx.findall(lambda t: type(t) is StretchTile):
-        connected = False
-        for (pre, post, sign) in offsets:
-            if connected:
                 break
-            pre_tile = mtx.get(Point(xy) + pre)
-            post_tile = mtx.get(Point(xy) + post)
-            dprint("PreTile", repr(pre_tile))
-            dprint("PstTile", repr(post_tile))
-            if (pre_tile and post_tile and pre_tile.is_connected_to(post_tile)):
-                mtx[xy].shape = sign
-                dprint("..connecting", repr(mtx[xy]))
-                connected = True
-
-    # Finally, fix Tile.pos to be relative to the stretched matrix
-    for xy, tile in mtx.findall(lambda t: type(t) is Tile):
-        tile.pos = xy
-
-    #print(f"--- Stretched ---\n{mtx.shape()}\n{repr(mtx)}")
-    dprint(f"--- Stretched ---\n{mtx.shape()}\n{mtx}")
-
-    return mtx
-
-
-def visit_all_ground_tiles(mtx: Matrix):
-    dprint("Visiting all ground tiles...")
-    _, start = mtx.find(lambda t: t.is_ground())
-    dprint("Start", repr(start))
-    heads = [start]
-    visited_tiles = []  # or set to avoid duplicates
-    while heads:
-        tile = heads.pop(0)
-        visited_tiles.append(tile)
-        dprint("Visiting", repr(tile))
-        for neighbour_pos in Point.around4(tile.pos):
-            neighbour_tile = mtx.get(neighbour_pos)
-            if (not neighbour_tile
-                or not neighbour_tile.is_ground()
-                or neighbour_tile in visited_tiles
-            ):
-                continue
-            if neighbour_tile in heads:
-                # since the same vertex can be reachable from all its
-                # neighbours, here we ensure that we dont visit the vertex
-                # if it is alredy scheduled for visiting
-                continue
-            heads.append(neighbour_tile)
-    if DEBUG:
-        # for visualization, mark all visited tiles differently
-        # TODO: create a copy for visualization! mutating the original
-        # object is a bad idea, cuz Tile.is_ground() is affected.
-        for tile in visited_tiles:
-            tile.shape = "*"
-        print(f"--- Reach all ground tiles ---\n{mtx}")
-    return visited_tiles
-
-
-def erase_tiles_outside_of_loop(mtx: Matrix):
-    """Mark all tiles that do not belong to the loop as Ground tiles"""
-    dprint("Erasing tiles outside of loop...")
-    _, start = mtx.find(lambda t: t.is_start())
-    loop_tiles = visit_all_pipe_tiles(mtx, start)
-    for _, tile in mtx:
-        if tile not in loop_tiles:
-            tile.make_ground()
-    dprint(f"--- Non-loop tiles removed ---\n{mtx}")
+        else:
+            raise ValueError(f"The pipe is interrupted at {tile!r}")
+        previous, tile = tile, neighbour_tile
+        if tile is start:
+            break
+        loop.append(tile.pos)
+
+    for idx, pos in enumerate(loop):
+        mtx[pos].distance = min(idx, len(loop) - idx)
+    return loop
 
 
 def load_input(fname: str = None):
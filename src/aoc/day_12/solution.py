@@ -6,10 +6,10 @@
 
 import os
 import sys
-from typing import Callable, Dict, List, Tuple
+from typing import List, Tuple
 
 from aoc import utils
-from aoc.utils import dprint, to_numbers
+from aoc.utils import dprint, memo, to_numbers
 
 sys.setrecursionlimit(1500)  # otherwise python raises RecursionError
 
@@ -54,25 +54,20 @@ def parse(line: str) -> Tuple[List[int], List[int]]:
 # python | w/o memoization | ???
 # python | w/  memoization | 77,56
 
-class memoize(dict):
-    """Decorator for memoizing 3 arguments of the function and the result"""
-    def __init__(self, func: Callable):
-        self.nargs = 3  # how many arguments to cache
-        self.function = func
 
-    def __call__(self, *args, **kwargs):
-        self.args = args[:self.nargs]
-        return self[self._to_key()]
-
-    def __missing__(self, key):
-        self[key] = self.function(*self.args)
-        return self[key]
-
-    def _to_key(self) -> Tuple[str]:
-        return tuple(str(arg) for arg in self.args)
+def arrangement_key(
+    springs: List[int],
+    checksums: List[int],
+    current_grp_count: int = 0,
+    level: int = 0
+) -> Tuple:
+    """`level` is for debugging only and does not affect the result"""
+    return tuple(springs), tuple(checksums), current_grp_count
 
 
-@memoize
+# the cache is cleared after every record: subproblems of different records
+# are hardly ever shared, and keeping them would only accumulate memory
+@memo(key=arrangement_key, scope="call")
 def count_arrangements(
     springs: List[int],
     checksums: List[int],
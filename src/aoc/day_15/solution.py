@@ -60,6 +60,9 @@ class Step:
     rn=1  --> (LENS)   label=rn, focal_length=1;       operation is =
     cm-   --> (REMOVE) label=cm, focal_length=None;    operation is -
     """
+
+    __slots__ = ("label", "focal_length", "_hash")
+
     def __init__(self, text: str):
         self.label = None
         self.focal_length = None
@@ -6,11 +6,11 @@
 
 import os
 from copy import deepcopy
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import List, Optional, Set, Tuple
 
-from aoc import Direction, Matrix, Point, utils
-from aoc.utils import dprint
+from aoc import Direction, Matrix, Point, search, utils
+from aoc.debug import dlog
 
 DAY = '16'
 DEBUG = int(os.environ.get('DEBUG', 0))
@@ -34,38 +34,21 @@ def load_input(fname: str = None):
     return utils.load_input(fname, parser=parse)
 
 
+@utils.with_slots
 @dataclass
 class Tile:
     sign: str
-    energy: int = 0
-    visited_sides: Set = field(default_factory=set)
-
-    def meets(self, beam: 'Beam') -> bool:
-        """Update the state of the Tile as a reaction to a beam entering
-        the tile.
-        Return boolean indicating whether the tile was already visited by
-        a beams coming from the same side.
-        """
-        self.energy += 1
-        before = len(self.visited_sides)
-        self.visited_sides.add(str(beam.direction))
-        return before == len(self.visited_sides)
 
     def __str__(self):
         return self.sign
 
-    def reset(self):
-        """Reset the tile to the original state."""
-        self.energy = 0
-        self.visited_sides.clear()
-
 
-def show_energies(src: Matrix):
+def show_energies(tiles: Matrix, energized: Set[Tuple[int, int]]):
     if DEBUG:
-        tiles = deepcopy(src)
-        for xy, tile in tiles:
-            tiles[xy] = "#" if tile.energy else '.'
-        dprint(str(tiles))
+        tiles = deepcopy(tiles)
+        for xy, _ in tiles:
+            tiles[xy] = "#" if xy in energized else '.'
+        dlog(tiles)
 
 
 class Beam:
@@ -113,11 +96,6 @@ class Beam:
             other.direction.ccw()
             return other
 
-    def advance(self):
-        """Advance the current Beam by one step."""
-        self.head += self.direction
-        return self
-
     def __repr__(self):
         return "<{}: head={} direction='{}'>".format(
             self.__class__.__name__,
@@ -136,34 +114,62 @@ def parse(lines: List[str]) -> Matrix:
     return Matrix(tiles)
 
 
-def solve(tiles: Matrix, beam: Beam) -> int:
-    """Solve the task for one beam"""
-    beams = [beam]
-    while beams:
-        beam = beams.pop(0)
-        tile = tiles.get(beam.head)
-        dprint("Beam x Tile:", repr(beam), repr(tile))
+def exits(sign: str, direction: str) -> str:
+    """Directions in which a beam that moves in `direction` leaves the tile
+    of given `sign`"""
+    beam = Beam((0, 0), direction)
+    spinoff = beam.meets(Tile(sign))
+    return str(beam.direction) + (str(spinoff.direction) if spinoff else "")
 
-        if not tile:
-            # light falls off the edge of the contraption
-            continue
 
-        if tile.meets(beam):
-            # If the tile was previously visited from the same side,
-            # it does not make sense continuing with the beam because
-            # it will repeat the same path as the previous beam.
-            continue
+class Contraption:
+    """The state space of beams in the contraption.
 
-        spinoff = beam.meets(tile)
+    A state is a beam that enters a tile, packed into an int
 
-        beams.append(beam.advance())
-        if spinoff:
-            beams.append(spinoff.advance())
+        state = (row * n_cols + col) * 4 + heading
 
-    show_energies(tiles)
-    # print(repr(tiles))
+    where heading is the index of the beam direction in Direction.SIGNS.
+    """
 
-    return len([1 for _, t in tiles if t.energy])
+    def __init__(self, tiles: Matrix):
+        self.n_rows, self.n_cols = tiles.shape()
+        signs = Direction.SIGNS
+        table = {
+            (sign, heading): [signs.index(d) for d in exits(sign, direction)]
+            for sign in "./\\|-"
+            for heading, direction in enumerate(signs)
+        }
+        # self.moves[state] are the states that follow the state
+        self.moves: List[List[int]] = []
+        for (x, y), tile in tiles:
+            for heading in range(4):
+                self.moves.append([])
+                for new_heading in table[str(tile), heading]:
+                    dx, dy = Direction.OFFSETS[new_heading]
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < self.n_rows and 0 <= ny < self.n_cols:
+                        self.moves[-1].append(
+                            (nx * self.n_cols + ny) * 4 + new_heading)
+
+    def encode(self, beam: Beam) -> int:
+        x, y = beam.head
+        heading = Direction.SIGNS.index(str(beam.direction))
+        return (x * self.n_cols + y) * 4 + heading
+
+    def energized(self, beam: Beam) -> Set[Tuple[int, int]]:
+        """Positions of tiles that the `beam` passes through"""
+        found = search.bfs([self.encode(beam)], self.moves.__getitem__,
+                           name="day16")
+        return {divmod(state // 4, self.n_cols) for state in found.distances}
+
+
+def solve(tiles: Matrix, beam: Beam, contraption: Contraption = None) -> int:
+    """Solve the task for one beam"""
+    contraption = contraption or Contraption(tiles)
+    energized = contraption.energized(beam)
+    show_energies(tiles, energized)
+    return len(energized)
 
 
 def solve_p1(tiles: Matrix) -> int:
@@ -174,11 +180,7 @@ def solve_p1(tiles: Matrix) -> int:
 def solve_p2(tiles: Matrix) -> int:
     """Solution to the 2nd part of the challenge"""
     n_rows, n_cols = tiles.shape()
-
-    def reset(tiles):
-        """Reset tiles. This is faster than making a deep copy of tiles"""
-        for _, tile in tiles:
-            tile.reset()
+    contraption = Contraption(tiles)
 
     beams = []
 
@@ -192,9 +194,8 @@ def solve_p2(tiles: Matrix) -> int:
 
     energies = []
     for beam in beams:
-        energies.append(solve(tiles, beam))
-        reset(tiles)
-        dprint(beam, energies[-1])
+        energies.append(solve(tiles, beam, contraption))
+        dlog("%s %s", beam, energies[-1])
 
     return max(energies)
 
@@ -14,6 +14,8 @@ from .common import DiggingInstruction, measure_field
 
 
 class Trench:
+    __slots__ = ("rhs",)
+
     # if the trench goes in R,L,U,D direction, which side of it is the right
     # hand side (or inner side of the lagoon):
     SIDES = {
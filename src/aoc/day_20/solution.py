@@ -9,7 +9,7 @@ import re
 from typing import List, Literal
 
 from aoc import utils
-from aoc.utils import dprint
+from aoc.debug import dlog
 
 DAY = '20'
 DEBUG = int(os.environ.get('DEBUG', 0))
@@ -108,7 +108,7 @@ class CommunicationModule:
     def send(self):
         """Propagate signal to all downstream devices."""
         for device in self._destination_devices:
-            dprint(f"{self.name} -{self.signal_}-> {device.name}")
+            dlog("%s -%s-> %s", self.name, self.signal_, device.name)
             device.receive(self.signal, self)
             self.emmitted_signal_counts[self.signal] += 1
 
@@ -127,7 +127,7 @@ class CommunicationModule:
         This method should typically redefined in specific subclasses to
         provide its own computation logic.
         """
-        dprint("Actuating", repr(self))
+        dlog("Actuating %r", self)
         self.signal = self.read()
         self.send()
         return True
@@ -162,13 +162,13 @@ class FlipFlop(CommunicationModule):
     #     # self.state = False  # off state
 
     def actuate(self) -> bool:
-        dprint("Actuating", repr(self))
-        # dprint(f"..inputs: {self.input_signals}")
+        dlog("Actuating %r", self)
+        # dlog("..inputs: %s", self.input_signals)
         if not self.input_signals:
             return False
         signal = self.read()
         if signal:
-            dprint("..nothing happens")
+            dlog("..nothing happens")
             return False
         self.signal = not(self.signal)
         self.send()
@@ -215,7 +215,7 @@ class Conjunction(CommunicationModule):
             self.input_signals = [False] * len(self._source_devices)
 
         for idx, srcdev in enumerate(self._source_devices):
-            dprint(f"Receiving {signal} from {source.name}. From {srcdev}?")
+            dlog("Receiving %s from %s. From %s?", signal, source.name, srcdev)
             if srcdev.name == source.name:
                 self.input_signals[idx] = signal
 
@@ -223,7 +223,7 @@ class Conjunction(CommunicationModule):
         return self.input_signals
 
     def actuate(self) -> Literal[True]:
-        dprint("Actuating", repr(self))
+        dlog("Actuating %r", self)
         self.signal = not(all(self.read()))
         self.send()
         return True
@@ -238,7 +238,7 @@ class Conjunction(CommunicationModule):
 class TestingModule(CommunicationModule):
 
     def actuate(self):
-        dprint("Actuating", repr(self))
+        dlog("Actuating %r", self)
         signal = self.read()
 
         # a failed attempt to solve part 2
@@ -300,7 +300,7 @@ def actuate(device: CommunicationModule):
     """Propagate a signal in the network in BFS fashion"""
     queue = [device]
     while queue:
-        dprint(f"\nNumber of devices in the queue: {len(queue)}")
+        dlog("\nNumber of devices in the queue: %d", len(queue))
         # This internal loop is not necessary, the external while-loop
         # alone is sufficient. However, it is kept here for readability:
         # the external loop is clock ticks, the internal loop is what
@@ -318,7 +318,7 @@ def solve_p1(button: CommunicationModule) -> int:
     for _ in range(n):
         actuate(button)
     signal_counts = CommunicationModule.emmitted_signal_counts
-    dprint(signal_counts)
+    dlog("%s", signal_counts)
     return utils.prod(signal_counts.values())
 
 
@@ -7,7 +7,7 @@
 import os
 from typing import Callable, Dict, List, Tuple
 
-from aoc import Matrix, Point, utils
+from aoc import Matrix, Point, search, utils
 from aoc.utils import dprint, is_odd, is_even
 
 DAY = '21'
@@ -61,24 +61,14 @@ def walk(
 
     If max_steps is given, walk at most this number of steps.
     """
-    garden[start] = initial_distance
-    locations = [start]
-    c_steps = 0
-    while True:
-        c_steps += 1
-        for _ in range(len(locations)):
-            start = locations.pop(0)
-            dist = garden[start]
-            for loc in start.around4():
-                step = garden.get(loc, '#')
-                dprint(loc, step)
-                if step == '.':
-                    garden[loc] = dist+1
-                    locations.append(loc)
-        if max_steps is not None and max_steps == c_steps:
-            break
-        if not locations:
-            break
+    def plots_around(loc: Point) -> List[Point]:
+        return [xy for xy in loc.around4() if garden.get(xy, '#') == '.']
+
+    found = search.bfs([start], plots_around, max_depth=max_steps,
+                       name="day21")
+    for loc, dist in found.distances.items():
+        garden[loc] = initial_distance + dist
+
 
 def solve_p1(args) -> int:
     """Solution to the 1st part of the challenge
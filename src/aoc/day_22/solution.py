@@ -20,11 +20,14 @@ import networkx as nx
 import numpy as np
 
 from aoc import Point, utils
-from aoc.utils import dprint, to_numbers
+from aoc.debug import dlog
+from aoc.utils import to_numbers
 
 DAY = '22'
 DEBUG = int(os.environ.get('DEBUG', 0))
 ROTATE = not False  # for debugging
+# bricks fall in the grid of the input (see aoc.runner)
+MODIFIES_INPUT = True
 
 
 def solve_part_1(fname: str):
@@ -45,6 +48,7 @@ def load_input(fname: str = None):
     return utils.load_input(fname, line_parser=parse_line, parser=parse)
 
 
+@utils.with_slots
 @dataclass
 class Brick:
     """A brick has two Points that denote its ends
@@ -157,7 +161,7 @@ def parse(bricks: List[List[Point]]) -> Tuple[np.ndarray, List[Brick]]:
     #print(grid.dtype, np.iinfo(grid.dtype))
 
     for brick in bricks:
-        #dprint("Brick:", brick)
+        #dlog("Brick: %s", brick)
         grid[brick()] = brick.id
 
     return grid, bricks
@@ -166,7 +170,7 @@ def parse(bricks: List[List[Point]]) -> Tuple[np.ndarray, List[Brick]]:
 def drop_a_brick(grid, brick, n_steps: int = 1):
     """Move given brick towards Zearth given number of steps"""
     if n_steps > 0:
-        dprint(f"Falls {n_steps} steps {brick}")
+        dlog("Falls %d steps %s", n_steps, brick)
         grid[brick()] = 0
         brick.fall(n_steps)
         grid[brick()] = brick.id
@@ -174,7 +178,7 @@ def drop_a_brick(grid, brick, n_steps: int = 1):
 
 def fall(grid, bricks):
     """Let all bricks fall towards Zearth"""
-    dprint("--- fall ---")
+    dlog("--- fall ---")
 
     # Process the bricks in the order: the ones closer to Zearth should be
     # first to fall in order to make space for other bricks.
@@ -184,7 +188,7 @@ def fall(grid, bricks):
         if n_steps:
             drop_a_brick(grid, brick, n_steps)
 
-    dprint(f"=== fallen ===\n{rotate(grid)}")
+    dlog(lambda: f"=== fallen ===\n{rotate(grid)}")
 
 
 def get_z_spacing(grid, brick) -> int:
@@ -200,13 +204,13 @@ def get_z_spacing(grid, brick) -> int:
     """
     n_steps = 0
     shadow = brick.shadow()
-    dprint(f"Shadow: {shadow}")
+    dlog("Shadow: %s", shadow)
     for n_steps in range(brick.z):
         shadow.fall()
-        dprint(f"..{shadow}")
+        dlog("..%s", shadow)
         layer = grid[shadow()]  # 2d
-        dprint(f"..area underneath:\n{layer}\n")
-        dprint(layer.shape, layer.sum())
+        dlog("..area underneath:\n%s\n", layer)
+        dlog(lambda: f"{layer.shape} {layer.sum()}")
         if layer.sum() > 0:
             break
     return n_steps
@@ -225,33 +229,33 @@ def get_graph_of_connections(grid, bricks) -> nx.DiGraph:
       the edge (1, 2) means brick_2 is lying on brick_1, or, in other words
       brick_1 supports brick_2
     """
-    dprint("--- get Graph of connections between bricks ---")
+    dlog("--- get Graph of connections between bricks ---")
     g = nx.DiGraph()
     g.add_nodes_from([brick.id for brick in bricks])
     for brick in sorted(bricks):
-        dprint("Inspecting", brick)
+        dlog("Inspecting %s", brick)
         shadow = brick.shadow().fall()
         layer = grid[shadow()]
-        dprint("..layer underneath", layer)
+        dlog("..layer underneath %s", layer)
         other_bricks = list(filter(None, set(np.unique(layer))))
-        dprint(f"..connected bricks: {type(other_bricks)} {other_bricks}")
+        dlog("..connected bricks: %s %s", type(other_bricks), other_bricks)
         for other in other_bricks:
             g.add_edge(other, brick.id)
-    dprint(f"Graph: {g}\n{g.nodes()}")
+    dlog(lambda: f"Graph: {g}\n{g.nodes()}")
 
     return g
 
 
 def validate_graph(g, bricks):
     """Debugging"""
-    dprint("--- Validate Graph ---")
+    dlog("--- Validate Graph ---")
     # find all bricks that do not sit on a brick or Zearth
     for v in g.nodes():
         predecessors = list(g.predecessors(v))
         if not predecessors:
             brick = bricks[v-1]
             if brick.z != 1:
-                dprint(f"Levitating brick?: {v} {brick}")
+                dlog("Levitating brick?: %s %s", v, brick)
 
 
 def rotate(grid: np.ndarray) -> np.ndarray:
@@ -294,11 +298,11 @@ def brick_can_be_removed(g: nx.DiGraph, vertex: int) -> bool:
     """
     for u in g.successors(vertex):
         predecessors = set(g.predecessors(u)) - {vertex}
-        dprint(f"{vertex} -> {u} <- {predecessors}")
+        dlog("%s -> %s <- %s", vertex, u, predecessors)
         if not predecessors:
-            dprint(f"=> {vertex} cannot be removed")
+            dlog("=> %s cannot be removed", vertex)
             return False
-    dprint(f"=> {vertex} can be removed")
+    dlog("=> %s can be removed", vertex)
     return True
 
 
@@ -341,7 +345,7 @@ def solve(grid: np.ndarray, bricks: List[Brick]) -> nx.DiGraph:
     Let all bricks fall and build a directed graph that represents
     the structure.
     """
-    dprint(f"---Initial (rotated) ---\n{rotate(grid)}")
+    dlog(lambda: f"---Initial (rotated) ---\n{rotate(grid)}")
     fall(grid, bricks)
     g = get_graph_of_connections(grid, bricks)
     # validate_graph(g, bricks)
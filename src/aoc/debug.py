@@ -0,0 +1,137 @@
+"""
+Debug logging that costs nothing when debugging is off.
+
+`utils.dprint(f"Inspecting {brick}")` builds its message, here calling
+Brick.__repr__, even when DEBUG is off and nothing is printed. In a hot
+loop, that is where most of the time goes. `dlog()` formats the message only
+when DEBUG is on, and does nothing otherwise:
+
+    dlog("Inspecting %s", brick)            # %-style arguments
+    dlog(lambda: f"Layer:\\n{rotate(grid)}")  # a callable that makes it
+
+Debugging is switched on by the environment variable DEBUG, the same that
+solution modules read into their constant DEBUG. In the hottest loops, even
+the call of dlog() can be avoided by guarding it with that constant:
+
+    if DEBUG:
+        dlog("Inspecting %s", brick)
+
+With the environment variable STRIP_DEBUG=1 (and DEBUG off), the calls are
+removed from the code: modules of solutions (aoc.day_NN.*) are rewritten on
+import so that statements that call dlog() or dprint() and blocks guarded by
+`if DEBUG:` disappear. Arguments of such calls must not have side effects.
+"""
+
+import ast
+import importlib.abc
+import importlib.machinery
+import os
+import re
+import sys
+from typing import Any, Callable, Union
+
+ENABLED = int(os.environ.get('DEBUG', 0))
+STRIP = int(os.environ.get('STRIP_DEBUG', 0))
+
+# functions whose calls are removed
+CALLS = frozenset({"dlog", "dprint"})
+# names of constants that guard debugging code
+GUARDS = frozenset({"DEBUG"})
+# modules that are rewritten
+MODULES = re.compile(r"aoc\.day_\d+\.")
+
+
+def _dlog(msg: Union[str, Callable[..., Any]], *args):
+    """Print the message `msg` formatted with %-style `args` or, if `msg`
+    is a callable, what it returns when called with `args`"""
+    if callable(msg):
+        msg = msg(*args)
+    elif args:
+        msg = msg % args
+    print(msg)
+
+
+def _dlog_nothing(msg: Union[str, Callable[..., Any]], *args):
+    pass
+
+
+dlog = _dlog if ENABLED else _dlog_nothing
+
+
+class DebugStripper(ast.NodeTransformer):
+    """Remove debugging statements from the syntax tree"""
+
+    def visit_Expr(self, node: ast.Expr):
+        call = node.value
+        if isinstance(call, ast.Call):
+            func = call.func
+            name = func.attr if isinstance(func, ast.Attribute) else \
+                getattr(func, "id", None)
+            if name in CALLS:
+                return None
+        return node
+
+    def visit_If(self, node: ast.If):
+        self.generic_visit(node)
+        if isinstance(node.test, ast.Name) and node.test.id in GUARDS:
+            return node.orelse or None
+        return self._fill(node)
+
+    def generic_visit(self, node: ast.AST):
+        return self._fill(super().generic_visit(node))
+
+    def _fill(self, node: ast.AST) -> ast.AST:
+        """Put `pass` into blocks that became empty"""
+        if isinstance(getattr(node, "body", None), list) and not node.body:
+            node.body = [ast.Pass()]
+        if isinstance(node, ast.Try) and not (node.handlers or node.finalbody):
+            node.finalbody = [ast.Pass()]
+        return node
+
+
+def strip(source: Union[str, bytes], path: str = "<string>") -> ast.Module:
+    """Parse `source` and remove debugging statements from it"""
+    tree = DebugStripper().visit(ast.parse(source, path))
+    return ast.fix_missing_locations(tree)
+
+
+class _Loader(importlib.machinery.SourceFileLoader):
+
+    def get_code(self, fullname: str):
+        # the compiled code is not cached in __pycache__: otherwise it would
+        # be used with DEBUG on as well
+        path = self.get_filename(fullname)
+        return self.source_to_code(self.get_data(path), path)
+
+    def source_to_code(self, data, path, *, _optimize=-1):
+        return compile(strip(data, path), path, "exec",
+                       dont_inherit=True, optimize=_optimize)
+
+
+class _Finder(importlib.abc.MetaPathFinder):
+
+    def find_spec(self, fullname, path, target=None):
+        if not MODULES.match(fullname):
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path, target)
+        if spec and isinstance(spec.loader, importlib.machinery.SourceFileLoader):
+            spec.loader = _Loader(fullname, spec.origin)
+        return spec
+
+
+_finder = _Finder()
+
+
+def install():
+    """Strip debugging statements from modules imported from now on"""
+    if _finder not in sys.meta_path:
+        sys.meta_path.insert(0, _finder)
+
+
+def uninstall():
+    if _finder in sys.meta_path:
+        sys.meta_path.remove(_finder)
+
+
+if STRIP and not ENABLED:
+    install()
@@ -0,0 +1,44 @@
+"""
+Generators of synthetic inputs at a chosen scale.
+
+Every day has a module `day_NN` with the function
+
+    generate(rng: random.Random, scale: int) -> List[str]
+
+that returns lines of an input in the format of the puzzle of that day.
+At scale 1, the input is about as big as a real input, at scale N it is
+about N times bigger: N times more lines (or records) for inputs that are
+lists, N times more tiles for inputs that are grids. Where the puzzle needs
+it, the input is guaranteed to have a solution: a loop in the pipes of day
+10, a reflection line in every pattern of day 13, a trajectory of the rock
+through all hailstones on day 24 and so on.
+
+Inputs are reproducible: the same day, scale and seed always produce
+the same input.
+
+Usage:
+>>> text = generate(10, scale=100, seed=1)
+"""
+
+import os
+import random
+from importlib import import_module
+from typing import Tuple
+
+
+def generate(day: int, scale: int = 1, seed: int = 0) -> str:
+    """Generate input for given `day` and return it as a string"""
+    assert scale >= 1, f"Scale must be a positive number, got {scale}"
+    module = import_module(f"{__package__}.day_{int(day):02}")
+    rng = random.Random(f"{int(day)}:{scale}:{seed}")
+    lines = module.generate(rng, scale)
+    return "\n".join(lines) + "\n"
+
+
+def available_days() -> Tuple[int, ...]:
+    """Days for which a generator is available"""
+    thisdir = os.path.dirname(__file__)
+    return tuple(sorted(
+        int(fname[4:6]) for fname in os.listdir(thisdir)
+        if fname.startswith("day_") and fname.endswith(".py")
+    ))
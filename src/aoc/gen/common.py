@@ -0,0 +1,59 @@
+"""Helpers shared by generators of inputs"""
+
+import math
+import random
+import string
+from typing import List, Set
+
+
+def side(base: int, scale: int, odd: bool = False) -> int:
+    """Side of a square grid that has `scale` times more tiles than
+    the grid with the side `base`."""
+    n = round(base * math.sqrt(scale))
+    if odd and n % 2 == 0:
+        n += 1
+    return n
+
+
+def names(
+    rng: random.Random,
+    count: int,
+    length: int = 3,
+    alphabet: str = string.ascii_lowercase,
+    exclude: Set[str] = frozenset()
+) -> List[str]:
+    """Make `count` unique random names of the given `length` or longer,
+    if there are too few names of the given length."""
+    while len(alphabet) ** length < 2 * (count + len(exclude)):
+        length += 1
+    seen = set(exclude)
+    res = []
+    while len(res) < count:
+        name = "".join(rng.choices(alphabet, k=length))
+        if name not in seen:
+            seen.add(name)
+            res.append(name)
+    return res
+
+
+def spanning_tree(rng: random.Random, width: int, height: int):
+    """Random spanning tree of the grid of `width` x `height` nodes,
+    built by randomized depth first search. Returns edges as pairs of
+    nodes (x, y)."""
+    start = (rng.randrange(width), rng.randrange(height))
+    visited = {start}
+    stack = [start]
+    edges = []
+    while stack:
+        x, y = stack[-1]
+        nexts = [(x + dx, y + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                 if 0 <= x + dx < width and 0 <= y + dy < height
+                 and (x + dx, y + dy) not in visited]
+        if nexts:
+            node = rng.choice(nexts)
+            visited.add(node)
+            edges.append(((x, y), node))
+            stack.append(node)
+        else:
+            stack.pop()
+    return edges
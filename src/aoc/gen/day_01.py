@@ -0,0 +1,26 @@
+"""Calibration document: lines of letters, digits and spelled digits.
+Every line has at least one digit. Size: 1000 lines."""
+
+import random
+import string
+from typing import List
+
+WORDS = "one two three four five six seven eight nine".split()
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    lines = []
+    for _ in range(1000 * scale):
+        tokens = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(1, 8)):
+            kind = rng.random()
+            if kind < 0.3:
+                tokens.append(str(rng.randint(1, 9)))
+            elif kind < 0.6:
+                tokens.append(rng.choice(WORDS))
+            else:
+                tokens.append("".join(rng.choices(string.ascii_lowercase,
+                                                  k=rng.randint(1, 5))))
+        rng.shuffle(tokens)
+        lines.append("".join(tokens))
+    return lines
@@ -0,0 +1,18 @@
+"""Games of drawing cubes. Size: 100 games."""
+
+import random
+from typing import List
+
+COLORS = ("red", "green", "blue")
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    lines = []
+    for gid in range(1, 100 * scale + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(COLORS, rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {color}"
+                                   for color in colors))
+        lines.append(f"Game {gid}: {'; '.join(draws)}")
+    return lines
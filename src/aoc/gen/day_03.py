@@ -0,0 +1,31 @@
+"""Engine schematic: numbers and symbols in a grid. Size: 140x140."""
+
+import random
+from typing import List
+
+from .common import side
+
+SYMBOLS = "*#+$/@=%&-"
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n = side(140, scale)
+    grid = [["."] * n for _ in range(n)]
+
+    def is_free(x: int, y: int) -> bool:
+        return not (0 <= x < n) or not grid[y][x].isdigit()
+
+    for _ in range(n * n // 12):
+        number = str(rng.randint(1, 999))
+        x, y = rng.randrange(n - len(number) + 1), rng.randrange(n)
+        cells = range(x - 1, x + len(number) + 1)
+        if all(grid[y][cx] == "." for cx in range(x, x + len(number))) \
+                and all(is_free(cx, y) for cx in cells):
+            grid[y][x:x + len(number)] = number
+
+    for _ in range(n * n // 18):
+        x, y = rng.randrange(n), rng.randrange(n)
+        if grid[y][x] == ".":
+            grid[y][x] = "*" if rng.random() < 0.4 else rng.choice(SYMBOLS)
+
+    return ["".join(row) for row in grid]
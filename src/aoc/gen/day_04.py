@@ -0,0 +1,26 @@
+"""Scratchcards with 10 winning numbers and 25 numbers you have.
+No card wins copies of cards past the end of the table.
+Size: 200 cards."""
+
+import random
+from typing import List
+
+MATCHES = [0] * 8 + [1, 1, 2, 3, 4, 5, 10]
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n_cards = 200 * scale
+    width = len(str(n_cards))
+    lines = []
+    for cid in range(1, n_cards + 1):
+        # mostly no matches, otherwise the number of copies explodes
+        n_matches = min(rng.choice(MATCHES), n_cards - cid)
+        numbers = rng.sample(range(1, 100), 35 - n_matches)
+        winning = numbers[:10]
+        have = numbers[10:] + winning[:n_matches]
+        rng.shuffle(have)
+        lines.append("Card {}: {} | {}".format(
+            str(cid).rjust(width),
+            " ".join(f"{n:2}" for n in winning),
+            " ".join(f"{n:2}" for n in have)))
+    return lines
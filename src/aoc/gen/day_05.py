@@ -0,0 +1,37 @@
+"""Almanac: seeds and seven maps of ranges of numbers.
+Size: 20 seeds (10 ranges), about 30 ranges in every map."""
+
+import random
+from typing import List
+
+CATEGORIES = ("seed soil fertilizer water light temperature"
+              " humidity location").split()
+
+MAX_NUMBER = 2**32
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    seeds = []
+    for _ in range(10 * scale):
+        start = rng.randrange(MAX_NUMBER // 2)
+        seeds.extend([start, rng.randint(1, 10**8)])
+    lines = ["seeds: " + " ".join(map(str, seeds))]
+
+    for src, dest in zip(CATEGORIES, CATEGORIES[1:]):
+        lines.extend(["", f"{src}-to-{dest} map:"])
+        n_ranges = rng.randint(20, 40) * scale
+        # non-overlapping source ranges, with some gaps between them
+        bounds = sorted(rng.sample(range(MAX_NUMBER), 2 * n_ranges))
+        starts = bounds[::2]
+        lengths = [end - start for start, end in zip(bounds[::2], bounds[1::2])]
+        # destinations are a permutation of the source ranges
+        order = list(range(n_ranges))
+        rng.shuffle(order)
+        dest_start, dests = 0, [0] * n_ranges
+        for idx in order:
+            dest_start += rng.randrange(10**6)
+            dests[idx] = dest_start
+            dest_start += lengths[idx]
+        for start, dest_start, length in zip(starts, dests, lengths):
+            lines.append(f"{dest_start} {start} {length}")
+    return lines
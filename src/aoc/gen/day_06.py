@@ -0,0 +1,28 @@
+"""Boat races: times and records. Every race, and also the race made by
+concatenating numbers of all races, can be won. Size: 4 races."""
+
+import random
+from typing import List, Tuple
+
+
+def can_win(time: int, distance: int) -> bool:
+    return (time // 2) * (time - time // 2) > distance
+
+
+def make_race(rng: random.Random) -> Tuple[int, int]:
+    time = rng.randint(30, 99)
+    best = (time // 2) * (time - time // 2)
+    return time, rng.randint(best // 3, best - 1)
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    while True:
+        races = [make_race(rng) for _ in range(4 * scale)]
+        time = int("".join(str(t) for t, _ in races))
+        distance = int("".join(str(d) for _, d in races))
+        if can_win(time, distance):
+            break
+    return [
+        "Time:    " + " ".join(f"{t:>5}" for t, _ in races),
+        "Distance:" + " ".join(f"{d:>5}" for _, d in races),
+    ]
@@ -0,0 +1,21 @@
+"""Camel Cards: hands with bids. Hands are unique as long as there are
+enough distinct hands. Size: 1000 hands."""
+
+import random
+from typing import List
+
+CARDS = "23456789TJQKA"
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n_hands = 1000 * scale
+    unique = n_hands <= len(CARDS) ** 5 // 2
+    hands, seen = [], set()
+    while len(hands) < n_hands:
+        # favour hands with repeated cards, like in real inputs
+        pool = rng.sample(CARDS, rng.randint(1, 5))
+        hand = "".join(rng.choices(pool, k=5))
+        if not (unique and hand in seen):
+            seen.add(hand)
+            hands.append(hand)
+    return [f"{hand} {rng.randint(1, 1000)}" for hand in hands]
@@ -0,0 +1,58 @@
+"""Network of nodes and the left/right instructions.
+
+Every ghost walks its own part of the network: from the start node (..A)
+through positions 1..P-1, at each position there are two nodes, one taken
+after L and another taken after R. Position P is the end node (..Z) that
+leads to the same nodes as the start node. Therefore, the end node is
+reached after P, 2P, 3P... steps. P is a multiple of the length of the
+instructions, as is the case for real inputs. One of the ghosts goes
+from AAA to ZZZ.
+
+Size: about 750 nodes.
+"""
+
+import bisect
+import random
+import string
+from typing import List
+
+from .common import names
+
+PRIMES = [p for p in range(2, 10**5)
+          if all(p % d for d in range(2, int(p**0.5) + 1))]
+
+N_GHOSTS = 6
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n_steps = rng.randint(7, 13)
+    tape = "".join(rng.choice("LR") for _ in range(n_steps))
+    # number of positions of a ghost P = cycles * n_steps
+    avg_cycles = max(3, 750 * scale // (2 * N_GHOSTS * n_steps))
+    idx = bisect.bisect(PRIMES, avg_cycles)
+    cycles = rng.sample(PRIMES[max(0, idx - N_GHOSTS):idx + N_GHOSTS], N_GHOSTS)
+
+    n_nodes = sum(2 * c * n_steps for c in cycles)
+    alphabet = string.ascii_uppercase[1:-1]
+    tags = iter(names(rng, n_nodes + 2 * N_GHOSTS, length=2, alphabet=alphabet))
+
+    network = []
+    for ghost, c in enumerate(cycles):
+        tag = next(tags)
+        start, end = ("AAA", "ZZZ") if ghost == 0 else (f"{tag}A", f"{tag}Z")
+        first = None
+        nodes = [start]
+        for _ in range(1, c * n_steps):
+            pair = (next(tags) + rng.choice(alphabet),
+                    next(tags) + rng.choice(alphabet))
+            for node in nodes:
+                network.append((node, pair))
+            first = first or pair
+            nodes = pair
+        for node in nodes:
+            network.append((node, (end, end)))
+        network.append((end, first))
+
+    rng.shuffle(network)
+    return [tape, ""] + [f"{src} = ({left}, {right})"
+                         for src, (left, right) in network]
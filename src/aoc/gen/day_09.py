@@ -0,0 +1,21 @@
+"""Histories of 21 values, every history is a polynomial sequence of
+degree less than 20, so that differences eventually become zeros.
+Size: 200 histories."""
+
+import random
+from math import comb
+from typing import List
+
+LENGTH = 21
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    lines = []
+    for _ in range(200 * scale):
+        degree = rng.randint(1, 15)
+        # the first element of each row of differences
+        coefs = [rng.randint(-20, 20) for _ in range(degree + 1)]
+        values = [sum(c * comb(n, k) for k, c in enumerate(coefs))
+                  for n in range(LENGTH)]
+        lines.append(" ".join(map(str, values)))
+    return lines
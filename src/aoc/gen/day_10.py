@@ -0,0 +1,90 @@
+"""Field of pipes with a single loop that goes through S.
+
+The loop is the boundary of a tree-like region: nodes of a random spanning
+tree are blocks of 3x3 tiles and edges of the tree are passages between
+them. The boundary of such a region is a simple closed line. Neighbouring
+blocks that are not connected are separated by a gap of one tile, so that
+the outside squeezes between pipes deep inside the loop. Tiles that are not
+on the loop are random pipes.
+
+Size: 140x140.
+"""
+
+import random
+from typing import List
+
+from .common import side, spanning_tree
+
+BLOCK = 3  # side of a node of the tree, in tiles
+GAP = 1    # tiles between nodes
+
+PIPES = {
+    frozenset("NS"): "|", frozenset("EW"): "-",
+    frozenset("NE"): "L", frozenset("NW"): "J",
+    frozenset("SW"): "7", frozenset("SE"): "F",
+}
+
+STEPS = {"N": (0, -1), "S": (0, 1), "E": (1, 0), "W": (-1, 0)}
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n = side(140, scale)
+    n_nodes = (n - 2 - GAP) // (BLOCK + GAP)
+
+    # region of cells, a cell (x, y) is the square between the corners
+    # (x, y) and (x+1, y+1). Corners are tiles of the resulting field.
+    region = set()
+    for (x1, y1), (x2, y2) in spanning_tree(rng, n_nodes, n_nodes):
+        for x, y in ((x1, y1), (x2, y2)):
+            x0, y0 = GAP + x * (BLOCK + GAP), GAP + y * (BLOCK + GAP)
+            region.update((x0 + dx, y0 + dy)
+                          for dx in range(BLOCK) for dy in range(BLOCK))
+        # passage between two nodes
+        xs = range(GAP + min(x1, x2) * (BLOCK + GAP),
+                   GAP + max(x1, x2) * (BLOCK + GAP) + BLOCK)
+        ys = range(GAP + min(y1, y2) * (BLOCK + GAP),
+                   GAP + max(y1, y2) * (BLOCK + GAP) + BLOCK)
+        region.update((x, y) for x in xs for y in ys)
+
+    # boundary of the region, going clockwise: corner -> next corner
+    successor = {}
+    for x, y in region:
+        if (x, y - 1) not in region:
+            successor[(x, y)] = (x + 1, y)
+        if (x + 1, y) not in region:
+            successor[(x + 1, y)] = (x + 1, y + 1)
+        if (x, y + 1) not in region:
+            successor[(x + 1, y + 1)] = (x, y + 1)
+        if (x - 1, y) not in region:
+            successor[(x, y + 1)] = (x, y)
+
+    grid = [[rng.choice("|-LJ7F.") for _ in range(n)] for _ in range(n)]
+    loop = _trace(successor)
+    for idx, (x, y) in enumerate(loop):
+        dirs = {_direction((x, y), loop[idx - 1]),
+                _direction((x, y), loop[(idx + 1) % len(loop)])}
+        grid[y][x] = PIPES[frozenset(dirs)]
+
+    # S must not be confused by pipes around it that are not in the loop
+    sx, sy = rng.choice(loop)
+    on_loop = set(loop)
+    for dx, dy in STEPS.values():
+        if (sx + dx, sy + dy) not in on_loop:
+            grid[sy + dy][sx + dx] = "."
+    grid[sy][sx] = "S"
+
+    return ["".join(row) for row in grid]
+
+
+def _trace(successor) -> List:
+    start = min(successor)
+    loop = [start]
+    while successor[loop[-1]] != start:
+        loop.append(successor[loop[-1]])
+    assert len(loop) == len(successor), "The boundary is not a single loop"
+    return loop
+
+
+def _direction(src, dest) -> str:
+    step = (dest[0] - src[0], dest[1] - src[1])
+    return next(d for d, s in STEPS.items() if s == step)
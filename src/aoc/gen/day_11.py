@@ -0,0 +1,19 @@
+"""Image of galaxies with some empty rows and columns. Size: 140x140."""
+
+import random
+from typing import List
+
+from .common import side
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n = side(140, scale)
+    empty_rows = set(rng.sample(range(n), n // 20))
+    empty_cols = set(rng.sample(range(n), n // 20))
+    grid = [["."] * n for _ in range(n)]
+    for y in range(n):
+        for x in range(n):
+            if y not in empty_rows and x not in empty_cols \
+                    and rng.random() < 0.025:
+                grid[y][x] = "#"
+    return ["".join(row) for row in grid]
@@ -0,0 +1,27 @@
+"""Condition records of springs. Every record is made from an actual row
+of springs, some of which are then replaced with ?, so that there is at
+least one arrangement. Size: 1000 records."""
+
+import random
+from typing import List
+
+MAX_LENGTH = 20
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    lines = []
+    for _ in range(1000 * scale):
+        groups = [rng.randint(1, 6) for _ in range(rng.randint(1, 6))]
+        while sum(groups) + len(groups) - 1 > MAX_LENGTH:
+            groups.pop()
+        length = rng.randint(sum(groups) + len(groups) - 1, MAX_LENGTH)
+        # distribute extra operational springs between the groups
+        gaps = [0] + [1] * (len(groups) - 1) + [0]
+        for _ in range(length - sum(groups) - sum(gaps)):
+            gaps[rng.randrange(len(gaps))] += 1
+        row = "." * gaps[0]
+        for group, gap in zip(groups, gaps[1:]):
+            row += "#" * group + "." * gap
+        row = "".join("?" if rng.random() < 0.5 else c for c in row)
+        lines.append(f"{row} {','.join(map(str, groups))}")
+    return lines
@@ -0,0 +1,78 @@
+"""Patterns of ash and rocks.
+
+Every pattern has exactly one perfect reflection line and, after fixing
+exactly one smudge, exactly one other reflection line. A pattern is built
+symmetric across a vertical line A and a horizontal line B. Then a tile
+that is not mirrored across A (it lies outside of the columns reflected
+by A) but is mirrored across B is flipped. This leaves A the only perfect
+reflection and B the reflection with a smudge. Patterns that have other
+reflections by chance are discarded.
+
+Size: 100 patterns.
+"""
+
+import random
+from typing import List, Optional, Tuple
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    lines = []
+    for _ in range(100 * scale):
+        pattern = None
+        while pattern is None:
+            pattern = make_pattern(rng)
+        if rng.random() < 0.5:
+            pattern = ["".join(col) for col in zip(*pattern)]
+        lines.extend(pattern + [""])
+    return lines[:-1]
+
+
+def make_pattern(rng: random.Random) -> Optional[List[str]]:
+    width, height = rng.randint(5, 17), rng.randint(5, 17)
+    # vertical reflection between columns col-1 and col, not centered,
+    # horizontal reflection between rows row-1 and row
+    col = rng.choice([c for c in range(1, width) if 2 * c != width])
+    row = rng.randint(1, height - 1)
+
+    def mirror(i: int, axis: int, size: int) -> int:
+        j = 2 * axis - 1 - i
+        return j if 0 <= j < size else i
+
+    grid = [[None] * width for _ in range(height)]
+    for y in range(height):
+        for x in range(width):
+            if grid[y][x] is None:
+                tile = rng.choice("#.")
+                mx, my = mirror(x, col, width), mirror(y, row, height)
+                for cx, cy in ((x, y), (mx, y), (x, my), (mx, my)):
+                    grid[cy][cx] = tile
+
+    smudges = [(x, y) for x in range(width) for y in range(height)
+               if mirror(x, col, width) == x and mirror(y, row, height) != y]
+    x, y = rng.choice(smudges)
+    grid[y][x] = "#" if grid[y][x] == "." else "."
+    pattern = ["".join(r) for r in grid]
+
+    if reflections(pattern) == ([], [(row, 1)]) \
+            and reflections(transpose(pattern)) == ([col], []):
+        return pattern
+    return None
+
+
+def transpose(pattern: List[str]) -> List[str]:
+    return ["".join(col) for col in zip(*pattern)]
+
+
+def reflections(pattern: List[str]) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """Horizontal reflection lines: perfect ones and those with one or
+    two differences, as tuples (row, differences)."""
+    perfect, almost = [], []
+    for row in range(1, len(pattern)):
+        diffs = sum(a != b
+                    for top, bottom in zip(pattern[row - 1::-1], pattern[row:])
+                    for a, b in zip(top, bottom))
+        if diffs == 0:
+            perfect.append(row)
+        elif diffs <= 2:
+            almost.append((row, diffs))
+    return perfect, almost
@@ -0,0 +1,12 @@
+"""Platform with round rocks (O) and cube rocks (#). Size: 100x100."""
+
+import random
+from typing import List
+
+from .common import side
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n = side(100, scale)
+    return ["".join(rng.choices("O#.", weights=(20, 10, 70), k=n))
+            for _ in range(n)]
@@ -0,0 +1,22 @@
+"""Initialization sequence: a single line of steps separated by commas.
+Size: 4000 steps with 500 distinct labels."""
+
+import random
+from typing import List
+
+from .common import names
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    labels = [name[:rng.randint(2, len(name))]
+              for name in names(rng, 500 * scale, length=6)]
+    labels = list(set(labels))
+    labels.sort()
+    steps = []
+    for _ in range(4000 * scale):
+        label = rng.choice(labels)
+        if rng.random() < 0.4:
+            steps.append(f"{label}-")
+        else:
+            steps.append(f"{label}={rng.randint(1, 9)}")
+    return [",".join(steps)]
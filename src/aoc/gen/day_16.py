@@ -0,0 +1,12 @@
+"""Contraption of mirrors and splitters. Size: 110x110."""
+
+import random
+from typing import List
+
+from .common import side
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n = side(110, scale)
+    return ["".join(rng.choices("./\\|-", weights=(90, 3, 3, 2, 2), k=n))
+            for _ in range(n)]
@@ -0,0 +1,21 @@
+"""City blocks with heat loss 1-9, higher in the middle of the city as
+in real inputs. Size: 141x141."""
+
+import random
+from typing import List
+
+from .common import side
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n = side(141, scale)
+    lines = []
+    for y in range(n):
+        row = []
+        for x in range(n):
+            # 0 at the corners, 1 in the center
+            closeness = 1 - (abs(2 * x - n) + abs(2 * y - n)) / (2 * n)
+            base = 1 + round(6 * closeness)
+            row.append(str(min(9, max(1, base + rng.randint(-1, 2)))))
+        lines.append("".join(row))
+    return lines
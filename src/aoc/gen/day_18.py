@@ -0,0 +1,60 @@
+"""Dig plan. Both the plan made of directions and lengths (part 1) and
+the plan encoded in colors (part 2) dig a closed trench that does not
+touch itself. Each plan is an x-monotone polygon: its top and bottom
+sides are random walks that never meet. No side is longer than 0xfffff.
+
+Size: 700 instructions.
+"""
+
+import random
+from typing import List, Tuple
+
+STEPS = {"R": "0", "D": "1", "L": "2", "U": "3"}
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n_columns = 175 * scale
+    plan1 = make_polygon(rng, n_columns, max_step=10)
+    # lengths must fit into 5 hex digits
+    plan2 = make_polygon(rng, n_columns, max_step=400_000)
+    return [f"{d1} {n1} (#{n2:05x}{STEPS[d2]})"
+            for (d1, n1), (d2, n2) in zip(plan1, plan2)]
+
+
+def make_polygon(
+    rng: random.Random, n_columns: int, max_step: int
+) -> List[Tuple[str, int]]:
+    """Make instructions that go along the top side from left to right,
+    down, along the bottom side from right to left and up. The y axis
+    goes down."""
+    tops, bottoms = [0], [rng.randint(1, max_step)]
+    while len(tops) < n_columns:
+        top = tops[-1] + _nonzero(rng, max_step)
+        bottom = bottoms[-1] + _nonzero(rng, max_step)
+        # adjacent columns must overlap, otherwise the sides would meet
+        if top < bottom and top < bottoms[-1] and tops[-1] < bottom \
+                and bottom - top <= 2 * max_step:
+            tops.append(top)
+            bottoms.append(bottom)
+    widths = [rng.randint(1, max_step) for _ in range(n_columns)]
+
+    plan = []
+    for idx, (top, width) in enumerate(zip(tops, widths)):
+        if idx:
+            plan.append(_vertical(top - tops[idx - 1]))
+        plan.append(("R", width))
+    plan.append(_vertical(bottoms[-1] - tops[-1]))
+    for idx in reversed(range(n_columns)):
+        plan.append(("L", widths[idx]))
+        if idx:
+            plan.append(_vertical(bottoms[idx - 1] - bottoms[idx]))
+    plan.append(_vertical(tops[0] - bottoms[0]))
+    return plan
+
+
+def _nonzero(rng: random.Random, max_step: int) -> int:
+    return rng.choice([-1, 1]) * rng.randint(1, max_step)
+
+
+def _vertical(dy: int) -> Tuple[str, int]:
+    return ("D", dy) if dy > 0 else ("U", -dy)
@@ -0,0 +1,38 @@
+"""Workflows and parts. The workflows form a tree rooted at `in`, so
+every part is eventually accepted or rejected.
+Size: 550 workflows and 200 parts."""
+
+import random
+from typing import List
+
+from .common import names
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n_workflows = 550 * scale
+    wf_names = ["in"] + names(rng, n_workflows - 1, length=2,
+                              exclude={"in"})
+    # each workflow (except `in`) is sent to by a rule of an earlier one
+    targets = {name: [] for name in wf_names}
+    for idx, name in enumerate(wf_names[1:], 1):
+        parent = wf_names[rng.randrange(idx)]
+        targets[parent].append(name)
+
+    lines = []
+    for name in wf_names:
+        children = targets[name]
+        n_rules = max(len(children), rng.randint(1, 3))
+        dests = children + [rng.choice("AR") for _ in range(n_rules - len(children))]
+        rng.shuffle(dests)
+        fallback = dests.pop() if len(dests) > 1 and rng.random() < 0.5 \
+            else rng.choice("AR")
+        rules = [f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{dest}"
+                 for dest in dests]
+        lines.append(f"{name}{{{','.join(rules + [fallback])}}}")
+    rng.shuffle(lines)
+
+    lines.append("")
+    for _ in range(200 * scale):
+        ratings = ",".join(f"{c}={rng.randint(1, 4000)}" for c in "xmas")
+        lines.append(f"{{{ratings}}}")
+    return lines
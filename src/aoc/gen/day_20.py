@@ -0,0 +1,44 @@
+"""Configuration of communication modules, structured as in real inputs.
+
+The broadcaster starts several counters. A counter is a chain of 12
+flip-flops and a conjunction. Every flip-flop that stands for the bit 1
+of the period of the counter sends pulses to the conjunction, every other
+flip-flop receives pulses from it. The conjunction of every counter goes
+through an inverter into the final conjunction that sends to `rx`.
+
+Size: 4 counters, 58 modules.
+"""
+
+import random
+from typing import List
+
+from .common import names
+
+N_BITS = 12
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n_counters = 4 * scale
+    tags = iter(names(rng, n_counters * (N_BITS + 2) + 1, length=2,
+                      exclude={"rx"}))
+    final = next(tags)
+    firsts, lines = [], []
+    for _ in range(n_counters):
+        # odd number with the highest bit set
+        period = rng.randrange(2**(N_BITS - 1), 2**N_BITS) | 1
+        flipflops = [next(tags) for _ in range(N_BITS)]
+        hub, inverter = next(tags), next(tags)
+        firsts.append(flipflops[0])
+        for bit, ff in enumerate(flipflops):
+            dests = flipflops[bit + 1:bit + 2]
+            if period >> bit & 1:
+                dests.append(hub)
+            lines.append(f"%{ff} -> {', '.join(dests)}")
+        hub_dests = [ff for bit, ff in enumerate(flipflops)
+                     if not period >> bit & 1 or bit == 0]
+        lines.append(f"&{hub} -> {', '.join(hub_dests + [inverter])}")
+        lines.append(f"&{inverter} -> {final}")
+    lines.append(f"&{final} -> rx")
+    lines.append(f"broadcaster -> {', '.join(firsts)}")
+    rng.shuffle(lines)
+    return lines
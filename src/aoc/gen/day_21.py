@@ -0,0 +1,22 @@
+"""Garden with rocks and the start S in the center. As in real inputs,
+the row and the column of S and the border are free of rocks.
+Size: 131x131."""
+
+import random
+from typing import List
+
+from .common import side
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n = side(131, scale, odd=True)
+    mid = n // 2
+    grid = []
+    for y in range(n):
+        row = []
+        for x in range(n):
+            free = x in (0, mid, n - 1) or y in (0, mid, n - 1)
+            row.append("." if free or rng.random() > 0.15 else "#")
+        grid.append(row)
+    grid[mid][mid] = "S"
+    return ["".join(row) for row in grid]
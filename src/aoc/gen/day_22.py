@@ -0,0 +1,30 @@
+"""Snapshot of falling bricks, no two bricks overlap. The footprint of
+the stack is 10x10, bricks are up to 4 cubes long.
+Size: 1200 bricks."""
+
+import random
+from typing import List
+
+WIDTH = 10
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n_bricks = 1200 * scale
+    height = n_bricks // 4
+    occupied = set()
+    lines = []
+    while len(lines) < n_bricks:
+        start = [rng.randrange(WIDTH), rng.randrange(WIDTH),
+                 rng.randint(1, height)]
+        end = list(start)
+        axis = rng.randrange(3)
+        end[axis] += rng.randint(0, 3)
+        if end[0] >= WIDTH or end[1] >= WIDTH:
+            continue
+        cubes = {tuple(start[:axis] + [c] + start[axis + 1:])
+                 for c in range(start[axis], end[axis] + 1)}
+        if cubes & occupied:
+            continue
+        occupied |= cubes
+        lines.append("{},{},{}~{},{},{}".format(*start, *end))
+    return lines
@@ -0,0 +1,63 @@
+"""Map of hiking trails with slopes.
+
+Trails are a maze made from a random spanning tree of junctions plus
+a few extra passages that make loops. The number of loops does not grow
+with the scale, otherwise the number of paths in part 2 would explode. Slopes lead away from the entrance
+along the shortest path, so the exit is reachable when slopes must be
+followed (part 1). Slopes are placed only next to junctions, as in real
+inputs. The entrance is in the top row, the exit in the bottom row.
+
+Size: 141x141.
+"""
+
+import random
+from collections import deque
+from typing import List
+
+from .common import side, spanning_tree
+
+N_LOOPS = 12
+
+SLOPES = {(1, 0): ">", (-1, 0): "<", (0, 1): "v", (0, -1): "^"}
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n = side(141, scale, odd=True)
+    cells = n // 2  # cells of the maze are tiles with odd coordinates
+    grid = [["#"] * n for _ in range(n)]
+
+    edges = spanning_tree(rng, cells, cells)
+    for _ in range(N_LOOPS):
+        x, y = rng.randrange(cells - 1), rng.randrange(cells - 1)
+        edges.append(((x, y), (x + 1, y) if rng.random() < 0.5 else (x, y + 1)))
+
+    neighbors = {}
+    for (x1, y1), (x2, y2) in edges:
+        grid[2 * y1 + 1][2 * x1 + 1] = grid[2 * y2 + 1][2 * x2 + 1] = "."
+        grid[y1 + y2 + 1][x1 + x2 + 1] = "."
+        neighbors.setdefault((x1, y1), set()).add((x2, y2))
+        neighbors.setdefault((x2, y2), set()).add((x1, y1))
+    grid[0][1] = grid[n - 1][n - 2] = "."
+
+    # distances from the entrance
+    distances = {(0, 0): 0}
+    queue = deque([(0, 0)])
+    while queue:
+        cell = queue.popleft()
+        for nxt in neighbors[cell]:
+            if nxt not in distances:
+                distances[nxt] = distances[cell] + 1
+                queue.append(nxt)
+
+    for cell, nexts in neighbors.items():
+        if len(nexts) < 3:
+            continue
+        for other in nexts:
+            src, dest = sorted([cell, other], key=distances.get)
+            if distances[src] == distances[dest]:
+                continue
+            step = (dest[0] - src[0], dest[1] - src[1])
+            x, y = src[0] + dest[0] + 1, src[1] + dest[1] + 1
+            grid[y][x] = SLOPES[step]
+
+    return ["".join(row) for row in grid]
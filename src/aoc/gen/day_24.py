@@ -0,0 +1,26 @@
+"""Hailstones. There is a rock thrown from a position with a velocity
+(both integer) that hits every hailstone at an integer time: hailstones
+are made by choosing distinct times of collision and velocities and
+computing the positions from where the hailstones started.
+
+Size: 300 hailstones.
+"""
+
+import random
+from typing import List
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n_stones = 300 * scale
+    rock = [rng.randint(2 * 10**14, 4 * 10**14) for _ in range(3)]
+    rock_velocity = [rng.randint(-300, 300) for _ in range(3)]
+    times = rng.sample(range(10**11, 10**12), n_stones)
+    lines = []
+    for t in times:
+        velocity = [v + rng.randint(-200, 200) for v in rock_velocity]
+        if velocity == rock_velocity:
+            velocity[0] += 1
+        position = [p + t * (rv - v)
+                    for p, rv, v in zip(rock, rock_velocity, velocity)]
+        lines.append("{}, {}, {} @ {}, {}, {}".format(*position, *velocity))
+    return lines
@@ -0,0 +1,41 @@
+"""Wiring diagram: two well connected groups of components joined by
+exactly three wires. Each group is a ring where every component is wired
+to the next two components (so at least four wires must be cut to split
+a group) plus random extra wires.
+
+Size: 1500 components.
+"""
+
+import random
+from collections import defaultdict
+from typing import List
+
+from .common import names
+
+
+def generate(rng: random.Random, scale: int) -> List[str]:
+    n_components = 1500 * scale
+    components = names(rng, n_components)
+    size = rng.randint(n_components * 2 // 5, n_components * 3 // 5)
+    groups = [components[:size], components[size:]]
+
+    wires = set()
+    for group in groups:
+        n = len(group)
+        for i, comp in enumerate(group):
+            others = [group[(i + 1) % n], group[(i + 2) % n]]
+            if rng.random() < 0.5:
+                others.append(rng.choice(group))
+            wires.update(tuple(sorted((comp, other)))
+                         for other in others if other != comp)
+    wires.update(zip(rng.sample(groups[0], 3), rng.sample(groups[1], 3)))
+
+    # every wire is listed once, at one of its ends
+    diagram = defaultdict(set)
+    for u, v in sorted(wires):
+        if rng.random() < 0.5:
+            u, v = v, u
+        diagram[u].add(v)
+    lines = [f"{u}: {' '.join(sorted(vs))}" for u, vs in diagram.items()]
+    rng.shuffle(lines)
+    return lines
@@ -73,6 +73,10 @@ class Grid2D:
         # how to fix it w/o implementing __copy__ and __deepcopy__ or
         # implementing them the right way?
         # print(f"invoking method '{att}'")
+        if att.startswith('__'):
+            # special methods are not delegated. Otherwise, for example,
+            # pickle takes `method` below for __setstate__
+            raise AttributeError(att)
         def method(*args, **kwargs):
             if att in self.__delegated_methods:
                 return getattr(self.matrix, att)(*args, **kwargs)
@@ -0,0 +1,156 @@
+"""
+Counters and timers of hot code paths.
+
+Instrumentation is enabled by the environment variable INSTRUMENT, that must
+be set before aoc modules are imported:
+
+    INSTRUMENT=1 aoc2023 solve 17
+
+When enabled, the primitives
+* `@timed` -- count calls of a function and time them,
+* `count("name")` -- count how many times a point in the code was reached,
+accumulate statistics in a process-wide registry: the number of calls,
+the total and the maximum time in nanoseconds (time.perf_counter_ns).
+When the process exits, the summary is printed to stderr. Worker processes
+of a pool do not print it, run with `--jobs 1` to see the summary.
+
+When disabled, `@timed` returns the function unchanged and `count()` does
+nothing, so that the instrumented code runs at the original speed, except
+for the call of `count()` itself. In the hottest loops, guard it:
+
+    if instrument.ENABLED:
+        count("name")
+"""
+
+import atexit
+import functools
+import inspect
+import os
+import sys
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import Callable, Dict, List
+
+from .metrics import format_ns
+
+ENABLED = int(os.environ.get('INSTRUMENT', 0))
+
+# name -> [number of calls, total ns, max ns]
+_registry: Dict[str, List[int]] = {}
+
+
+@dataclass
+class Stats:
+    calls: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+
+def _stats_of(name: str) -> List[int]:
+    return _registry.setdefault(name, [0, 0, 0])
+
+
+def timed(func: Callable = None, *, name: str = None) -> Callable:
+    """Decorator that records calls and runtime of the function under
+    given `name` (by default, module.qualname of the function).
+
+    For a generator function, the runtime is the time spent in producing
+    all its items, not including the time the caller spends between them.
+
+    Usage:
+    >>> @timed
+    >>> def neighbors(...): ...
+    >>> @timed(name="day17.neighbors")
+    >>> def neighbors(...): ...
+    """
+    def decorate(func: Callable) -> Callable:
+        if not ENABLED:
+            return func
+        stats = _stats_of(name or f"{func.__module__}.{func.__qualname__}")
+
+        def record(elapsed: int):
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(perf_counter_ns() - start)
+
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            elapsed = 0
+            items = func(*args, **kwargs)
+            try:
+                while True:
+                    start = perf_counter_ns()
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed += perf_counter_ns() - start
+                    yield item
+            finally:
+                record(elapsed)
+
+        if inspect.isgeneratorfunction(func):
+            return generator_wrapper
+        return wrapper
+
+    return decorate(func) if func else decorate
+
+
+def _count(name: str, n: int = 1):
+    """Increment the counter `name` by `n`"""
+    stats = _registry.get(name) or _stats_of(name)
+    stats[0] += n
+
+
+def _count_nothing(name: str, n: int = 1):
+    pass
+
+
+count = _count if ENABLED else _count_nothing
+
+
+def registry() -> Dict[str, Stats]:
+    """Statistics collected so far, by name"""
+    return {name: Stats(*values) for name, values in _registry.items()}
+
+
+def reset():
+    """Forget statistics collected so far"""
+    _registry.clear()
+
+
+def summary() -> str:
+    """Table of statistics, the most expensive first"""
+    stats = sorted(registry().items(),
+                   key=lambda item: (-item[1].total_ns, -item[1].calls))
+    width = max([len(name) for name, _ in stats] + [4])
+    lines = [f"{'name':<{width}} {'calls':>12} {'total':>9}"
+             f" {'mean':>9} {'max':>9}"]
+    for name, st in stats:
+        if st.total_ns:
+            times = (format_ns(st.total_ns), format_ns(st.total_ns // st.calls),
+                     format_ns(st.max_ns))
+        else:
+            times = ("-", "-", "-")
+        lines.append(f"{name:<{width}} {st.calls:>12}"
+                     f" {times[0]:>9} {times[1]:>9} {times[2]:>9}")
+    return "\n".join(lines)
+
+
+def _dump():
+    if _registry:
+        print(f"--- Instrumentation ---\n{summary()}", file=sys.stderr)
+
+
+if ENABLED:
+    atexit.register(_dump)
@@ -1,5 +1,6 @@
 from typing import Any, Callable, List, Optional, Tuple, Union
 
+from .instrument import timed
 from .point import Point
 
 T_COORD = Tuple[int, int]
@@ -58,6 +59,7 @@ class Matrix(object):
         else:
             raise IndexError(f"Matrix index {xy} out of range")
 
+    @timed
     def get(self, xy: Union[int, Tuple[int, int]], default = None):
         xy = self.to_coord(xy)
         if self._is_in_span(xy):
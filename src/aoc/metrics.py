@@ -0,0 +1,262 @@
+"""
+Measuring phases of running a solution: loading the input file, parsing
+it and solving.
+
+For every phase, the following is recorded:
+* wall clock time, excluding time spent in nested phases. For example,
+  when `solve_part_1(fname)` is measured, loading and parsing happen inside
+  of solving and are not counted as solving;
+* peak resident set size (RSS) of the process during the phase. On Linux,
+  the peak is reset at the beginning of every phase, elsewhere it is the peak
+  since the start of the process;
+* peak memory allocated by Python objects during the phase, as reported
+  by `tracemalloc`. Only in the mode "tracemalloc" that makes everything
+  run considerably slower.
+
+Measuring is off by default. It is switched on with the environment variable
+METRICS (METRICS=rss or METRICS=tracemalloc) or by calling `enable()`.
+When off, `recorder()` returns a recorder that does nothing.
+
+Usage:
+>>> rec = metrics.recorder()
+>>> with rec.phase("solve"):
+>>>     res = solve(inp)
+>>> rec.phases["solve"].time_ns
+"""
+
+import contextlib
+import os
+import re
+import resource
+import sys
+import time
+import tracemalloc
+import warnings
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+MODES = ("rss", "tracemalloc")
+
+PHASES = ("load", "parse", "solve")
+
+
+def _mode_from_env() -> Optional[str]:
+    """Mode given by the environment variable METRICS: one of MODES, or a
+    number or yes/no word that switches the default mode on or off.
+    Other values switch measuring off with a warning rather than break
+    every command at import."""
+    value = os.environ.get('METRICS', '0').strip().lower()
+    if value in MODES:
+        return value
+    if value in ("", "no", "false", "off"):
+        return None
+    if value in ("yes", "true", "on"):
+        return MODES[0]
+    try:
+        return MODES[0] if int(value) else None
+    except ValueError:
+        warnings.warn(f"Ignoring unknown value of METRICS: {value!r}")
+        return None
+
+
+MODE: Optional[str] = _mode_from_env()
+
+
+def enable(mode: Optional[str] = "rss"):
+    """Switch measuring on in given mode or off if `mode` is None"""
+    global MODE
+    assert mode is None or mode in MODES, f"Unknown mode: {mode}"
+    MODE = mode
+
+
+@dataclass
+class PhaseMetrics:
+    time_ns: int = 0
+    peak_rss: int = 0  # bytes
+    peak_traced: Optional[int] = None  # bytes, in mode tracemalloc only
+
+
+class Recorder:
+    """Records metrics of named phases. Phases can be nested and repeated:
+    repeated phases are accumulated (times are summed, peaks are maxed).
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, PhaseMetrics] = {}
+        # frames of the phases that are in progress:
+        # [name, start time, time of nested phases, peak rss, peak traced]
+        self._stack: List[List] = []
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        traced = MODE == "tracemalloc"
+        if traced and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self._stack:
+            # save what the outer phase has used so far
+            self._update_peaks(self._stack[-1], traced)
+        _reset_peak_rss()
+        if traced:
+            tracemalloc.reset_peak()
+        frame = [name, time.perf_counter_ns(), 0, 0, 0]
+        self._stack.append(frame)
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter_ns() - frame[1]
+            self._update_peaks(frame, traced)
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][2] += elapsed
+                _reset_peak_rss()
+                if traced:
+                    tracemalloc.reset_peak()
+
+            stats = self.phases.setdefault(name, PhaseMetrics())
+            stats.time_ns += elapsed - frame[2]
+            stats.peak_rss = max(stats.peak_rss, frame[3])
+            if traced:
+                stats.peak_traced = max(stats.peak_traced or 0, frame[4])
+
+    @staticmethod
+    def _update_peaks(frame: List, traced: bool):
+        frame[3] = max(frame[3], _peak_rss())
+        if traced:
+            frame[4] = max(frame[4], tracemalloc.get_traced_memory()[1])
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Make the current recorder the one returned by `recorder()`,
+        so that the phases measured in the code called within the block
+        (like utils.load_input) are recorded here.
+        """
+        global _active
+        previous, _active = _active, self
+        try:
+            yield self
+        finally:
+            _active = previous
+
+    def attach(self, inp: Any):
+        """Remember metrics recorded so far as those of producing given
+        input. Later, they can be retrieved with `inherit()`.
+
+        An active recorder already accumulates everything, moreover, keeping
+        inputs of every call would keep them in memory forever.
+        """
+        if self is not _active:
+            _inputs[id(inp)] = (inp, dict(self.phases))
+
+    def inherit(self, inp: Any):
+        """Add metrics of producing given input `inp` (loading and parsing),
+        if the input was produced while measuring. Inputs to some solutions
+        are tuples (input, parameter), the input is looked up as well.
+        """
+        for obj in (inp, inp[0] if isinstance(inp, tuple) and inp else None):
+            if id(obj) in _inputs:
+                self.phases.update(_inputs[id(obj)][1])
+                break
+
+
+class _NullRecorder:
+    """Recorder that does nothing, used when measuring is off"""
+
+    phases: Dict[str, PhaseMetrics] = {}
+
+    def phase(self, name: str):
+        return _NULL_CONTEXT
+
+    def activate(self):
+        return _NULL_CONTEXT
+
+    def attach(self, inp: Any):
+        pass
+
+    def inherit(self, inp: Any):
+        pass
+
+
+_NULL_CONTEXT = contextlib.nullcontext()
+_NULL_RECORDER = _NullRecorder()
+
+# the recorder that is set by Recorder.activate()
+_active: Optional[Recorder] = None
+
+# metrics of producing inputs, keyed by id() of the input object. The input
+# object itself is kept as well to guarantee that id() is not reused.
+_inputs: Dict[int, Tuple[Any, Dict[str, PhaseMetrics]]] = {}
+
+
+def recorder():
+    """Return the active recorder or a new one if measuring is on.
+    Otherwise return a recorder that does nothing."""
+    if _active is not None:
+        return _active
+    if MODE:
+        return Recorder()
+    return _NULL_RECORDER
+
+
+def _reset_peak_rss():
+    """Reset peak RSS of the process (Linux only)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as fd:
+            fd.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss() -> int:
+    """Peak RSS of the process in bytes"""
+    try:
+        with open("/proc/self/status") as fd:
+            m = re.search(r'VmHWM:\s+(\d+)\s+kB', fd.read())
+            return int(m[1]) * 1024
+    except (OSError, TypeError):
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def format_ns(value: float) -> str:
+    """Human readable representation of time given in nanoseconds"""
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if value >= scale:
+            return f"{value / scale:.2f}{unit}"
+    return f"{value:.0f}ns"
+
+
+def format_bytes(value: float) -> str:
+    """Human readable representation of the size given in bytes"""
+    for unit, scale in (("G", 2**30), ("M", 2**20), ("K", 2**10)):
+        if value >= scale:
+            return f"{value / scale:.1f}{unit}"
+    return f"{value:.0f}B"
+
+
+def format_table(rows: List[Tuple[str, str, Dict[str, PhaseMetrics]]]) -> str:
+    """Format metrics as a table with one line per case. A row is given
+    as a tuple (task, input, phases). For every phase, time and peak memory
+    are shown: peak memory of traced python objects if available, otherwise
+    peak RSS.
+    """
+    header = ["task", "input"]
+    for phase in PHASES:
+        header.extend([phase, "mem"])
+    lines = [header]
+    for task, inp, phases in rows:
+        line = [task, inp]
+        for phase in PHASES:
+            stats = phases.get(phase)
+            if stats is None:
+                line.extend(["-", "-"])
+            else:
+                peak = stats.peak_rss
+                if stats.peak_traced is not None:
+                    peak = stats.peak_traced
+                line.extend([format_ns(stats.time_ns), format_bytes(peak)])
+        lines.append(line)
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(val.ljust(w) for val, w in zip(line, widths)).rstrip()
+        for line in lines
+    )
@@ -0,0 +1,157 @@
+"""
+Priority queues for Dijkstra-like searches.
+
+Both queues have the same interface, so that a search can switch from one
+to the other:
+
+    queue.push(item, priority)  # add the item or lower its priority
+    queue.decrease_key(item, priority)
+    priority, item = queue.pop()  # the item with the lowest priority
+    len(queue), bool(queue)
+
+Items must be hashable, for example, states packed into ints. An item is
+in the queue at most once: pushing an item that is already queued with
+a lower or the same priority does nothing. Unlike queue.PriorityQueue,
+neither of them takes locks, and items are never compared with each other.
+
+* HeapQueue is a binary heap (heapq) for any priorities.
+* BucketQueue (Dial's algorithm) is for integer priorities when the edge
+  weights are small integers, like the heat losses 1..9 of day 17. It has
+  a bucket for every priority in the window [lowest, lowest + max_weight],
+  and both push and pop take constant time. Priorities must be monotone:
+  an item cannot be pushed with a priority lower than the priority of the
+  last popped item or greater than that plus max_weight. Until the first
+  pop, any priorities that fit into such a window can be pushed.
+
+Both implement decrease-key lazily: the item is added again with the new
+priority, and the outdated entry is skipped when it comes out.
+
+Usage:
+>>> queue = BucketQueue(max_weight=9)
+>>> queue.push(start, 0)
+>>> while queue:
+>>>     cost, state = queue.pop()
+>>>     for nstate, weight in neighbors(state):
+>>>         queue.push(nstate, cost + weight)
+"""
+
+import heapq
+from typing import Dict, Hashable, List, Tuple
+
+
+class HeapQueue:
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        self._priorities: Dict[Hashable, int] = {}
+        # tie breaker, so that items are never compared
+        self._counter = 0
+
+    def push(self, item: Hashable, priority: int) -> bool:
+        """Add `item` with given `priority` or lower the priority of the item
+        if it is already in the queue. Return True if the queue changed."""
+        current = self._priorities.get(item)
+        if current is not None and current <= priority:
+            return False
+        self._priorities[item] = priority
+        self._counter += 1
+        heapq.heappush(self._heap, (priority, self._counter, item))
+        return True
+
+    def decrease_key(self, item: Hashable, priority: int) -> bool:
+        """Lower the priority of the item that is in the queue"""
+        if item not in self._priorities:
+            raise KeyError(item)
+        return self.push(item, priority)
+
+    def pop(self) -> Tuple[int, Hashable]:
+        """Remove and return the item with the lowest priority as a tuple
+        (priority, item). Raise IndexError if the queue is empty."""
+        while self._heap:
+            priority, _, item = heapq.heappop(self._heap)
+            if self._priorities.get(item) == priority:
+                del self._priorities[item]
+                return priority, item
+        raise IndexError("pop from an empty priority queue")
+
+    def __len__(self) -> int:
+        return len(self._priorities)
+
+    def __bool__(self) -> bool:
+        return bool(self._priorities)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._priorities
+
+
+class BucketQueue:
+
+    def __init__(self, max_weight: int):
+        assert max_weight >= 0, f"Weights must be non-negative: {max_weight}"
+        self.max_weight = max_weight
+        # buckets[p % n_buckets] holds items of priority p
+        self._n_buckets = max_weight + 1
+        self._buckets: List[List[Hashable]] = [[] for _ in range(self._n_buckets)]
+        self._priorities: Dict[Hashable, int] = {}
+        # the lowest priority that can still be in the queue
+        self._lowest = 0
+        # the highest pushed priority, until the first pop
+        self._highest = None
+
+    def push(self, item: Hashable, priority: int) -> bool:
+        """Add `item` with given `priority` or lower the priority of the item
+        if it is already in the queue. Return True if the queue changed."""
+        current = self._priorities.get(item)
+        if current is not None and current <= priority:
+            return False
+        if not self._priorities:
+            self._lowest = self._highest = priority
+        elif self._highest is not None:
+            lowest = min(self._lowest, priority)
+            highest = max(self._highest, priority)
+            if highest - lowest > self.max_weight:
+                raise ValueError(
+                    f"Priorities {lowest}..{highest} do not fit into"
+                    f" the window of {self.max_weight + 1}")
+            self._lowest, self._highest = lowest, highest
+        elif not self._lowest <= priority <= self._lowest + self.max_weight:
+            raise ValueError(
+                f"Priority {priority} is outside of the window"
+                f" [{self._lowest}, {self._lowest + self.max_weight}]")
+        self._priorities[item] = priority
+        self._buckets[priority % self._n_buckets].append(item)
+        return True
+
+    def decrease_key(self, item: Hashable, priority: int) -> bool:
+        """Lower the priority of the item that is in the queue"""
+        if item not in self._priorities:
+            raise KeyError(item)
+        return self.push(item, priority)
+
+    def pop(self) -> Tuple[int, Hashable]:
+        """Remove and return the item with the lowest priority as a tuple
+        (priority, item). Raise IndexError if the queue is empty."""
+        if not self._priorities:
+            raise IndexError("pop from an empty priority queue")
+        self._highest = None
+        buckets, n_buckets = self._buckets, self._n_buckets
+        priorities = self._priorities
+        lowest = self._lowest
+        while True:
+            bucket = buckets[lowest % n_buckets]
+            while bucket:
+                item = bucket.pop()
+                if priorities.get(item) == lowest:
+                    del priorities[item]
+                    self._lowest = lowest
+                    return lowest, item
+            lowest += 1
+
+    def __len__(self) -> int:
+        return len(self._priorities)
+
+    def __bool__(self) -> bool:
+        return bool(self._priorities)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._priorities
@@ -0,0 +1,236 @@
+"""
+Profiling solutions.
+
+Two profilers are available:
+* "cprofile" is the deterministic profiler from the standard library.
+  Its statistics are saved to a `.pstats` file that can be inspected with
+  `python -m pstats FILE` or snakeviz. Additionally, the call graph is
+  converted to collapsed stacks. Since cProfile does not record full stacks,
+  time of a function is split between its callers proportionally to
+  the time spent in calls from each caller.
+* "sample" is a sampling profiler: a thread that periodically looks at
+  the stack of the profiled thread. It slows down the solution much less
+  than cProfile but is less precise. Only collapsed stacks are saved.
+
+Collapsed stacks are lines `caller;callee;... value` that can be turned
+into a flame graph with flamegraph.pl, speedscope or inferno.
+
+After the run, a report with the top N hot functions is produced. Only
+functions from the modules that are interesting for optimizing solutions
+are listed: aoc.matrix, aoc.point, aoc.vector (Point inherits arithmetic
+from Vector) and the module of the solution.
+"""
+
+import cProfile
+import pstats
+import sys
+import threading
+from collections import Counter, defaultdict
+from types import FrameType, ModuleType
+from typing import Callable, Dict, List, Tuple
+
+from . import matrix, point, vector
+
+METHODS = ("cprofile", "sample")
+
+# library modules whose functions are listed in reports
+MODULES = (matrix, point, vector)
+
+TOP_N = 20
+
+# interval between two samples, in seconds. Python threads switch every
+# 5ms (sys.getswitchinterval()), sampling more often is not possible.
+SAMPLING_INTERVAL = 0.005
+
+# a function as identified by cProfile
+T_FUNC = Tuple[str, int, str]  # (filename, line number, function name)
+
+
+class Sampler:
+    """A sampling profiler of the thread that starts it.
+
+    Usage:
+    >>> with Sampler() as sampler:
+    >>>     solve(inp)
+    >>> sampler.stacks
+    """
+
+    def __init__(self, interval: float = SAMPLING_INTERVAL):
+        self.interval = interval
+        # how many times every stack was seen, the root of a stack first
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+        self._base = None
+
+    def __enter__(self):
+        self._target = threading.get_ident()
+        # frames at and above the caller are not interesting
+        self._base = sys._getframe(1)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None and frame is not self._base:
+                stack.append(frame)
+                frame = frame.f_back
+            # skip the profiled thread stopping the profiler
+            if stack and stack[-1].f_code is not Sampler.__exit__.__code__:
+                stack = tuple(_func_of(frame) for frame in reversed(stack))
+                self.stacks[stack] += 1
+
+
+def _func_of(frame: FrameType) -> T_FUNC:
+    code = frame.f_code
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def profile(method: str, func: Callable, *args) -> Tuple:
+    """Call `func(*args)` under the profiler `method`.
+
+    Returns
+      a tuple (result of the call, profiler)
+    """
+    if method == "cprofile":
+        profiler = cProfile.Profile()
+        res = profiler.runcall(func, *args)
+    elif method == "sample":
+        with Sampler() as profiler:
+            res = func(*args)
+    else:
+        raise ValueError(f"Unknown profiling method: {method}")
+    return res, profiler
+
+
+def collapse_pstats(stats: pstats.Stats) -> Dict[Tuple[T_FUNC, ...], float]:
+    """Convert statistics of cProfile to collapsed stacks, in microseconds.
+
+    Starting from the functions that were not called by other functions,
+    the call graph is traversed. A function reached from a caller gets
+    the share of its own time (tottime) in proportion to the time it spent
+    in calls from this caller. Recursive calls and branches that took less
+    than a microsecond are cut off.
+    """
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, ct) in callers.items():
+            callees[caller][func] = ct
+
+    stacks = Counter()
+
+    def walk(func: T_FUNC, share: float, stack: Tuple[T_FUNC, ...]):
+        _, _, tt, ct, _ = stats.stats[func]
+        stack = stack + (func,)
+        if tt * share:
+            stacks[stack] += tt * share * 1e6
+        for callee, edge_ct in callees[func].items():
+            if callee in stack or callee not in stats.stats:
+                continue
+            callee_ct = stats.stats[callee][3]
+            if share * edge_ct >= 1e-6:
+                walk(callee, share * edge_ct / callee_ct, stack)
+
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            walk(func, 1.0, ())
+
+    return stacks
+
+
+def write_collapsed(path: str, stacks: Dict[Tuple[T_FUNC, ...], float]):
+    with open(path, "w") as fd:
+        for stack, value in sorted(stacks.items()):
+            if round(value):
+                names = ";".join(func_name(func) for func in stack)
+                fd.write(f"{names} {round(value)}\n")
+
+
+def func_name(func: T_FUNC) -> str:
+    """Short name of a function for reports: module.function"""
+    filename, _, name = func
+    module = _module_name(filename)
+    return f"{module}.{name}" if module else name
+
+
+def _module_name(filename: str) -> str:
+    """aoc/day_17/solution.py -> aoc.day_17.solution"""
+    if filename == "~":  # built-in functions in cProfile
+        return ""
+    parts = filename.replace("\\", "/").rsplit(".", 1)[0].split("/")
+    if "aoc" in parts:
+        idx = len(parts) - 1 - parts[::-1].index("aoc")
+        return ".".join(parts[idx:])
+    return parts[-1]
+
+
+def hot_functions(
+    profiler, modules: List[ModuleType], top: int = TOP_N
+) -> List[Tuple[T_FUNC, float, float, int]]:
+    """Select the most expensive functions from given `modules`.
+
+    Returns
+      a list of tuples (function, self, total, number of calls) sorted
+      by self. For cProfile, self and total are times in seconds, for
+      Sampler they are numbers of samples and number of calls is unknown (0).
+    """
+    files = {mdl.__file__ for mdl in modules}
+    rows = []
+    if isinstance(profiler, Sampler):
+        own, total = Counter(), Counter()
+        for stack, count in profiler.stacks.items():
+            own[stack[-1]] += count
+            for func in set(stack):
+                total[func] += count
+        rows = [(func, own[func], cnt, 0) for func, cnt in total.items()]
+    else:
+        stats = pstats.Stats(profiler)
+        rows = [(func, tt, ct, nc)
+                for func, (_, nc, tt, ct, _) in stats.stats.items()]
+    rows = [row for row in rows if row[0][0] in files]
+    return sorted(rows, key=lambda row: -row[1])[:top]
+
+
+def save(profiler, prefix: str) -> List[str]:
+    """Save profile to files starting with `prefix` and return their paths"""
+    paths = []
+    if isinstance(profiler, Sampler):
+        stacks = profiler.stacks
+    else:
+        paths.append(f"{prefix}.pstats")
+        profiler.dump_stats(paths[-1])
+        stacks = collapse_pstats(pstats.Stats(profiler))
+    paths.append(f"{prefix}.collapsed")
+    write_collapsed(paths[-1], stacks)
+    return paths
+
+
+def report(
+    profiler, solution: ModuleType, paths: List[str], top: int = TOP_N
+) -> str:
+    """Produce a report on the hot functions in MODULES and the module of
+    the solution."""
+    sampled = isinstance(profiler, Sampler)
+    rows = hot_functions(profiler, [*MODULES, solution], top)
+    lines = [f"Profile saved to: {', '.join(paths)}"]
+    if sampled:
+        n_samples = sum(profiler.stacks.values())
+        lines.append(f"Samples: {n_samples} (every {profiler.interval}s)")
+        lines.append(f"{'self':>8} {'total':>8}  function")
+        for func, own, total, _ in rows:
+            lines.append(f"{own:8} {total:8}  {func_name(func)}:{func[1]}")
+    else:
+        lines.append(f"{'ncalls':>10} {'tottime':>9} {'cumtime':>9}  function")
+        for func, own, total, ncalls in rows:
+            lines.append(f"{ncalls:10} {own:9.3f} {total:9.3f}"
+                         f"  {func_name(func)}:{func[1]}")
+    return "\n".join(lines)
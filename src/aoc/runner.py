@@ -0,0 +1,573 @@
+"""
+Running solutions as a batch of independent tasks.
+
+A task is a single combination of (day, part, input). The input is either
+a case from the lists `tests` or `reals` defined in the solution module
+of the day, or a file given on the command line.
+
+Tasks can be run one after another in the current process or fanned out
+over a pool of worker processes. In both cases results are yielded in
+the same order the tasks were given, so that the output is deterministic.
+A task that fails does not stop the batch: the traceback is stored in
+the result of that task and the next task is run.
+
+With a time limit or a memory limit, every task is run in a child process
+of its own that is killed when it takes too long or fails to allocate
+memory. The task is reported as TIMEOUT or OOM and the batch goes on.
+
+Answers can be taken from the cache (see aoc.cache): tasks with a cached
+answer are not run at all, and answers to the other tasks are added to
+the cache.
+
+Inputs given as files can be loaded once in the main process and handed
+over to workers via shared memory (see aoc.shm) rather than loaded by every
+worker that solves a part of a day on that file. Workers use the shared
+arrays without copying them, unless the solution module declares that it
+modifies its input with `MODIFIES_INPUT = True`.
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import resource
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from copy import deepcopy
+from dataclasses import dataclass
+from importlib import import_module
+from time import perf_counter_ns
+from types import ModuleType
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+)
+
+from . import metrics, profiling, shm, utils
+from .cache import AnswerCache
+from .metrics import PhaseMetrics
+from .schedule import TimingHistory
+
+MODES = ("test", "real", "file")
+
+
+@dataclass
+class Task:
+    """A single run of a solution to one part of a day on one input.
+
+    `case` is the index of the input in the list `tests` (mode "test")
+    or `reals` (mode "real") of the solution module. In mode "file",
+    the input is loaded from the file `path`.
+    """
+    day: int
+    part: int
+    mode: str = "real"
+    case: int = 0
+    path: Optional[str] = None
+
+    def __str__(self):
+        return f"{self.day:02}.{self.part}"
+
+
+@dataclass
+class TaskResult:
+    task: Task
+    expected: Any = None
+    actual: Any = None
+    error: Optional[str] = None  # traceback if the task failed
+    metrics: Optional[Dict[str, PhaseMetrics]] = None
+    profile: Optional[str] = None  # report of the profiler
+    cached: bool = False  # the answer was taken from the cache
+    limit: Optional[str] = None  # TIMEOUT or OOM if the task hit a limit
+    time_ns: Optional[int] = None  # wall-clock time of running the task
+    output: str = ""  # printed by the solution, in modes "test" and "real"
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+    @property
+    def status(self) -> str:
+        """OK, ERROR, TIMEOUT or OOM, or WRONG if the task completed with
+        an answer different from the expected one"""
+        if self.limit:
+            return self.limit
+        if self.failed:
+            return "ERROR"
+        if self.expected is not None and self.actual != self.expected:
+            return "WRONG"
+        return "OK"
+
+
+def import_solution(day: int) -> ModuleType:
+    """Import and return the module `solution` of given `day`"""
+    return import_module(f"{__package__}.day_{int(day):02}.solution")
+
+
+def make_tasks(
+    day: int,
+    parts: Iterable[int],
+    mode: str,
+    solution: ModuleType,
+    files: List[str] = None
+) -> List[Task]:
+    """Make tasks for given `day` and `parts` in the order in which
+    they are reported: cases (or files) first, then parts.
+
+    In mode "test", cases without the expected answer are skipped, the same
+    way utils.run_tests() does it.
+    """
+    assert mode in MODES, f"Unknown mode: {mode}"
+    tasks = []
+    if mode == "file":
+        for path in files or []:
+            tasks.extend(Task(day, part, mode, path=path) for part in parts)
+    else:
+        cases = solution.tests if mode == "test" else solution.reals
+        for cid, case in enumerate(cases):
+            for part in parts:
+                if mode == "test" and case[part] is None:
+                    continue
+                tasks.append(Task(day, part, mode, cid))
+    return tasks
+
+
+def run_task(
+    task: Task,
+    measure: Optional[str] = None,
+    profile: Optional[str] = None,
+    shared_input: Any = None
+) -> TaskResult:
+    """Run given task and return its result. Exceptions are not propagated
+    but stored in the result.
+
+    In mode "file", the solution function `solve_part_N()` prints
+    the answer, therefore the answer is taken from what was printed.
+    In other modes, what the solution prints is kept in the result, to be
+    reported after the header of the task rather than before it.
+
+    If `measure` is given, metrics of the phases load, parse and solve
+    are recorded in the mode `measure` (see aoc.metrics).
+
+    If `profile` is given, solving is run under the profiler of that kind
+    (see aoc.profiling). The profile is saved to the files `profile.DD.P.*`
+    in the current directory.
+
+    In mode "file", `shared_input` is the input already loaded from the file
+    and put into shared memory by the parent process (see aoc.shm).
+    """
+    if measure:
+        # before importing the solution, so that loading inputs is measured
+        metrics.enable(measure)
+    start = perf_counter_ns()
+    result = TaskResult(task)
+
+    def call(solve: Callable, arg: Any) -> Any:
+        with recorder.phase("solve"):
+            if not profile:
+                return solve(arg)
+            res, profiler = profiling.profile(profile, solve, arg)
+        prefix = f"profile.{task}.{_input_label(task)}"
+        paths = profiling.save(profiler, prefix)
+        result.profile = profiling.report(profiler, solution, paths)
+        return res
+
+    try:
+        solution = import_solution(task.day)
+        recorder = metrics.recorder()
+        if task.mode == "file":
+            solve = getattr(solution, f"solve_part_{task.part}")
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                with recorder.activate(), _preloaded(solution, shared_input):
+                    call(solve, task.path)
+            lines = out.getvalue().strip().splitlines()
+            result.actual = lines[-1] if lines else None
+        else:
+            cases = solution.tests if task.mode == "test" else solution.reals
+            inp = cases[task.case][0]
+            result.expected = cases[task.case][task.part]
+            solve = getattr(solution, f"solve_p{task.part}")
+            recorder.inherit(inp)
+            out = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(out):
+                    result.actual = call(solve, deepcopy(inp))
+            finally:
+                result.output = out.getvalue()
+        if metrics.MODE:
+            result.metrics = recorder.phases
+    except MemoryError:
+        result.error = traceback.format_exc()
+        result.limit = "OOM"
+    except Exception:
+        result.error = traceback.format_exc()
+    result.time_ns = perf_counter_ns() - start
+    return result
+
+
+@contextlib.contextmanager
+def _preloaded(solution: ModuleType, shared_input: Any = None):
+    """Make `solution.load_input()` attach to the shared input instead of
+    loading the file. Arrays of the shared input are read-only: solutions
+    that modify them (MODIFIES_INPUT) get a copy."""
+    if shared_input is None:
+        yield
+        return
+
+    def attach(*args, **kwargs):
+        inp = shm.attach(shared_input)
+        if getattr(solution, "MODIFIES_INPUT", False):
+            return deepcopy(inp)
+        return inp
+
+    load_input = solution.load_input
+    solution.load_input = attach
+    try:
+        yield
+    finally:
+        solution.load_input = load_input
+
+
+def run_limited_task(
+    task: Task,
+    timeout: Optional[float] = None,
+    max_memory: Optional[int] = None,
+    **options
+) -> TaskResult:
+    """Run given task in a child process that is given `timeout` seconds
+    of wall-clock time and `max_memory` megabytes of address space.
+    If neither limit is set, the task is run in the current process.
+
+    `options` are passed to run_task()
+    """
+    if not (timeout or max_memory):
+        return run_task(task, **options)
+
+    ctx = multiprocessing.get_context("fork")
+    reader, writer = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run_in_child,
+                       args=(writer, task, max_memory), kwargs=options)
+    proc.start()
+    writer.close()
+    try:
+        # the result must be received before joining: a big result would
+        # not fit into the pipe, and the child would never exit
+        if reader.poll(timeout):
+            return reader.recv()
+        proc.kill()
+        return TaskResult(task, error=f"Timed out after {timeout}s\n",
+                          limit="TIMEOUT", time_ns=int(timeout * 1e9))
+    except EOFError:
+        # the child died without sending anything. With a memory limit,
+        # this is likely failure of allocating memory outside of python
+        proc.join()
+        return TaskResult(
+            task, error=f"Child process exited with code {proc.exitcode}\n",
+            limit="OOM" if max_memory else None)
+    finally:
+        proc.join()
+        reader.close()
+
+
+def _run_in_child(conn, task: Task, max_memory: Optional[int], **options):
+    if max_memory:
+        limit = max_memory * 2**20
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    result = run_task(task, **options)
+    try:
+        conn.send(result)
+    except Exception:
+        # for example, the answer could not be pickled
+        conn.send(TaskResult(task, error=traceback.format_exc()))
+    conn.close()
+
+
+def run_tasks(
+    tasks: List[Task],
+    jobs: int = 1,
+    cache: Optional[AnswerCache] = None,
+    history: Optional[TimingHistory] = None,
+    share_inputs: bool = False,
+    **options
+) -> Iterator[TaskResult]:
+    """Run given tasks and yield their results in the order of `tasks`.
+
+    If `jobs` is greater than 1, tasks are distributed over that many
+    worker processes.
+
+    If `cache` is given, tasks with a cached answer are not run, and
+    answers to other tasks are stored in the cache, which is saved once
+    all tasks are done.
+
+    If `history` is given, the durations of tasks are recorded in it, and
+    tasks distributed over worker processes start longest first.
+
+    If `share_inputs` is true, inputs of tasks in mode "file" distributed
+    over worker processes are loaded once in the current process, put into
+    shared memory and attached to by workers (see aoc.shm).
+
+    `options` are passed to run_limited_task()
+    """
+    if cache is not None:
+        yield from _run_with_cache(tasks, jobs, cache, history,
+                                   share_inputs=share_inputs, **options)
+        return
+
+    if jobs > 1 and len(tasks) > 1:
+        order = history.longest_first(tasks) if history else None
+        results = _run_in_pool(tasks, jobs, order, share_inputs, **options)
+    else:
+        results = (run_limited_task(task, **options) for task in tasks)
+
+    try:
+        for result in results:
+            if history is not None:
+                history.add(result)
+            yield result
+    finally:
+        if history is not None:
+            history.save()
+
+
+def _run_with_cache(
+    tasks: List[Task],
+    jobs: int,
+    cache: AnswerCache,
+    history: Optional[TimingHistory],
+    **options
+) -> Iterator[TaskResult]:
+    hits = {idx: entry for idx, entry in enumerate(map(cache.get, tasks))
+            if entry is not None}
+    fresh = run_tasks([task for idx, task in enumerate(tasks)
+                       if idx not in hits], jobs, history=history, **options)
+    try:
+        for idx, task in enumerate(tasks):
+            if idx in hits:
+                yield _cached_result(task, hits[idx]["answer"])
+            else:
+                result = next(fresh)
+                if not result.failed:
+                    cache.put(task, result.actual)
+                yield result
+        # let `fresh` finish and save the history
+        for _ in fresh:
+            pass
+    finally:
+        cache.save()
+
+
+def _cached_result(task: Task, answer: Any) -> TaskResult:
+    result = TaskResult(task, actual=answer, cached=True)
+    if task.mode != "file":
+        solution = import_solution(task.day)
+        cases = solution.tests if task.mode == "test" else solution.reals
+        result.expected = cases[task.case][task.part]
+    return result
+
+
+def _run_in_pool(
+    tasks: List[Task],
+    jobs: int,
+    order: Optional[List[int]] = None,
+    share_inputs: bool = False,
+    **options
+) -> Iterator[TaskResult]:
+    """Run tasks in a pool of worker processes.
+
+    Tasks are submitted in given `order` (indices of `tasks`), by default,
+    in the order of `tasks`. Results are yielded in the order of `tasks`
+    as soon as they are available.
+
+    If a worker dies abruptly (killed, segfault), the pool is broken and
+    all tasks that were still pending in it fail. Such tasks are retried
+    once in a fresh pool, which allows the innocent ones to complete.
+    """
+    results: Dict[int, TaskResult] = {}
+    retried = set()
+    pending = list(range(len(tasks))) if order is None else list(order)
+    next_idx = 0
+
+    with shm.SharedInputs() as shared:
+        inputs = _share_inputs(tasks, shared) if share_inputs else {}
+        while pending:
+            broken = set()
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = {
+                    pool.submit(run_limited_task, tasks[idx],
+                                shared_input=inputs.get(idx), **options): idx
+                    for idx in pending
+                }
+                for future in as_completed(futures):
+                    idx = futures[future]
+                    try:
+                        results[idx] = future.result()
+                    except BrokenProcessPool:
+                        if idx in retried:
+                            results[idx] = TaskResult(
+                                tasks[idx], error=traceback.format_exc())
+                        else:
+                            retried.add(idx)
+                            broken.add(idx)
+                    except Exception:
+                        # for example, the answer could not be pickled
+                        results[idx] = TaskResult(
+                            tasks[idx], error=traceback.format_exc())
+
+                    while next_idx in results:
+                        yield results.pop(next_idx)
+                        next_idx += 1
+            pending = [idx for idx in pending if idx in broken]
+
+    while next_idx in results:
+        yield results.pop(next_idx)
+        next_idx += 1
+
+
+def _share_inputs(tasks: List[Task], shared: shm.SharedInputs) -> Dict[int, Any]:
+    """Load the input of every task in mode "file" once, put it into shared
+    memory and return handles of inputs by the index of the task. If loading
+    fails, the task is left to load the input itself and report the error,
+    the same if the input cannot be pickled."""
+    loaded: Dict[Tuple[int, str], Any] = {}
+    inputs = {}
+    for idx, task in enumerate(tasks):
+        if task.mode != "file":
+            continue
+        key = (task.day, task.path)
+        if key not in loaded:
+            try:
+                solution = import_solution(task.day)
+                loaded[key] = shared.share(solution.load_input(task.path))
+                # an input that cannot be pickled would break the pool
+                pickle.dumps(loaded[key])
+            except Exception:
+                loaded[key] = None
+        if loaded[key] is not None:
+            inputs[idx] = loaded[key]
+    return inputs
+
+
+class Reporter:
+    """Prints results of tasks in the same format as utils.run_tests() and
+    utils.run_real() do. Failed tasks are reported as ERROR (or TIMEOUT,
+    OOM if they hit a limit) and their tracebacks are printed at the end
+    by `summary()`, as well as the table of metrics, if they were recorded.
+    """
+
+    def __init__(self, file=None, err=None):
+        self.file = file or sys.stdout
+        # for notes that must not mix with the answers
+        self.err = err or sys.stderr
+        self.failures: List[TaskResult] = []
+        self.measured: List[TaskResult] = []
+        self._day = None
+
+    def __call__(self, result: TaskResult):
+        task = result.task
+        if result.metrics is not None:
+            self.measured.append(result)
+        if result.failed:
+            self.failures.append(result)
+            text = result.status
+        else:
+            text = utils.test2str(
+                result.expected == result.actual,
+                result.expected, result.actual)
+
+        if task.mode == "test":
+            if self._day != task.day:
+                self._print(f"--- Tests day {task.day:02} ---")
+            self._print(result.output, end="")
+            self._print(f"T.{task.case}.p{task.part}:", text)
+        elif task.mode == "real":
+            self._print(f"--- Day {task.day:02} p.{task.part} ---")
+            self._print(result.output, end="")
+            self._print(text + (" (cached)" if result.cached else ""))
+        else:
+            self._print(result.status if result.failed else result.actual)
+            if result.cached:
+                # the answer alone goes to stdout, to be usable in scripts
+                print(f"Day {task} on {task.path}: answer from the cache",
+                      file=self.err, flush=True)
+        if result.profile:
+            self._print(result.profile)
+        self._day = task.day
+
+    def summary(self):
+        if self.measured:
+            self._print(f"--- Metrics ---")
+            self._print(metrics.format_table([
+                (str(result.task), _input_label(result.task), result.metrics)
+                for result in self.measured
+            ]))
+        if self.failures:
+            self._print(f"--- Failed tasks: {len(self.failures)} ---")
+            for result in self.failures:
+                task = result.task
+                where = task.path or f"{task.mode} case {task.case}"
+                self._print(f"Day {task} on {where}:")
+                self._print(result.error)
+
+    def _print(self, *args, **kwargs):
+        print(*args, file=self.file, flush=True, **kwargs)
+
+
+class JsonlReporter:
+    """Prints results of tasks as JSON Lines, one record per task as soon as
+    the result is available. A record is made by to_record() and tells
+    the input: the file or the mode and the case. For cases of tests and
+    reals, the expected answer is added, and the status is WRONG if the
+    answer differs from it.
+    """
+
+    def __init__(self, file=None, err=None):
+        self.file = file or sys.stdout
+        self.err = err or sys.stderr
+
+    def __call__(self, result: TaskResult):
+        task = result.task
+        if task.mode == "file":
+            record = {"file": task.path}
+        else:
+            record = {"mode": task.mode, "case": task.case,
+                      "expected": result.expected}
+        record.update(to_record(result))
+        print(json.dumps(record, default=str), file=self.file, flush=True)
+        if result.output:
+            print(result.output, end="", file=self.err, flush=True)
+        if result.profile:
+            # stdout is for records only
+            print(result.profile, file=self.err, flush=True)
+
+    def summary(self):
+        pass
+
+
+def to_record(result: TaskResult) -> Dict[str, Any]:
+    """Make a dictionary of the result of a task for JSON output:
+    day, part, status, answer (or error if the task failed) and timings
+    of phases (if metrics were recorded) and of the whole task, in ns."""
+    task = result.task
+    record = {"day": task.day, "part": task.part, "status": result.status}
+    if result.failed:
+        record["error"] = result.error
+    else:
+        record["answer"] = result.actual
+    if result.cached:
+        record["cached"] = True
+    timings = {f"{phase}_ns": phase_metrics.time_ns
+               for phase, phase_metrics in (result.metrics or {}).items()}
+    if result.time_ns is not None:
+        timings["total_ns"] = result.time_ns
+    record["timings"] = timings
+    return record
+
+
+def _input_label(task: Task) -> str:
+    """Short name of the input of the task"""
+    if task.mode == "file":
+        return os.path.basename(task.path)
+    return f"{task.mode[0].upper()}.{task.case}"
@@ -0,0 +1,125 @@
+"""
+Scheduling tasks by their expected duration.
+
+The history of how long tasks took is kept in the file timings.json in
+the cache directory (see aoc.cache). A task is identified by day, part and
+the input: the SHA of the input file (or of input.txt of the day, for real
+inputs) or the index of the case, for tests. The expected duration of
+a task is the mean of its last HISTORY_SIZE runs. Saving merges the runs
+of this process into the file under a lock, so that concurrent runs keep
+each other's timings.
+
+When tasks run in a pool of workers, the longest ones are started first
+(LPT, longest processing time first). Otherwise a long task, for example,
+part 2 of day 17 or day 23, could start last and keep the whole batch
+waiting. Since each part of a day is a task of its own, a long part 2
+starts immediately, not after part 1.
+"""
+
+import heapq
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .cache import AnswerCache, cache_dir, locked
+
+HISTORY_SIZE = 5
+
+
+def default_path() -> str:
+    return os.path.join(cache_dir(), "timings.json")
+
+
+class TimingHistory:
+    """
+    Usage:
+    >>> history = TimingHistory()
+    >>> history.estimate(task)  # in ns, None if the task never ran
+    >>> history.add(result)
+    >>> history.save()
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or default_path()
+        self.timings: Dict[str, List[int]] = self._load()
+        # durations added since loading (or the last save)
+        self._added: Dict[str, List[int]] = {}
+
+    def _load(self) -> Dict[str, List[int]]:
+        try:
+            with open(self.path) as fd:
+                return json.load(fd)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Add the durations recorded since loading (or the last save) to
+        the history on disk, which is read again under the lock"""
+        if not self._added:
+            return
+        with locked(self.path):
+            timings = self._load()
+            for key, added in self._added.items():
+                timings[key] = (timings.get(key, []) + added)[-HISTORY_SIZE:]
+            tmp = f"{self.path}.{os.getpid()}"
+            with open(tmp, "w") as fd:
+                json.dump(timings, fd, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        self.timings = timings
+        self._added.clear()
+
+    @staticmethod
+    def key(task) -> Optional[str]:
+        """Identify the task (aoc.runner.Task) by day, part and input"""
+        try:
+            inp = AnswerCache.input_of(task)
+        except OSError:
+            return None
+        return f"{task}:{inp or f'{task.mode}.{task.case}'}"
+
+    def add(self, result):
+        """Record the duration of the task from the result
+        (aoc.runner.TaskResult)"""
+        key = self.key(result.task)
+        if key and result.time_ns is not None and not result.cached:
+            timings = self.timings.setdefault(key, [])
+            timings.append(result.time_ns)
+            del timings[:-HISTORY_SIZE]
+            added = self._added.setdefault(key, [])
+            added.append(result.time_ns)
+            del added[:-HISTORY_SIZE]
+
+    def estimate(self, task) -> Optional[int]:
+        """Expected duration of the task in ns"""
+        timings = self.timings.get(self.key(task))
+        return sum(timings) // len(timings) if timings else None
+
+    def longest_first(self, tasks: Sequence) -> List[int]:
+        """Indices of `tasks` ordered by their expected duration, the longest
+        first. Tasks that never ran are considered long: unknown tasks may
+        well be the slowest ones."""
+        estimates = [self.estimate(task) for task in tasks]
+        return sorted(range(len(tasks)),
+                      key=lambda idx: (estimates[idx] is not None,
+                                       -(estimates[idx] or 0)))
+
+    def predict(self, tasks: Sequence, jobs: int) -> Tuple[int, int]:
+        """Predict wall-clock time (ns) of running `tasks` on `jobs` workers,
+        longest first.
+
+        Returns
+          a tuple (predicted time, number of tasks without history)
+        """
+        estimates = [self.estimate(task) for task in tasks]
+        known = sorted((est for est in estimates if est is not None),
+                       reverse=True)
+        return makespan(known, jobs), len(estimates) - len(known)
+
+
+def makespan(durations: Sequence[int], jobs: int) -> int:
+    """Time it takes `jobs` workers to run tasks of given `durations`
+    if each task is given to the worker that becomes free first."""
+    workers = [0] * max(1, jobs)
+    for duration in durations:
+        heapq.heappush(workers, heapq.heappop(workers) + duration)
+    return max(workers)
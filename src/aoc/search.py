@@ -0,0 +1,316 @@
+"""
+Searches in state spaces: breadth-first search, Dijkstra, A* and
+bidirectional Dijkstra.
+
+A task describes its state space with
+* states: any hashable objects, often ints that a state is packed into,
+  for example (block * 4 + heading) * runs + run in day 17;
+* a neighbor function `neighbors(state)` that returns (or yields) the states
+  reachable from `state` in one step: for bfs(), just the states, for the
+  other searches, pairs (state, weight) with non-negative weights;
+* optionally, a goal test `is_goal(state)`. Without it, the search visits
+  all reachable states.
+
+A search returns a Search that holds the distances from the starting states
+and, if requested with `paths=True`, the parents of states, from which
+a path to any reached state is reconstructed.
+
+Distances and parents are dictionaries. If states are ints 0..n-1, passing
+`state_count=n` to dijkstra() or astar() makes them flat lists instead,
+preallocated once, which takes a fraction of the memory of dictionaries
+with millions of states.
+
+Telemetry: Search.expanded is the number of states that were expanded
+(popped from the queue and whose neighbors were generated). If `name` is
+given and instrumentation is enabled, it is also added to the counter
+"<name>.expanded" (see aoc.instrument). With `max_expansions`, a search
+raises SearchLimitExceeded instead of expanding more states than that.
+
+Usage:
+>>> found = dijkstra([start], neighbors, is_goal=lambda s: s == goal)
+>>> found.cost, found.path()
+>>> found = astar([start], neighbors, is_goal, heuristic=manhattan(goal))
+>>> visited = bfs([start], neighbors).distances
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (Callable, Dict, Hashable, Iterable, List, Optional,
+                    Tuple, Union)
+
+from . import instrument, pq
+from .utils import AOCException
+
+State = Hashable
+Neighbors = Callable[[State], Iterable[State]]
+WeightedNeighbors = Callable[[State], Iterable[Tuple[State, int]]]
+Heuristic = Callable[[State], int]
+
+INF = float("inf")
+
+
+class Distances(dict):
+    """Distances of states, where unreached states are at INF"""
+
+    def __missing__(self, state: State) -> float:
+        return INF
+
+
+@dataclass
+class Search:
+    """Result of a search"""
+    # the best known distance of each reached state from the start. After
+    # dijkstra() and astar(), unreached states are at INF, and it is a list
+    # indexed by state if the search was given `state_count`
+    distances: Union[Dict[State, int], List[int]] = field(
+        default_factory=dict)
+    # state -> the state it was reached from, if paths were requested.
+    # A list with None for states without a parent, as distances
+    parents: Optional[Union[Dict[State, State], List[State]]] = None
+    # the goal state that was found
+    goal: Optional[State] = None
+    expanded: int = 0
+
+    @property
+    def cost(self) -> Optional[int]:
+        """The distance of the goal, None if no goal was found"""
+        if self.goal is None:
+            return None
+        return self.distances[self.goal]
+
+    def path(self, state: State = None) -> List[State]:
+        """The states on the path from a start to `state` (by default,
+        to the goal) including both"""
+        assert self.parents is not None, "Search was run without paths=True"
+        if state is None:
+            state = self.goal
+        parents = self.parents
+        path = [state]
+        if isinstance(parents, list):
+            while parents[path[-1]] is not None:
+                path.append(parents[path[-1]])
+        else:
+            while path[-1] in parents:
+                path.append(parents[path[-1]])
+        return path[::-1]
+
+
+class SearchLimitExceeded(AOCException):
+    """A search expanded more states than allowed. The search so far
+    is in the attribute `search`."""
+
+    def __init__(self, search: Search):
+        super().__init__(f"Expanded more than {search.expanded} states")
+        self.search = search
+
+
+def _finish(result: Search, name: Optional[str]) -> Search:
+    if name and instrument.ENABLED:
+        instrument.count(f"{name}.expanded", result.expanded)
+    return result
+
+
+def bfs(
+    starts: Iterable[State],
+    neighbors: Neighbors,
+    is_goal: Callable[[State], bool] = None,
+    max_depth: int = None,
+    max_expansions: int = None,
+    paths: bool = False,
+    name: str = None
+) -> Search:
+    """Breadth-first search from `starts`, where every step costs 1.
+    States farther than `max_depth` steps are not visited."""
+    result = Search(parents={} if paths else None)
+    distances, parents = result.distances, result.parents
+    queue = deque()
+    for state in starts:
+        if state not in distances:
+            distances[state] = 0
+            queue.append(state)
+
+    while queue:
+        state = queue.popleft()
+        if is_goal and is_goal(state):
+            result.goal = state
+            break
+        dist = distances[state]
+        if dist == max_depth:
+            continue
+        if result.expanded == max_expansions:
+            raise SearchLimitExceeded(_finish(result, name))
+        result.expanded += 1
+        for nstate in neighbors(state):
+            if nstate not in distances:
+                distances[nstate] = dist + 1
+                if parents is not None:
+                    parents[nstate] = state
+                queue.append(nstate)
+
+    return _finish(result, name)
+
+
+def dijkstra(
+    starts: Iterable[State],
+    neighbors: WeightedNeighbors,
+    is_goal: Callable[[State], bool] = None,
+    queue: Union[pq.HeapQueue, pq.BucketQueue] = None,
+    max_expansions: int = None,
+    paths: bool = False,
+    name: str = None,
+    state_count: int = None
+) -> Search:
+    """Dijkstra's search from `starts` for the nearest goal state.
+
+    States are prioritized by the empty `queue`, by default, a binary heap.
+    If weights are small integers, pq.BucketQueue(max_weight) is faster.
+    """
+    return astar(starts, neighbors, is_goal, None, queue, max_expansions,
+                 paths, name, state_count)
+
+
+def astar(
+    starts: Iterable[State],
+    neighbors: WeightedNeighbors,
+    is_goal: Callable[[State], bool],
+    heuristic: Optional[Heuristic],
+    queue: Union[pq.HeapQueue, pq.BucketQueue] = None,
+    max_expansions: int = None,
+    paths: bool = False,
+    name: str = None,
+    state_count: int = None
+) -> Search:
+    """A* search from `starts` for the nearest goal state.
+
+    `heuristic(state)` estimates the distance from `state` to the goal.
+    It must be consistent (never decrease by more than the weight of a step)
+    for the found path to be the shortest one; Manhattan distance is such
+    a heuristic on a grid where every step costs at least 1. With a bucket
+    queue, priorities grow by up to the max weight plus the max change of
+    the heuristic in a step, which is what its `max_weight` must be.
+
+    With `state_count`, states must be ints in range(state_count), and
+    distances and parents are kept in lists of that size.
+    """
+    if queue is None:
+        queue = pq.HeapQueue()
+    if state_count is None:
+        result = Search(Distances(), {} if paths else None)
+    else:
+        result = Search([INF] * state_count,
+                        [None] * state_count if paths else None)
+    distances, parents = result.distances, result.parents
+    for state in starts:
+        distances[state] = 0
+        queue.push(state, heuristic(state) if heuristic else 0)
+
+    while queue:
+        _, state = queue.pop()
+        if is_goal and is_goal(state):
+            result.goal = state
+            break
+        if result.expanded == max_expansions:
+            raise SearchLimitExceeded(_finish(result, name))
+        result.expanded += 1
+        dist = distances[state]
+        for nstate, weight in neighbors(state):
+            ndist = dist + weight
+            if ndist < distances[nstate]:
+                distances[nstate] = ndist
+                if parents is not None:
+                    parents[nstate] = state
+                if heuristic:
+                    queue.push(nstate, ndist + heuristic(nstate))
+                else:
+                    queue.push(nstate, ndist)
+
+    return _finish(result, name)
+
+
+def bidirectional_dijkstra(
+    start: State,
+    goal: State,
+    neighbors: WeightedNeighbors,
+    reverse_neighbors: WeightedNeighbors = None,
+    max_expansions: int = None,
+    paths: bool = False,
+    name: str = None
+) -> Search:
+    """Dijkstra's search from `start` and, at the same time, backwards from
+    `goal`, until the two searches meet. `reverse_neighbors(state)` yields
+    the states from which `state` is reachable; by default, the graph is
+    undirected and it is `neighbors`.
+
+    The result has distances from the start (of states the forward search
+    reached) and, if `paths` is true, parents along the whole path.
+    """
+    if reverse_neighbors is None:
+        reverse_neighbors = neighbors
+    result = Search(parents={} if paths else None)
+    sides = [
+        # distances, parents, queue, neighbors, last popped priority
+        [result.distances, result.parents, pq.HeapQueue(), neighbors, 0],
+        [{}, {} if paths else None, pq.HeapQueue(), reverse_neighbors, 0],
+    ]
+    for side, state in zip(sides, (start, goal)):
+        side[0][state] = 0
+        side[2].push(state, 0)
+
+    # the best path found so far goes through `meeting`
+    best, meeting = INF, None
+    while sides[0][2] and sides[1][2]:
+        # no path through unexpanded states can be shorter than this
+        if sides[0][4] + sides[1][4] >= best:
+            break
+        # expand the smaller frontier
+        side, other = sides if len(sides[0][2]) <= len(sides[1][2]) \
+            else sides[::-1]
+        distances, parents, queue, nbors, _ = side
+        dist, state = queue.pop()
+        side[4] = dist
+        if result.expanded == max_expansions:
+            raise SearchLimitExceeded(_finish(result, name))
+        result.expanded += 1
+        for nstate, weight in nbors(state):
+            ndist = dist + weight
+            if ndist < distances.get(nstate, INF):
+                distances[nstate] = ndist
+                if parents is not None:
+                    parents[nstate] = state
+                queue.push(nstate, ndist)
+            if nstate in other[0] and ndist + other[0][nstate] < best:
+                best = ndist + other[0][nstate]
+                meeting = nstate
+        if state in other[0] and dist + other[0][state] < best:
+            best, meeting = dist + other[0][state], state
+
+    if meeting is None:
+        return _finish(result, name)
+
+    if paths:
+        # follow the backward parents from the meeting point to the goal
+        state, backward = meeting, sides[1][1]
+        while state in backward:
+            result.parents[backward[state]] = state
+            state = backward[state]
+    # the backward distance of the meeting point is not a forward one
+    result.distances[goal] = best
+    result.goal = goal
+    return _finish(result, name)
+
+
+def manhattan(
+    goal: Tuple[int, int],
+    position: Callable[[State], Tuple[int, int]] = None,
+    weight: int = 1
+) -> Heuristic:
+    """Heuristic that is the Manhattan distance from the position of
+    a state to the `goal`, times the minimal `weight` of a step.
+    By default, a state is its position."""
+    gx, gy = goal
+
+    def heuristic(state: State) -> int:
+        x, y = position(state) if position else state
+        return weight * (abs(x - gx) + abs(y - gy))
+
+    return heuristic
@@ -0,0 +1,195 @@
+"""
+Solver daemon that answers requests over a Unix socket.
+
+Starting `aoc2023` takes time: the interpreter, click, numpy, networkx and
+the solution modules must be imported. The daemon pays for it once: its
+worker processes import all solutions at start and keep them imported.
+
+The protocol is JSON Lines: a client sends one request per line and gets
+one response per line, in the same order. A request is
+
+    {"day": 12, "part": 1, "input_path": "/path/to/input.txt"}
+
+or, with the input inline,
+
+    {"day": 12, "part": 1, "input_text": "???.### 1,1,3\\n..."}
+
+and an optional "id" that is copied to the response. A relative input_path
+is relative to the working directory of the daemon. The response is
+
+    {"id": ..., "day": 12, "part": 1, "status": "OK", "answer": "21",
+     "timings": {"load_ns": ..., "parse_ns": ..., "solve_ns": ...,
+                 "total_ns": ...}}
+
+The answer is the last line printed by the solution, as a string.
+On failure, status is "ERROR" and the response has "error" instead of
+"answer". Requests from different connections are solved concurrently by
+a pool of worker processes, requests from one connection one by one.
+If a worker dies (killed for lack of memory, a crash), the requests it was
+solving fail, and the daemon replaces the broken pool with a fresh one.
+
+Usage:
+>>> with SolverServer("/tmp/aoc.sock", jobs=4) as server:
+>>>     server.serve_forever()
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from time import perf_counter_ns
+from typing import Any, Dict, List
+
+from . import metrics
+from .runner import Task, import_solution, run_task, to_record
+
+
+def _init_worker():
+    metrics.enable("rss")  # for timings of phases
+    warm_up()
+
+
+def warm_up():
+    """Import solutions of all days"""
+    thisdir = os.path.dirname(__file__)
+    for name in sorted(os.listdir(thisdir)):
+        if os.path.isfile(os.path.join(thisdir, name, "solution.py")):
+            try:
+                import_solution(int(name[4:]))
+            except Exception:
+                pass
+
+
+def solve(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Solve the request in a worker process and make the response"""
+    start = perf_counter_ns()
+    day, part = int(request["day"]), int(request["part"])
+    if "input_text" in request:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as fd:
+            fd.write(request["input_text"])
+            fd.flush()
+            result = run_task(Task(day, part, "file", path=fd.name))
+    else:
+        path = os.path.abspath(request["input_path"])
+        result = run_task(Task(day, part, "file", path=path))
+
+    response = to_record(result)
+    # including writing the input to a file
+    response["timings"]["total_ns"] = perf_counter_ns() - start
+    return response
+
+
+def validate(request: Any) -> List[str]:
+    """Return the list of problems with the request"""
+    if not isinstance(request, dict):
+        return ["request must be a JSON object"]
+    errors = [f"'{key}' must be an integer" for key in ("day", "part")
+              if not isinstance(request.get(key), int)]
+    if request.get("part") not in (1, 2):
+        errors.append("'part' must be 1 or 2")
+    if ("input_path" in request) == ("input_text" in request):
+        errors.append("exactly one of 'input_path' and 'input_text'"
+                      " must be given")
+    return errors
+
+
+class SolverServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, jobs: int = 1):
+        if os.path.exists(path):
+            _remove_stale_socket(path)
+        self.jobs = jobs
+        self._pool_lock = threading.Lock()
+        self.pool = self._start_pool()
+        super().__init__(path, _RequestHandler)
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(max_workers=self.jobs,
+                                   initializer=_init_worker)
+        # start all workers now rather than on the first requests
+        for future in [pool.submit(os.getpid) for _ in range(self.jobs)]:
+            future.result()
+        return pool
+
+    def _replace_pool(
+        self, broken: ProcessPoolExecutor
+    ) -> ProcessPoolExecutor:
+        """Replace the `broken` pool with a fresh one, unless another thread
+        has already done it, and return the current pool"""
+        with self._pool_lock:
+            if self.pool is broken:
+                _shutdown(broken)
+                self.pool = self._start_pool()
+            return self.pool
+
+    def _solve(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        pool = self.pool
+        try:
+            future = pool.submit(solve, request)
+        except BrokenProcessPool:
+            # broken by another request, this one has not run yet
+            pool = self._replace_pool(pool)
+            future = pool.submit(solve, request)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._replace_pool(pool)
+            raise
+
+    def process(self, line: bytes) -> Dict[str, Any]:
+        try:
+            request = json.loads(line)
+        except ValueError as err:
+            return {"status": "ERROR", "error": f"Invalid JSON: {err}"}
+        errors = validate(request)
+        if errors:
+            response = {"status": "ERROR", "error": "; ".join(errors)}
+        else:
+            try:
+                response = self._solve(request)
+            except Exception as err:
+                response = {"status": "ERROR", "error": repr(err)}
+        if isinstance(request, dict) and "id" in request:
+            response = {"id": request["id"], **response}
+        return response
+
+    def server_close(self):
+        super().server_close()
+        _shutdown(self.pool)
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            if line.strip():
+                response = self.server.process(line)
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+                self.wfile.flush()
+
+
+def _shutdown(pool: ProcessPoolExecutor):
+    if sys.version_info >= (3, 9):
+        pool.shutdown(cancel_futures=True)
+    else:
+        pool.shutdown()
+
+
+def _remove_stale_socket(path: str):
+    """Remove the socket file left by a daemon that is no longer running.
+    Refuse to start if the daemon is still running."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+    raise OSError(f"Socket {path} is in use by a running daemon")
@@ -0,0 +1,140 @@
+"""
+Handing parsed inputs over to worker processes via shared memory.
+
+A worker process that gets a parsed input from the parent process receives
+a pickled copy of it. For big numpy arrays, such as the 3D grid of day 22,
+or big Matrix grids, the parent process can instead put the array into
+shared memory (multiprocessing.shared_memory) once, and send to workers
+a small handle that they attach to without copying.
+
+An input can be a numpy array, a Matrix (or a subclass of it), a Grid2D
+or a tuple, list or dict that contains them at any depth. Other objects
+are left as is and are pickled as usual. A Matrix is shared if its values
+make an array of numbers or of strings. It is handed over as that array,
+but attached as a Matrix of a list of lists again, the private copy of
+the worker that solutions use as any other Matrix.
+
+Attached arrays are not copied and are read-only, because the same memory
+is seen by all workers: a solution that modifies an array of its input
+must work on a copy (see MODIFIES_INPUT in aoc.runner).
+
+Usage (the parent process):
+>>> with SharedInputs() as shared:
+>>>     handle = shared.share((grid, bricks))
+>>>     pool.submit(work, handle)  # while in the context
+and in a worker:
+>>> grid, bricks = attach(handle)
+"""
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .grid import Grid2D
+from .matrix import Matrix
+
+# smaller arrays are cheaper to pickle than to share
+MIN_SIZE = 2**16
+
+# segments attached by this process, by name. The segments must be kept open
+# for as long as arrays that use their memory exist.
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Handle of a numpy array in shared memory"""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    def attach(self) -> np.ndarray:
+        """Return the (read-only) array that uses the shared memory"""
+        if self.name not in _attached:
+            _attached[self.name] = shared_memory.SharedMemory(self.name)
+        arr = np.ndarray(self.shape, dtype=self.dtype,
+                         buffer=_attached[self.name].buf)
+        arr.flags.writeable = False
+        return arr
+
+
+@dataclass(frozen=True)
+class SharedMatrix:
+    """Handle of a Matrix whose values are in shared memory. Attaching
+    rebuilds the list of lists of values."""
+    cls: type
+    state: Dict[str, Any]
+    values: SharedArray
+
+
+class SharedInputs:
+    """Owner of shared memory segments created by share(). The segments
+    are removed on close()."""
+
+    def __init__(self, min_size: int = MIN_SIZE):
+        self.min_size = min_size
+        self.segments: List[shared_memory.SharedMemory] = []
+
+    def share(self, obj: Any) -> Any:
+        """Put numpy arrays and matrices found in `obj` into shared memory.
+        Return a copy of `obj` where they are replaced with handles."""
+        if isinstance(obj, np.ndarray):
+            if obj.nbytes >= self.min_size and not obj.dtype.hasobject:
+                return self._share_array(obj)
+        elif isinstance(obj, Matrix):
+            values = np.asarray(obj.values)
+            if (values.nbytes >= self.min_size
+                    and values.dtype.kind in "biufU"):
+                state = {k: v for k, v in vars(obj).items() if k != "values"}
+                return SharedMatrix(type(obj), state, self._share_array(values))
+        elif isinstance(obj, Grid2D):
+            # Grid2D.__copy__ returns the grid itself
+            grid = type(obj).__new__(type(obj))
+            vars(grid).update(vars(obj), matrix=self.share(obj.matrix))
+            return grid
+        elif type(obj) in (tuple, list):
+            return type(obj)(self.share(item) for item in obj)
+        elif isinstance(obj, dict):
+            return {key: self.share(value) for key, value in obj.items()}
+        return obj
+
+    def _share_array(self, arr: np.ndarray) -> SharedArray:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+        self.segments.append(shm)
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        return SharedArray(shm.name, arr.shape, arr.dtype.str)
+
+    def close(self):
+        while self.segments:
+            shm = self.segments.pop()
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self) -> 'SharedInputs':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def attach(obj: Any) -> Any:
+    """Reverse SharedInputs.share(): replace handles found in `obj` with
+    arrays that use shared memory and matrices rebuilt from it"""
+    if isinstance(obj, SharedArray):
+        return obj.attach()
+    if isinstance(obj, SharedMatrix):
+        matrix = obj.cls.__new__(obj.cls)
+        vars(matrix).update(obj.state)
+        matrix.values = obj.values.attach().tolist()
+        return matrix
+    if isinstance(obj, Grid2D) and isinstance(obj.matrix, SharedMatrix):
+        grid = type(obj).__new__(type(obj))
+        vars(grid).update(vars(obj), matrix=attach(obj.matrix))
+        return grid
+    if type(obj) in (tuple, list):
+        return type(obj)(attach(item) for item in obj)
+    if isinstance(obj, dict):
+        return {key: attach(value) for key, value in obj.items()}
+    return obj
@@ -3,9 +3,13 @@ import os
 import itertools
 import functools
 import inspect
+import dataclasses
 from pprint import pprint
+from collections import namedtuple, OrderedDict
 from copy import deepcopy
-from typing import List, Union, Tuple, Optional, Callable, Any
+from typing import List, Union, Tuple, Optional, Callable, Any, Hashable
+
+from . import metrics
 
 DEBUG = int(os.environ.get('DEBUG', 0))
 
@@ -27,18 +31,23 @@ def load_input(fname: Optional[str] = None, **kwargs) -> List[Any]:
         fname = os.path.join(srcdir, fname)
         dprint(f"Data file: {fname}")
 
+    recorder = metrics.recorder()
+
     lines = []
-    with open(fname) as fd:
+    with recorder.phase("load"), open(fname) as fd:
         for line in fd:
             lines.append(line.rstrip('\r\n'))
 
-    parse_line = kwargs.get("line_parser")
-    if parse_line:
-        lines = list(map(parse_line, lines))
+    with recorder.phase("parse"):
+        parse_line = kwargs.get("line_parser")
+        if parse_line:
+            lines = list(map(parse_line, lines))
+
+        parse = kwargs.get("parser")
+        if parse:
+            lines = parse(lines)
 
-    parse = kwargs.get("parser")
-    if parse:
-        lines = parse(lines)
+    recorder.attach(lines)
 
     return lines
 
@@ -84,42 +93,6 @@ def flatten(items: List[List]) -> List:
     """Flatten one level"""
     return [item for subitems in items for item in subitems]
 
-# Source
-# https://stackoverflow.com/questions/55774054/precise-time-in-nano-seconds-for-python-3-6-and-earlier
-
-import ctypes
-
-CLOCK_REALTIME = 0
-
-class timespec(ctypes.Structure):
-    _fields_ = [
-        ('tv_sec', ctypes.c_int64), # seconds, https://stackoverflow.com/q/471248/1672565
-        ('tv_nsec', ctypes.c_int64), # nanoseconds
-    ]
-
-clock_gettime = ctypes.cdll.LoadLibrary('libc.so.6').clock_gettime
-clock_gettime.argtypes = [ctypes.c_int64, ctypes.POINTER(timespec)]
-clock_gettime.restype = ctypes.c_int64
-
-
-def time_ns():
-    tmp = timespec()
-    ret = clock_gettime(CLOCK_REALTIME, ctypes.pointer(tmp))
-    if bool(ret):
-        raise OSError()
-    return tmp.tv_sec * 10 ** 9 + tmp.tv_nsec
-
-
-def mytimeit(func, n=1):
-    """A decorator to measure runtime of a function in nanoseconds"""
-    def wrapper(*args, **kwargs):
-        start = time_ns()
-        res = func(*args, **kwargs)
-        end = time_ns()
-        print("Runtime[{}]: {} nsec".format(func.__name__, end-start))
-        return res
-    return wrapper
-
 
 def mdrange_my(*ranges):
     """
@@ -160,6 +133,127 @@ def listfold(lst: List[Any], width: int) -> List[List[Any]]:
     return reshaped
 
 
+def with_slots(cls: type) -> type:
+    """Class decorator that makes a dataclass use __slots__ instead of
+    __dict__ for its fields, like dataclass(slots=True) of python 3.10+.
+    Instances become smaller and access to fields is faster, but attributes
+    other than the fields cannot be added.
+
+    Apply it after (above) @dataclass. Subclasses must declare
+    `__slots__ = ()` or they get __dict__ back. Methods of the class must
+    not use super() without arguments.
+
+    Usage:
+    >>> @with_slots
+    >>> @dataclass
+    >>> class Brick: ...
+    """
+    names = tuple(f.name for f in dataclasses.fields(cls))
+    attrs = dict(vars(cls))
+    for name in names + ("__dict__", "__weakref__"):
+        # defaults of the fields are kept by the generated __init__
+        attrs.pop(name, None)
+    attrs["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, attrs)
+
+
+MemoInfo = namedtuple("MemoInfo", ["hits", "misses", "size", "maxsize"])
+
+MEMO_SCOPES = ("process", "call")
+
+
+def memo(
+    func: Callable = None,
+    *,
+    key: Callable[..., Hashable] = None,
+    maxsize: Optional[int] = None,
+    scope: str = MEMO_SCOPES[0]
+) -> Callable:
+    """Decorator that memoizes results of the function.
+
+    The cache key is made of all arguments by default, lists, sets and dicts
+    becoming tuples and frozensets, or by the function `key` that is called
+    with the same arguments as the decorated function.
+
+    With `maxsize`, the cache holds that many results at most, the least
+    recently used ones are evicted.
+
+    With scope "process", the results are kept as long as the process runs
+    (or until cache_clear() is called). With scope "call", the cache is
+    cleared when the outermost call of the function returns, that is, it
+    serves recursive calls only.
+
+    The decorated function has methods cache_info() that returns the number
+    of hits and misses so far and the current size of the cache, and
+    cache_clear().
+
+    Usage:
+    >>> @memo(key=lambda springs, sums, count, level=0: (springs, sums, count),
+    >>>       scope="call")
+    >>> def count_arrangements(springs, sums, count, level=0): ...
+    """
+    assert scope in MEMO_SCOPES, f"Unknown scope: {scope}"
+
+    def decorate(func: Callable) -> Callable:
+        cache = OrderedDict()
+        make_key = key or _memo_key
+        counts = [0, 0]  # hits, misses
+        depth = 0
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal depth
+            k = make_key(*args, **kwargs)
+            if k in cache:
+                counts[0] += 1
+                if maxsize:
+                    cache.move_to_end(k)
+                return cache[k]
+            counts[1] += 1
+            depth += 1
+            try:
+                value = func(*args, **kwargs)
+            finally:
+                depth -= 1
+                if depth == 0 and scope == "call":
+                    cache.clear()
+            if depth or scope != "call":
+                cache[k] = value
+                if maxsize and len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return value
+
+        def cache_info() -> MemoInfo:
+            return MemoInfo(counts[0], counts[1], len(cache), maxsize)
+
+        def cache_clear():
+            cache.clear()
+            counts[:] = [0, 0]
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorate(func) if func else decorate
+
+
+def _memo_key(*args, **kwargs) -> Hashable:
+    key = tuple(map(_hashable, args))
+    if kwargs:
+        key += tuple(sorted((name, _hashable(v)) for name, v in kwargs.items()))
+    return key
+
+
+def _hashable(obj: Any) -> Hashable:
+    if isinstance(obj, (list, tuple)):
+        return tuple(map(_hashable, obj))
+    if isinstance(obj, (set, frozenset)):
+        return frozenset(obj)
+    if isinstance(obj, dict):
+        return frozenset((k, _hashable(v)) for k, v in obj.items())
+    return obj
+
+
 def test2str(success, expected, actual):
     lines = []
     if "\n" in str(expected) or "\n" in str(actual):
@@ -180,16 +274,22 @@ def run_tests(
     solve_p2: Callable = None
 ):
     print(f"--- Tests day {day} ---")
+    measured = []
 
     for tid, (inp, exp1, exp2) in enumerate(tests):
         if solve_p1 and exp1 is not None:
-            res1 = solve_p1(deepcopy(inp))
+            res1 = _solve(
+                solve_p1, inp, (f"{day}.1", f"T.{tid}"), measured, True)
             print(f"T.{tid}.p1:", test2str(res1 == exp1, exp1, res1))
 
         if solve_p2 and exp2 is not None:
-            res2 = solve_p2(inp)
+            res2 = _solve(
+                solve_p2, inp, (f"{day}.2", f"T.{tid}"), measured)
             print(f"T.{tid}.p2:", test2str(res2 == exp2, exp2, res2))
 
+    if measured:
+        print(metrics.format_table(measured))
+
 
 def run_real(
     day: str,
@@ -197,17 +297,46 @@ def run_real(
     solve_p1: Callable = None,
     solve_p2: Callable = None
 ):
+    measured = []
+
     for tid, (inp, exp1, exp2) in enumerate(tests):
         if solve_p1:
             print(f"--- Day {day} p.1 ---")
-            res1 = solve_p1(deepcopy(inp))
+            res1 = _solve(
+                solve_p1, inp, (f"{day}.1", f"R.{tid}"), measured, True)
             print(test2str(exp1 == res1, exp1, res1))
 
         if solve_p2:
             print(f"--- Day {day} p.2 ---")
-            res2 = solve_p2(inp)
+            res2 = _solve(
+                solve_p2, inp, (f"{day}.2", f"R.{tid}"), measured)
             print(test2str(exp2 == res2, exp2, res2))
 
+    if measured:
+        print(metrics.format_table(measured))
+
+
+def _solve(
+    solve: Callable,
+    inp: Any,
+    case: Tuple[str, str],
+    measured: List,
+    copy: bool = False
+):
+    """Call `solve(inp)`, on a (deep) copy of `inp` if requested, and,
+    if measuring is on (see aoc.metrics), record its metrics along with
+    metrics of loading the input in `measured`.
+    """
+    arg = deepcopy(inp) if copy else inp
+    if not metrics.MODE:
+        return solve(arg)
+    recorder = metrics.Recorder()
+    recorder.inherit(inp)
+    with recorder.phase("solve"):
+        res = solve(arg)
+    measured.append((*case, recorder.phases))
+    return res
+
 
 def is_even(obj: Union[int, List[int], Tuple[int]]) -> bool:
     """Test if a number is even or all numbers in a list are even"""
@@ -1,6 +1,8 @@
 import functools
 from typing import Iterable, Union, Callable
 
+from .instrument import timed
+
 
 class Vector(object):
 
@@ -10,6 +12,7 @@ class Vector(object):
     def __hash__(self):
         return hash(tuple(self.values))
 
+    @timed
     def __add__(self, other: Union["Vector", Iterable]) -> "Vector":
         return self.pairwise(other, lambda a, b: a+b)
 
@@ -0,0 +1,75 @@
+import random
+
+import numpy as np
+import pytest
+
+from aoc.day_05 import Map
+
+
+def naive(segments, n):
+    for start, end, delta in segments:
+        if start <= n < end:
+            return n + delta
+    return n
+
+
+def random_segments(rnd, n_segments=4, span=100):
+    """Non-overlapping segments [start, end) with random deltas"""
+    bounds = sorted(rnd.sample(range(span), 2 * n_segments))
+    return [
+        (start, end, rnd.randint(-30, 30))
+        for start, end in zip(bounds[::2], bounds[1::2])
+    ]
+
+
+@pytest.fixture
+def rnd():
+    return random.Random(5)
+
+
+def test_forward_and_backward():
+    mapping = Map.from_segments("test", [(98, 100, -48), (50, 98, 2)])
+    assert [mapping[n] for n in (0, 49, 50, 97, 98, 99, 100)] \
+        == [0, 49, 52, 99, 50, 51, 100]
+    assert [mapping.backward(n) for n in (50, 51, 52, 99, 100)] \
+        == [98, 99, 50, 97, 100]
+    numbers = np.arange(0, 120, dtype=np.int64)
+    assert mapping.forward_many(numbers).tolist() \
+        == [mapping[n] for n in range(120)]
+
+
+def test_split(rnd):
+    for _ in range(50):
+        mapping = Map.from_segments("test", random_segments(rnd))
+        start = rnd.randrange(-10, 110)
+        end = start + rnd.randrange(1, 60)
+        pieces = mapping.split(start, end)
+        # the pieces cover the interval one after another
+        assert pieces[0][0] == start and pieces[-1][1] == end
+        assert all(a[1] == b[0] for a, b in zip(pieces, pieces[1:]))
+        for piece_start, piece_end, delta in pieces:
+            for n in range(piece_start, piece_end):
+                assert mapping[n] == n + delta
+
+
+def test_compose(rnd):
+    for _ in range(50):
+        maps = [random_segments(rnd, rnd.randint(0, 5)) for _ in range(3)]
+        composed = Map.from_segments("first", maps[0])
+        for idx, segments in enumerate(maps[1:]):
+            composed = composed.compose(Map.from_segments(str(idx), segments))
+        for n in range(-40, 140):
+            expected = n
+            for segments in maps:
+                expected = naive(segments, expected)
+            assert composed[n] == expected
+
+
+def test_forward_intervals(rnd):
+    segments = random_segments(rnd)
+    mapping = Map.from_segments("test", segments)
+    intervals = [(0, 30), (45, 101)]
+    mapped = mapping.forward_intervals(intervals)
+    assert sorted(n for start, end in mapped for n in range(start, end)) \
+        == sorted(naive(segments, n)
+                  for start, end in intervals for n in range(start, end))
@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from aoc.day_08 import (LRI, JumpTable, Network, Walk, crt,
+                        first_common_end)
+
+
+def random_network(rnd: random.Random) -> Network:
+    """Network of a few nodes with several start (A) and end (Z) nodes"""
+    n_nodes = rnd.randint(2, 12)
+    names = [f"{idx}{rnd.choice('AZX')}" for idx in range(n_nodes)]
+    names[0] = "0A"
+    maps = {name: (rnd.choice(names), rnd.choice(names)) for name in names}
+    tape = "".join(rnd.choice("LR") for _ in range(rnd.randint(1, 6)))
+    return Network(LRI(tape), maps)
+
+
+def simulate(network: Network, starts, n_steps: int):
+    """Nodes after each step of walking one step at a time"""
+    nodes, tape = network.nodes.tolist(), network.tape.tolist()
+    for step in range(n_steps):
+        starts = [nodes[node][tape[step % len(tape)]] for node in starts]
+        yield starts
+
+
+@pytest.fixture
+def rnd():
+    return random.Random(8)
+
+
+def test_crt():
+    assert crt((2, 3), (3, 5)) == (8, 15)
+    # moduli that are not coprime
+    assert crt((2, 6), (8, 10)) == (8, 30)
+    assert crt((1, 4), (2, 6)) is None
+    assert crt((0, 1), (4, 6)) == (4, 6)
+
+
+def test_walk():
+    maps = {"11A": ("11B", "XXX"), "11B": ("XXX", "11Z"),
+            "11Z": ("11B", "XXX"), "XXX": ("XXX", "XXX")}
+    network = Network(LRI("LR"), maps)
+    walk = network.walk(network.index["11A"], [network.index["11Z"]])
+    assert walk == Walk(tail=1, cycle=2, ends=[2])
+    assert [walk.is_end(step) for step in range(1, 7)] \
+        == [False, True, False, True, False, True]
+    assert walk.congruences() == [(0, 2)]
+
+
+def test_first_common_end_of_walks():
+    walks = [
+        # several ends per cycle, cycles that are not coprime
+        Walk(tail=3, cycle=6, ends=[1, 4, 7]),
+        Walk(tail=0, cycle=4, ends=[1, 3]),
+        Walk(tail=5, cycle=10, ends=[2, 9, 13]),
+    ]
+    expected = next(step for step in range(1, 1000)
+                    if all(walk.is_end(step) for walk in walks))
+    assert first_common_end(walks) == expected
+    # in the tail only
+    assert first_common_end([Walk(4, 2, [2, 3]), Walk(0, 3, [2])]) == 2
+    assert first_common_end([Walk(0, 2, [0]), Walk(0, 4, [1])]) is None
+
+
+def test_first_common_end_of_random_networks(rnd):
+    max_steps = 2000
+    for _ in range(200):
+        network = random_network(rnd)
+        starts = network.find(lambda name: name[-1] == "A")
+        ends = network.find(lambda name: name[-1] == "Z")
+        walks = [network.walk(start, ends) for start in starts]
+        answer = first_common_end(walks)
+
+        is_end = set(ends)
+        expected = next(
+            (step for step, nodes in enumerate(
+                simulate(network, starts, max_steps), 1)
+             if all(node in is_end for node in nodes)),
+            None)
+        if expected is None:
+            assert answer is None or answer > max_steps
+        else:
+            assert answer == expected
+
+
+def test_after_matches_stepping(rnd):
+    for _ in range(50):
+        network = random_network(rnd)
+        starts = list(range(len(network.names)))
+        n_steps = rnd.randint(0, 300)
+        stepped = list(simulate(network, starts, n_steps))
+        expected = stepped[-1] if stepped else starts
+        assert network.after(starts, n_steps).tolist() == expected
+
+
+def test_jump_table_grows_on_demand(rnd):
+    network = random_network(rnd)
+    table = JumpTable(network)
+    assert len(table.jumps) == 1
+    states = table.advance(table.jumps[0][:3], 2**10 + 1)
+    assert len(table.jumps) == 11
+    # jumps of 2**k steps compose
+    assert (table.advance(table.advance(states, 5), 7)
+            == table.advance(states, 12)).all()
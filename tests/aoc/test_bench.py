@@ -0,0 +1,67 @@
+import pytest
+from aoc import bench
+
+
+def test_stats_from_samples():
+    stats = bench.Stats.from_samples([5, 1, 4, 2, 3])
+    assert (stats.n, stats.min, stats.median) == (5, 1, 3)
+    assert stats.p95 == 5
+    assert stats.stddev == pytest.approx(1.5811, abs=1e-4)
+
+
+def test_stats_single_sample():
+    stats = bench.Stats.from_samples([7])
+    assert (stats.min, stats.median, stats.p95, stats.stddev) == (7, 7, 7, 0)
+
+
+@pytest.mark.parametrize(
+    "pct,expected", [
+    (50, 50),
+    (95, 95),
+    (100, 100),
+    (0, 1),
+])
+def test_percentile(pct, expected):
+    assert expected == bench.percentile(list(range(1, 101)), pct)
+
+
+def test_save_load_and_compare(tmp_path):
+    old = {"01.1": {"parse": bench.Stats(1, 10, 10, 10, 0),
+                    "solve": bench.Stats(1, 100, 100, 100, 0)}}
+    path = str(tmp_path / "baseline.json")
+    bench.save(path, old)
+    assert old == bench.load(path)
+
+    new = {"01.1": {"parse": bench.Stats(1, 10, 10, 10, 0),
+                    "solve": bench.Stats(1, 150, 150, 150, 0)},
+           "02.1": {"parse": bench.Stats(1, 10, 10, 10, 0),
+                    "solve": bench.Stats(1, 10, 10, 10, 0)}}
+    diffs = bench.compare(new, bench.load(path), threshold=20)
+    assert diffs == [("01.1", "parse", 0.0, False),
+                     ("01.1", "solve", 50.0, True)]
+    assert "REGRESSION" in bench.format_table(new, diffs)
+
+
+class State:
+    __slots__ = ("neighbor",)
+
+    def __init__(self, neighbor=None):
+        self.neighbor = neighbor
+
+
+class Node:
+    def __init__(self, state):
+        self.state = state
+
+
+def test_state_sizes():
+    shared = State()
+    inp = ([State(shared), shared], {"node": Node(State())})
+    sizes = bench.state_sizes(inp, __name__)
+    assert sizes["State"] == (3, bench.instance_size(shared))
+    assert sizes["Node"][0] == 1
+    assert bench.instance_size(shared) < bench.instance_size(Node(None))
+
+
+def test_peak_memory():
+    assert bench.peak_memory(lambda: bytearray(10**6)) >= 10**6
@@ -0,0 +1,65 @@
+import pytest
+from aoc import cache as cache_mdl
+from aoc.cache import AnswerCache
+from aoc.runner import Task
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("1 2 3\n")
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnswerCache(str(tmp_path / "cache" / "answers.json"))
+
+
+def test_get_and_put(cache, inputs):
+    task = Task(9, 1, "file", path=str(inputs))
+    assert cache.get(task) is None
+    cache.put(task, 114)
+    assert cache.get(task)["answer"] == 114
+    assert AnswerCache(cache.path).get(task) is None
+    cache.save()
+    # survives reloading
+    assert AnswerCache(cache.path).get(task)["answer"] == 114
+
+
+def test_save_merges_with_other_processes(cache, inputs):
+    first = Task(9, 1, "file", path=str(inputs))
+    second = Task(9, 2, "file", path=str(inputs))
+    other = AnswerCache(cache.path)
+    cache.put(first, 114)
+    other.put(second, 2)
+    cache.save()
+    other.save()
+    reloaded = AnswerCache(cache.path)
+    assert reloaded.get(first)["answer"] == 114
+    assert reloaded.get(second)["answer"] == 2
+
+
+def test_changed_input_is_a_miss(cache, inputs):
+    task = Task(9, 1, "file", path=str(inputs))
+    cache.put(task, 114)
+    inputs.write_text("1 2 4\n")
+    assert cache.get(task) is None
+
+
+def test_tests_and_unsupported_answers_are_not_cached(cache, inputs):
+    cache.put(Task(9, 1, "test", 0), 114)
+    cache.put(Task(9, 1, "file", path=str(inputs)), [1, 2])
+    assert cache.entries == {}
+
+
+def test_prune(cache, inputs, monkeypatch):
+    task = Task(9, 1, "file", path=str(inputs))
+    cache.put(task, 114)
+    cache.put(Task(9, 2, "file", path=str(inputs)), 2)
+    assert cache.prune() == 0
+
+    cache.entries[cache.key(task)]["code"] = "outdated"
+    assert cache.prune() == 1
+    assert cache.prune(everything=True) == 1
+    assert AnswerCache(cache.path).entries == {}
@@ -0,0 +1,65 @@
+import ast
+import importlib.util
+import textwrap
+
+from aoc import debug
+
+
+def test_dlog_formats_lazily(capsys):
+    calls = []
+
+    def message():
+        calls.append(1)
+        return "built"
+
+    debug._dlog_nothing(message)
+    assert calls == []
+
+    debug._dlog(message)
+    debug._dlog("%s -> %d", "a", 1)
+    debug._dlog("50% done")
+    assert calls == [1]
+    assert capsys.readouterr().out.splitlines() == ["built", "a -> 1", "50% done"]
+
+
+def test_strip():
+    source = textwrap.dedent("""
+        DEBUG = 1
+        def f(xs):
+            for x in xs:
+                dlog("x=%s", x)
+            if DEBUG:
+                print("debugging")
+            if DEBUG:
+                utils.dprint("never")
+            else:
+                xs.append(0)
+            try:
+                dprint(xs)
+            finally:
+                pass
+            return xs
+    """)
+    code = ast.unparse(debug.strip(source))
+    assert "dlog" not in code and "dprint" not in code
+    assert "debugging" not in code
+    namespace = {}
+    exec(compile(debug.strip(source), "<test>", "exec"), namespace)
+    assert namespace["f"]([1]) == [1, 0]
+
+
+def test_loader(tmp_path, capsys):
+    path = tmp_path / "mod.py"
+    path.write_text(textwrap.dedent("""
+        from aoc.debug import _dlog as dlog
+        def f():
+            dlog("stripped")
+            return 1
+    """))
+    loader = debug._Loader("mod", str(path))
+    spec = importlib.util.spec_from_loader("mod", loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    assert module.f() == 1
+    assert capsys.readouterr().out == ""
+    assert not (tmp_path / "__pycache__").exists()
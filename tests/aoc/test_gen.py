@@ -0,0 +1,39 @@
+import pytest
+from aoc import gen
+from aoc.gen import day_13
+
+
+@pytest.mark.parametrize("day", gen.available_days())
+def test_generate_is_reproducible_and_scales(day):
+    text = gen.generate(day, scale=1, seed=1)
+    assert text == gen.generate(day, scale=1, seed=1)
+    assert text != gen.generate(day, scale=1, seed=2)
+    assert len(gen.generate(day, scale=4, seed=1)) > 2 * len(text)
+
+
+def test_all_days_available():
+    assert gen.available_days() == tuple(range(1, 26))
+
+
+def test_day_13_patterns_have_reflection_and_smudge():
+    patterns = gen.generate(13, seed=3).strip().split("\n\n")
+    for pattern in map(str.split, patterns):
+        rows = day_13.reflections(pattern)
+        columns = day_13.reflections(day_13.transpose(pattern))
+        perfect = rows[0] + columns[0]
+        smudged = [line for line, diffs in rows[1] + columns[1] if diffs == 1]
+        assert len(perfect) == 1 and len(smudged) == 1
+
+
+def test_day_18_plans_are_closed():
+    steps = {"R": (1, 0), "L": (-1, 0), "D": (0, 1), "U": (0, -1)}
+    p1, p2 = [0, 0], [0, 0]
+    for line in gen.generate(18).splitlines():
+        direction, length, color = line.split()
+        dx, dy = steps[direction]
+        p1 = [p1[0] + dx * int(length), p1[1] + dy * int(length)]
+        dx, dy = steps["RDLU"[int(color[-2])]]
+        length = int(color[2:-2], 16)
+        p2 = [p2[0] + dx * length, p2[1] + dy * length]
+    assert p1 == [0, 0] and p2 == [0, 0]
+
@@ -0,0 +1,60 @@
+import importlib
+
+import pytest
+from aoc import instrument
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(instrument, "ENABLED", 1)
+    monkeypatch.setattr(instrument, "count", instrument._count)
+    instrument.reset()
+    yield
+    instrument.reset()
+
+
+def test_disabled_is_noop(monkeypatch):
+    monkeypatch.setattr(instrument, "ENABLED", 0)
+
+    def func():
+        pass
+
+    assert instrument.timed(func) is func
+    assert instrument.timed(name="x")(func) is func
+    instrument._count_nothing("x")
+    assert "x" not in instrument.registry()
+
+
+def test_timed(enabled):
+    @instrument.timed
+    def add(a, b):
+        return a + b
+
+    @instrument.timed(name="gen")
+    def items(n):
+        yield from range(n)
+
+    assert [add(1, 2), add(3, 4)] == [3, 7]
+    assert list(items(3)) == [0, 1, 2]
+    stats = instrument.registry()
+    assert stats[f"{__name__}.test_timed.<locals>.add"].calls == 2
+    assert stats["gen"].calls == 1
+    assert stats["gen"].total_ns >= stats["gen"].max_ns > 0
+
+
+def test_count(enabled):
+    for _ in range(3):
+        instrument.count("loop")
+    instrument.count("loop", 2)
+    assert instrument.registry()["loop"].calls == 5
+    assert "loop" in instrument.summary()
+
+
+def test_enabled_by_environment(monkeypatch):
+    monkeypatch.setenv("INSTRUMENT", "1")
+    try:
+        mdl = importlib.reload(instrument)
+        assert mdl.count is mdl._count
+    finally:
+        monkeypatch.delenv("INSTRUMENT")
+        importlib.reload(instrument)
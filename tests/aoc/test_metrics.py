@@ -0,0 +1,86 @@
+import time
+
+import pytest
+from aoc import metrics
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(metrics, "MODE", "rss")
+
+
+@pytest.mark.parametrize("value, mode", [
+    ("0", None), ("1", "rss"), ("tracemalloc", "tracemalloc"),
+    ("yes", "rss"), ("Off", None),
+])
+def test_mode_from_env(monkeypatch, value, mode):
+    monkeypatch.setenv("METRICS", value)
+    assert metrics._mode_from_env() == mode
+
+
+def test_unknown_mode_from_env_is_off(monkeypatch):
+    monkeypatch.setenv("METRICS", "sometimes")
+    with pytest.warns(UserWarning):
+        assert metrics._mode_from_env() is None
+
+
+def test_recorder_is_noop_when_off(monkeypatch):
+    monkeypatch.setattr(metrics, "MODE", None)
+    rec = metrics.recorder()
+    with rec.phase("solve"):
+        pass
+    assert rec.phases == {}
+
+
+def test_nested_phases_are_excluded(enabled):
+    rec = metrics.recorder()
+    with rec.activate(), rec.phase("solve"):
+        time.sleep(0.01)
+        with metrics.recorder().phase("load"):
+            time.sleep(0.02)
+    assert set(rec.phases) == {"solve", "load"}
+    assert rec.phases["load"].time_ns >= 20_000_000
+    assert 10_000_000 <= rec.phases["solve"].time_ns < 20_000_000
+    assert rec.phases["solve"].peak_rss > 0
+    assert rec.phases["solve"].peak_traced is None
+
+
+def test_tracemalloc_peak(monkeypatch):
+    monkeypatch.setattr(metrics, "MODE", "tracemalloc")
+    rec = metrics.recorder()
+    with rec.phase("solve"):
+        data = bytearray(10**6)
+        del data
+    assert rec.phases["solve"].peak_traced >= 10**6
+
+
+def test_attach_and_inherit(enabled):
+    inp = [1, 2, 3]
+    rec = metrics.recorder()
+    with rec.phase("parse"):
+        pass
+    rec.attach(inp)
+
+    other = metrics.recorder()
+    other.inherit((inp, 64))
+    assert set(other.phases) == {"parse"}
+
+
+@pytest.mark.parametrize(
+    "value,expected", [
+    (12, "12ns"),
+    (1_500, "1.50us"),
+    (2_000_000_000, "2.00s"),
+])
+def test_format_ns(value, expected):
+    assert expected == metrics.format_ns(value)
+
+
+@pytest.mark.parametrize(
+    "value,expected", [
+    (100, "100B"),
+    (2048, "2.0K"),
+    (3 * 2**30, "3.0G"),
+])
+def test_format_bytes(value, expected):
+    assert expected == metrics.format_bytes(value)
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+from aoc.pq import BucketQueue, HeapQueue
+
+QUEUES = [HeapQueue, lambda: BucketQueue(max_weight=9)]
+
+
+@pytest.mark.parametrize("make_queue", QUEUES)
+def test_push_pop_decrease_key(make_queue):
+    queue = make_queue()
+    assert not queue
+    assert queue.push("a", 5)
+    assert queue.push("b", 3)
+    assert queue.push("c", 7)
+    # not lower than the current priority
+    assert not queue.push("a", 6)
+    assert queue.decrease_key("c", 4)
+    assert len(queue) == 3 and "c" in queue
+
+    assert queue.pop() == (3, "b")
+    assert queue.pop() == (4, "c")
+    assert queue.pop() == (5, "a")
+    assert not queue
+    with pytest.raises(IndexError):
+        queue.pop()
+    with pytest.raises(KeyError):
+        queue.decrease_key("a", 1)
+
+
+@pytest.mark.parametrize("make_queue", QUEUES)
+def test_items_are_not_compared(make_queue):
+    queue = make_queue()
+    queue.push(object(), 1)
+    queue.push(object(), 1)
+    assert queue.pop()[0] == queue.pop()[0] == 1
+
+
+def dijkstra(queue) -> dict:
+    """Distances from node 0 in a random graph with weights 1..9"""
+    dists = {}
+    queue.push(0, 0)
+    while queue:
+        dist, node = queue.pop()
+        dists[node] = dist
+        for other in random.Random(node).sample(range(200), 3):
+            if other not in dists:
+                queue.push(other, dist + 1 + other % 9)
+    return dists
+
+
+def test_queues_find_the_same_distances():
+    dists = dijkstra(HeapQueue())
+    assert len(dists) > 100
+    assert dijkstra(BucketQueue(max_weight=9)) == dists
+
+
+def test_bucket_queue_window():
+    queue = BucketQueue(max_weight=2)
+    queue.push("a", 8)
+    queue.push("b", 9)
+    queue.push("c", 7)
+    with pytest.raises(ValueError):
+        queue.push("d", 10)
+    assert queue.pop() == (7, "c")
+    with pytest.raises(ValueError):
+        queue.push("d", 6)
+    queue.push("d", 8)
+    assert [queue.pop(), queue.pop(), queue.pop()] == \
+        [(8, "d"), (8, "a"), (9, "b")]
+    # an empty queue starts a new window
+    queue.push("e", 1)
+    assert queue.pop() == (1, "e")
@@ -0,0 +1,72 @@
+import cProfile
+import pstats
+import sys
+import time
+
+import pytest
+from aoc import Point, profiling
+
+
+def busy(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def outer():
+    busy(0.05)
+    return 42
+
+
+def test_sampler_records_stacks():
+    res, sampler = profiling.profile("sample", outer)
+    assert res == 42
+    assert sampler.stacks
+    names = [[f[2] for f in stack] for stack in sampler.stacks]
+    assert all(stack[0] == "outer" for stack in names)
+    assert any("busy" in stack for stack in names)
+
+
+def test_collapse_pstats():
+    res, profiler = profiling.profile("cprofile", outer)
+    stacks = profiling.collapse_pstats(pstats.Stats(profiler))
+    named = {
+        ";".join(f[2] for f in stack): value
+        for stack, value in stacks.items()
+    }
+    in_busy = sum(v for k, v in named.items() if k.startswith("outer;busy"))
+    assert in_busy > 0.8 * sum(named.values())
+
+
+def walk():
+    pos = Point(0, 0)
+    for _ in range(2000):
+        pos = pos + (1, 0) - (0, 1)
+    return pos
+
+
+def test_report_lists_point_arithmetic(tmp_path):
+    res, profiler = profiling.profile("cprofile", walk)
+    assert res == Point(2000, -2000)
+    text = profiling.report(profiler, sys.modules[__name__],
+                            [str(tmp_path / "profile")])
+    assert "aoc.vector.__add__" in text
+    assert "aoc.vector.__sub__" in text
+    assert ".walk:" in text
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        profiling.profile("perf", outer)
+
+
+@pytest.mark.parametrize(
+    "func,expected", [
+    (("/home/src/aoc/day_17/solution.py", 10, "neighbors"),
+     "aoc.day_17.solution.neighbors"),
+    (("/home/src/aoc/matrix.py", 61, "get"), "aoc.matrix.get"),
+    (("~", 0, "<built-in method builtins.len>"),
+     "<built-in method builtins.len>"),
+])
+def test_func_name(func, expected):
+    assert expected == profiling.func_name(func)
@@ -0,0 +1,186 @@
+import io
+import json
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from aoc import runner
+from aoc.metrics import PhaseMetrics
+from aoc.runner import JsonlReporter, Reporter, Task, TaskResult, make_tasks
+
+
+@pytest.fixture
+def solution():
+    return SimpleNamespace(
+        tests=[("input 1", 10, None), ("input 2", None, 20)],
+        reals=[("input", 1, 2)],
+    )
+
+
+def test_make_tasks_skips_tests_without_answers(solution):
+    tasks = make_tasks(5, [1, 2], "test", solution)
+    assert [(t.case, t.part) for t in tasks] == [(0, 1), (1, 2)]
+
+
+def test_make_tasks_real(solution):
+    tasks = make_tasks(5, [1, 2], "real", solution)
+    assert [(t.case, t.part) for t in tasks] == [(0, 1), (0, 2)]
+
+
+def test_make_tasks_files(solution):
+    tasks = make_tasks(5, [2], "file", solution, ["a.txt", "b.txt"])
+    assert [(t.path, t.part) for t in tasks] == [("a.txt", 2), ("b.txt", 2)]
+
+
+def test_reporter():
+    out = io.StringIO()
+    report = Reporter(out)
+    report(TaskResult(Task(5, 1, "test", 0), 10, 10))
+    report(TaskResult(Task(5, 2, "test", 1), 20, 21))
+    report(TaskResult(Task(6, 1, "test", 0), 1, error="Traceback..."))
+    report.summary()
+    lines = out.getvalue().splitlines()
+    assert lines[:5] == [
+        "--- Tests day 05 ---",
+        "T.0.p1: True 10 10",
+        "T.1.p2: False 20 21",
+        "--- Tests day 06 ---",
+        "T.0.p1: ERROR",
+    ]
+    assert "--- Failed tasks: 1 ---" in lines
+
+
+def test_output_of_solution_follows_the_header(monkeypatch):
+    def solve(inp):
+        print("debugging", inp)
+        return inp
+
+    solution = SimpleNamespace(tests=[(1, 1, None)], solve_p1=solve)
+    monkeypatch.setattr(runner, "import_solution", lambda day: solution)
+    out = io.StringIO()
+    report = Reporter(out)
+    for result in runner.run_tasks([Task(24, 1, "test", 0)]):
+        report(result)
+    assert out.getvalue().splitlines() == [
+        "--- Tests day 24 ---",
+        "debugging 1",
+        "T.0.p1: True 1 1",
+    ]
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    def sleep(inp):
+        time.sleep(inp)
+        return inp
+
+    def allocate(inp):
+        return len(bytearray(inp * 2**20))
+
+    solution = SimpleNamespace(
+        reals=[(0.01, 0.01, None), (5, None, None), (1000, None, None)],
+        solve_p1=sleep, solve_p2=allocate)
+    monkeypatch.setattr(runner, "import_solution", lambda day: solution)
+
+
+def test_limited_task_within_limits(limited):
+    result = runner.run_limited_task(Task(1, 1, "real", 0), timeout=5)
+    assert (result.status, result.actual) == ("OK", 0.01)
+
+
+def test_limited_task_timeout(limited):
+    start = time.time()
+    result = runner.run_limited_task(Task(1, 1, "real", 1), timeout=0.2)
+    assert time.time() - start < 2
+    assert result.status == "TIMEOUT"
+
+
+def test_limited_task_out_of_memory(limited):
+    result = runner.run_limited_task(Task(1, 2, "real", 2), max_memory=500)
+    assert result.status == "OOM"
+    assert "MemoryError" in result.error
+    report = io.StringIO()
+    Reporter(report)(result)
+    assert report.getvalue().splitlines()[-1] == "OOM"
+
+
+def test_limited_tasks_in_pool(limited):
+    tasks = [Task(1, 1, "real", 0), Task(1, 1, "real", 1),
+             Task(1, 2, "real", 2)]
+    start = time.time()
+    results = list(runner.run_tasks(tasks, jobs=2, timeout=0.5,
+                                    max_memory=500))
+    assert time.time() - start < 4
+    assert [r.status for r in results] == ["OK", "TIMEOUT", "OOM"]
+    assert results[0].actual == 0.01
+
+
+def test_run_tasks_with_shared_inputs(tmp_path, monkeypatch):
+    def load_input(fname):
+        with open(fname) as fd:
+            return np.full((100, 100), int(fd.read()))
+
+    solution = SimpleNamespace(load_input=load_input)
+    solution.solve_part_1 = lambda fname: print(solution.load_input(fname).sum())
+    solution.solve_part_2 = lambda fname: print(solution.load_input is load_input)
+    monkeypatch.setattr(runner, "import_solution", lambda day: solution)
+
+    path = tmp_path / "input.txt"
+    path.write_text("3")
+    tasks = make_tasks(1, [1, 2], "file", solution, [str(path)])
+    for share, loaded_by_solution in [(False, "True"), (True, "False")]:
+        results = runner.run_tasks(tasks, jobs=2, share_inputs=share)
+        assert [r.actual for r in results] == ["30000", loaded_by_solution]
+
+
+def test_shared_input_is_not_copied(tmp_path, monkeypatch):
+    def load_input(fname):
+        return np.zeros((100, 100), dtype=np.int64)
+
+    def describe(fname):
+        # the input is a view of the shared memory, not an array of its own
+        inp = solution.load_input(fname)
+        print(inp.flags.owndata, inp.flags.writeable)
+
+    solution = SimpleNamespace(load_input=load_input, solve_part_1=describe,
+                               solve_part_2=describe)
+    monkeypatch.setattr(runner, "import_solution", lambda day: solution)
+    path = tmp_path / "input.txt"
+    path.write_text("")
+    tasks = make_tasks(1, [1, 2], "file", solution, [str(path)])
+    results = runner.run_tasks(tasks, jobs=2, share_inputs=True)
+    assert [r.actual for r in results] == ["False False"] * 2
+
+    solution.MODIFIES_INPUT = True
+    results = runner.run_tasks(tasks, jobs=2, share_inputs=True)
+    assert [r.actual for r in results] == ["True True"] * 2
+
+
+def test_jsonl_reporter():
+    out = io.StringIO()
+    report = JsonlReporter(out)
+    report(TaskResult(Task(5, 1, "file", path="a.txt"), actual="10",
+                      metrics={"solve": PhaseMetrics(100, 0)}, time_ns=150))
+    report(TaskResult(Task(5, 2, "real", 0), 20, error="Traceback..."))
+    report(TaskResult(Task(5, 1, "file", path="b.txt"), actual="3",
+                      cached=True))
+    report(TaskResult(Task(5, 1, "real", 0), 227653707, 35))
+    first, second, third, fourth = map(json.loads,
+                                       out.getvalue().splitlines())
+    assert first == {
+        "file": "a.txt", "day": 5, "part": 1, "status": "OK", "answer": "10",
+        "timings": {"solve_ns": 100, "total_ns": 150}}
+    assert second["status"] == "ERROR" and second["expected"] == 20
+    assert "answer" not in second
+    assert third["cached"] is True
+    assert fourth["status"] == "WRONG" and fourth["answer"] == 35
+
+
+def test_reporter_notes_go_to_err():
+    out, err = io.StringIO(), io.StringIO()
+    report = Reporter(out, err)
+    report(TaskResult(Task(5, 1, "file", path="a.txt"), actual="10",
+                      cached=True))
+    assert out.getvalue() == "10\n"
+    assert "answer from the cache" in err.getvalue()
@@ -0,0 +1,73 @@
+import pytest
+from aoc.runner import Task, TaskResult
+from aoc.schedule import HISTORY_SIZE, TimingHistory, makespan
+
+
+@pytest.fixture
+def history(tmp_path):
+    return TimingHistory(str(tmp_path / "cache" / "timings.json"))
+
+
+def test_estimate_is_mean_of_recent_runs(history):
+    task = Task(9, 1, "test", 0)
+    assert history.estimate(task) is None
+    for ns in [1000] * HISTORY_SIZE + [100, 200]:
+        history.add(TaskResult(task, time_ns=ns))
+    history.add(TaskResult(task, cached=True, time_ns=10**9))
+    expected = (1000 * (HISTORY_SIZE - 2) + 300) // HISTORY_SIZE
+    assert history.estimate(task) == expected
+    assert history.estimate(Task(9, 2, "test", 0)) is None
+
+    history.save()
+    assert TimingHistory(history.path).estimate(task) == expected
+
+
+def test_save_merges_with_other_processes(history):
+    task, other_task = Task(9, 1, "test", 0), Task(9, 2, "test", 0)
+    history.add(TaskResult(task, time_ns=100))
+    history.save()
+    # two runs start from the same history
+    first, second = TimingHistory(history.path), TimingHistory(history.path)
+    first.add(TaskResult(task, time_ns=300))
+    second.add(TaskResult(task, time_ns=500))
+    second.add(TaskResult(other_task, time_ns=7))
+    first.save()
+    second.save()
+    merged = TimingHistory(history.path)
+    assert merged.timings[merged.key(task)] == [100, 300, 500]
+    assert merged.estimate(other_task) == 7
+
+
+def test_changed_input_has_no_history(history, tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("1 2 3\n")
+    task = Task(9, 1, "file", path=str(path))
+    history.add(TaskResult(task, time_ns=100))
+    assert history.estimate(task) == 100
+    path.write_text("1 2 4\n")
+    assert history.estimate(task) is None
+
+
+def test_longest_first(history):
+    tasks = [Task(day, 1, "test", 0) for day in (1, 2, 3, 4)]
+    for task, ns in zip(tasks, [10, 30, 20]):
+        history.add(TaskResult(task, time_ns=ns))
+    # unknown tasks go first
+    assert history.longest_first(tasks) == [3, 1, 2, 0]
+
+
+@pytest.mark.parametrize("durations, jobs, expected", [
+    ([], 4, 0),
+    ([5, 3, 2], 1, 10),
+    ([7, 5, 4, 3, 1], 2, 10),
+    ([7, 5, 4, 3, 1], 10, 7),
+])
+def test_makespan(durations, jobs, expected):
+    assert makespan(durations, jobs) == expected
+
+
+def test_predict(history):
+    tasks = [Task(day, 1, "test", 0) for day in (1, 2, 3)]
+    for task, ns in zip(tasks, [40, 10]):
+        history.add(TaskResult(task, time_ns=ns))
+    assert history.predict(tasks, 2) == (40, 1)
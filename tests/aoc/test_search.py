@@ -0,0 +1,100 @@
+import pytest
+from aoc import pq
+from aoc.search import (SearchLimitExceeded, astar, bfs,
+                        bidirectional_dijkstra, dijkstra, manhattan)
+
+GRID = [
+    "19111",
+    "11191",
+    "99991",
+    "99991",
+    "11111",
+]
+GOAL = (4, 0)
+
+
+def steps(state):
+    x, y = state
+    for nx, ny in ((x-1, y), (x+1, y), (x, y-1), (x, y+1)):
+        if 0 <= nx < len(GRID) and 0 <= ny < len(GRID[0]):
+            yield nx, ny
+
+
+def weighted_steps(state):
+    for x, y in steps(state):
+        yield (x, y), int(GRID[x][y])
+
+
+def test_bfs():
+    found = bfs([(0, 0)], steps, is_goal=lambda s: s == GOAL, paths=True)
+    assert found.cost == 4
+    assert found.path() == [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0)]
+
+    assert len(bfs([(0, 0)], steps).distances) == 25
+    near = bfs([(0, 0)], steps, max_depth=1).distances
+    assert near == {(0, 0): 0, (1, 0): 1, (0, 1): 1}
+
+
+@pytest.mark.parametrize("search", [
+    lambda **kw: dijkstra([(0, 0)], weighted_steps, **kw),
+    lambda **kw: dijkstra([(0, 0)], weighted_steps,
+                          queue=pq.BucketQueue(max_weight=9), **kw),
+    lambda **kw: astar([(0, 0)], weighted_steps, heuristic=manhattan(GOAL),
+                       **kw),
+])
+def test_weighted_searches(search):
+    found = search(is_goal=lambda s: s == GOAL, paths=True)
+    # around the wall of nines
+    assert found.cost == 14
+    assert found.path()[-3:] == [(4, 2), (4, 1), (4, 0)]
+    assert found.expanded > 0
+
+
+def test_astar_expands_fewer_states():
+    is_goal = lambda s: s == GOAL
+    assert (astar([(0, 0)], weighted_steps, is_goal, manhattan(GOAL)).expanded
+            < dijkstra([(0, 0)], weighted_steps, is_goal).expanded)
+
+
+def test_state_count():
+    # states packed into ints x * 5 + y, kept in lists
+    def packed_steps(state):
+        for (x, y), weight in weighted_steps(divmod(state, 5)):
+            yield x * 5 + y, weight
+
+    found = astar([0], packed_steps, lambda s: s == 20, None, paths=True,
+                  state_count=25)
+    assert isinstance(found.distances, list)
+    assert found.cost == 14
+    assert found.path()[-3:] == [22, 21, 20]
+    everything = dijkstra([0], packed_steps, state_count=25)
+    assert dijkstra([(0, 0)], weighted_steps).distances == {
+        divmod(state, 5): dist
+        for state, dist in enumerate(everything.distances)
+    }
+
+
+def test_bidirectional_dijkstra():
+    found = bidirectional_dijkstra((0, 0), GOAL, weighted_steps, paths=True)
+    assert found.cost == 14
+    path = found.path()
+    assert path[0] == (0, 0) and path[-1] == GOAL
+    assert sum(int(GRID[x][y]) for x, y in path[1:]) == 14
+
+    # directed: the weight is of the state the step comes from
+    def reverse_steps(state):
+        for xy in steps(state):
+            yield xy, int(GRID[state[0]][state[1]])
+
+    found = bidirectional_dijkstra((0, 0), GOAL, weighted_steps, reverse_steps)
+    assert found.cost == 14
+    assert bidirectional_dijkstra((0, 0), (9, 9), weighted_steps).cost is None
+
+
+def test_max_expansions():
+    with pytest.raises(SearchLimitExceeded) as exc:
+        dijkstra([(0, 0)], weighted_steps, max_expansions=5)
+    assert exc.value.search.expanded == 5
+    with pytest.raises(SearchLimitExceeded):
+        bfs([(0, 0)], steps, max_expansions=3)
+    assert bfs([(0, 0)], steps, max_expansions=25).expanded == 25
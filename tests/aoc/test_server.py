@@ -0,0 +1,75 @@
+import json
+import os
+import socket
+import threading
+from types import SimpleNamespace
+
+import pytest
+from aoc import runner, server
+
+
+def test_validate():
+    assert server.validate({"day": 1, "part": 2, "input_text": ""}) == []
+    assert server.validate([1]) == ["request must be a JSON object"]
+    assert len(server.validate({"day": "1", "part": 3, "input_path": "a",
+                                "input_text": "b"})) == 3
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    def solve_part_1(fname):
+        with open(fname) as fd:
+            text = fd.read()
+        if text == "die":
+            # as if killed by the kernel
+            os._exit(1)
+        print(sum(int(line) for line in text.splitlines()))
+
+    solution = SimpleNamespace(solve_part_1=solve_part_1)
+    monkeypatch.setattr(runner, "import_solution", lambda day: solution)
+    monkeypatch.setattr(server, "warm_up", lambda: None)
+
+    path = str(tmp_path / "aoc.sock")
+    with server.SolverServer(path, jobs=2) as srv:
+        thread = threading.Thread(target=srv.serve_forever)
+        thread.start()
+        yield path
+        srv.shutdown()
+        thread.join()
+
+
+def ask(path, *requests):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        stream = sock.makefile("rwb")
+        responses = []
+        for request in requests:
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+            responses.append(json.loads(stream.readline()))
+        return responses
+
+
+def test_daemon(daemon, tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("1\n2\n")
+    ok, inline, failed, invalid = ask(
+        daemon,
+        {"id": "a", "day": 1, "part": 1, "input_path": str(path)},
+        {"day": 1, "part": 1, "input_text": "5\n6\n"},
+        {"day": 1, "part": 1, "input_text": "x\n"},
+        {"day": 1, "part": 1},
+    )
+    assert (ok["id"], ok["status"], ok["answer"]) == ("a", "OK", "3")
+    assert {"solve_ns", "total_ns"} <= set(ok["timings"])
+    assert inline["answer"] == "11"
+    assert failed["status"] == "ERROR" and "ValueError" in failed["error"]
+    assert invalid["status"] == "ERROR"
+
+
+def test_daemon_survives_dead_worker(daemon):
+    died, = ask(daemon, {"day": 1, "part": 1, "input_text": "die"})
+    assert died["status"] == "ERROR"
+    assert "BrokenProcessPool" in died["error"]
+    ok, = ask(daemon, {"day": 1, "part": 1, "input_text": "5\n6\n"})
+    assert (ok["status"], ok["answer"]) == ("OK", "11")
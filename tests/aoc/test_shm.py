@@ -0,0 +1,74 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+from aoc import shm
+from aoc.grid import Grid2D
+from aoc.matrix import Matrix
+from aoc.shm import SharedArray, SharedInputs, attach
+
+
+def total(handle) -> int:
+    grid, _ = attach(handle)
+    return int(grid.sum())
+
+
+@pytest.fixture
+def shared():
+    with SharedInputs(min_size=0) as shared:
+        yield shared
+
+
+def test_array_round_trip(shared):
+    grid = np.arange(24, dtype=np.int16).reshape(2, 3, 4)
+    handle = shared.share((grid, ["brick"]))
+    assert isinstance(handle[0], SharedArray)
+    assert handle[1] == ["brick"]
+
+    arr, bricks = attach(pickle.loads(pickle.dumps(handle)))
+    assert arr.dtype == np.int16
+    assert np.array_equal(arr, grid)
+    assert bricks == ["brick"]
+    with pytest.raises(ValueError):
+        arr[0, 0, 0] = 1
+
+
+def test_attached_in_worker(shared):
+    grid = np.ones((50, 50, 50), dtype=np.int16)
+    handle = shared.share((grid, None))
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert list(pool.map(total, [handle] * 3)) == [grid.sum()] * 3
+
+
+def test_matrix_and_grid(shared):
+    matrix = Matrix([list("#.."), list("..#")])
+    other = attach(shared.share(matrix))
+    assert other.values == matrix.values
+    assert str(other) == str(matrix)
+    # a private list of lists: writes are not truncated
+    other[(0, 0)] = 12
+    other[(0, 1)] = "##"
+    assert other.values[0][:2] == [12, "##"]
+    assert matrix[(0, 0)] == "#"
+
+    grid = Grid2D.from_lines(["#..", "..#"])
+    other = attach(pickle.loads(pickle.dumps(shared.share(grid))))
+    assert isinstance(other, Grid2D)
+    assert other[(1, 2)] == "#"
+
+
+def test_small_and_object_arrays_are_not_shared():
+    with SharedInputs() as shared:
+        small = np.zeros(10)
+        assert shared.share(small) is small
+        objs = np.array([None] * shm.MIN_SIZE, dtype=object)
+        assert shared.share(objs) is objs
+        assert shared.segments == []
+
+
+def test_close_removes_segments():
+    with SharedInputs(min_size=0) as shared:
+        handle = shared.share(np.zeros(10))
+    with pytest.raises(FileNotFoundError):
+        handle.attach()
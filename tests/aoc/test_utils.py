@@ -24,3 +24,63 @@ def test_is_even(input, expected):
 ])
 def test_is_odd(input, expected):
     assert expected == utils.is_odd(input)
+
+
+def test_memo():
+    calls = []
+
+    @utils.memo
+    def total(numbers, extra=0):
+        calls.append(numbers)
+        return sum(numbers) + extra
+
+    assert total([1, 2]) == 3
+    assert total([1, 2]) == 3
+    assert total([1, 2], extra=1) == 4
+    assert len(calls) == 2
+    assert total.cache_info() == utils.MemoInfo(1, 2, 2, None)
+    total.cache_clear()
+    assert total.cache_info() == utils.MemoInfo(0, 0, 0, None)
+
+
+def test_memo_lru():
+    @utils.memo(maxsize=2)
+    def square(n):
+        return n * n
+
+    for n in (1, 2, 1, 3):
+        square(n)
+    assert square.cache_info().size == 2
+    square(1)  # recently used, stays
+    square(2)  # was evicted
+    assert square.cache_info()[:2] == (2, 4)
+
+
+def test_memo_scope_call():
+    @utils.memo(key=lambda n, depth=0: n, scope="call")
+    def fib(n, depth=0):
+        return n if n < 2 else fib(n - 1, depth + 1) + fib(n - 2, depth + 1)
+
+    assert fib(30) == 832040
+    info = fib.cache_info()
+    assert (info.misses, info.size) == (31, 0)
+    fib(30)
+    assert fib.cache_info().misses == 62
+
+
+def test_with_slots():
+    from dataclasses import dataclass, field
+
+    @utils.with_slots
+    @dataclass
+    class State:
+        pos: int
+        cost: int = 0
+        seen: set = field(default_factory=set)
+
+    state = State(1)
+    assert state == State(1, 0, set())
+    assert State.__slots__ == ("pos", "cost", "seen")
+    assert not hasattr(state, "__dict__")
+    with pytest.raises(AttributeError):
+        state.other = 1